@@ -15,6 +15,7 @@ from argparse import Namespace  # noqa: E402
 from sinner.Benchmark import Benchmark  # noqa: E402
 from sinner.Parameters import Parameters  # noqa: E402
 from sinner.BatchProcessingCore import BatchProcessingCore  # noqa: E402
+from sinner.BatchQueue import BatchQueue  # noqa: E402
 from sinner.Sinner import Sinner  # noqa: E402
 from sinner.gui.GUIForm import GUIForm  # noqa: E402
 from sinner.webcam.WebCam import WebCam  # noqa: E402
@@ -72,6 +73,8 @@ class Sin(Sinner):
             Benchmark(parameters=self.parameters)
         elif self.camera is True:
             WebCam(parameters=self.parameters).run()
+        elif BatchQueue.requested(self.parameters):
+            BatchQueue(parameters=self.parameters).run()
         else:
             BatchProcessingCore(parameters=self.parameters).run()
 
@@ -1,25 +1,39 @@
+import glob
+import mimetypes
+import re
 import shutil
 from argparse import Namespace
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
-from typing import List, Any, Iterable, Callable
+from typing import List, Any, Iterable, Callable, Iterator, Dict
 
 import os
 
 from pathvalidate import is_valid_filepath, ValidationError, validate_filepath
 from tqdm import tqdm
 
+from sinner.helpers.FrameHelper import contact_sheet, write_to_image
 from sinner.models.State import State
 from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
+from sinner.handlers.frame.CV2VideoHandler import CV2VideoHandler
 from sinner.handlers.frame.DirectoryHandler import DirectoryHandler
+from sinner.handlers.frame.FFmpegStreamWriter import FFmpegStreamWriter
 from sinner.handlers.frame.ImageHandler import ImageHandler
+from sinner.handlers.frame.StreamHandler import StreamHandler
 from sinner.handlers.frame.VideoHandler import VideoHandler
+from sinner.models.FramePipeline import FramePipeline
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.MicroBatcher import MicroBatcher
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.ReorderBuffer import ReorderBuffer
+from sinner.models.SegmentEncoder import SegmentEncoder
+from sinner.models.ThreadsTuner import ThreadsTuner
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
 from sinner.models.status.StatusMixin import StatusMixin
 from sinner.models.status.Mood import Mood
+from sinner.processors.ProcessorChain import ProcessorChain
 from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
-from sinner.typing import Frame
-from sinner.utilities import list_class_descendants, resolve_relative_path, is_image, is_video, get_mem_usage, suggest_max_memory, path_exists, is_dir, normalize_path, suggest_execution_threads, suggest_temp_dir
+from sinner.utilities import list_class_descendants, resolve_relative_path, is_image, is_video, suggest_max_memory, path_exists, is_dir, normalize_path, suggest_execution_threads, suggest_temp_dir, format_sequences, parse_position, get_file_name
 from sinner.validators.AttributeLoader import Rules, AttributeLoader
+from sinner.validators.LoaderException import LoadingException
 
 
 class BatchProcessingCore(AttributeLoader, StatusMixin):
@@ -31,10 +45,30 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
     keep_frames: bool
     max_memory: int
     execution_threads: int
+    stream_output: bool
+    stream_checkpoint: int
+    fused_chain: bool
+    decode_queue: int
+    write_queue: int
+    auto_threads: bool
+    batch_size: int
+    batch_latency: float
+    frames_range: str | None
+    shard: str | None
+    finalize: bool
+    segmented_output: bool
+    segment_length: int
+    segment_encoders: int
+    start_position: str | None
+    end_position: str | None
+    stride: int
 
     parameters: Namespace
 
-    _statistics: dict[str, int] = {'mem_rss_max': 0, 'mem_vms_max': 0, 'limits_reaches': 0}
+    sheet_tile_size: tuple[int, int] = (180, 320)  # the contact sheet tile bounds (height, width)
+    shards_dir: str = 'shards'  # the subdirectory of the state, where shards are processed
+    stream_zfill_length: int = 8  # the stream length is unknown, so images of a stream are numbered with a fixed length
+    _processors_pool: Dict[str, BaseFrameProcessor] | None = None  # processors, shared between several cores
     _output_file: str | None = None  # despite the output_path value, the output file name can be changed during the execution process
 
     def rules(self) -> Rules:
@@ -52,10 +86,10 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
             {
                 'parameter': {'target', 'target-path'},
                 'attribute': 'target_path',
-                'valid': lambda: path_exists(self.target_path),
+                'valid': lambda: path_exists(self.target_path) or StreamHandler.is_stream(self.target_path),
                 'filter': lambda: normalize_path(self.target_path),
                 'required': True,
-                'help': 'Path to the target file or directory (depends on used frame processors set)'
+                'help': 'Path to the target file or directory (depends on used frame processors set), or a named pipe, a unix socket or "-" for the standard input'
             },
             #  output_path can be:
             #   - a correct file path which will be used as is,
@@ -86,6 +120,101 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
                 'default': lambda: suggest_temp_dir(self.temp_dir),
                 'help': 'Select the directory for temporary files'
             },
+            {
+                'parameter': 'stream-output',
+                'default': False,
+                'help': 'Encode processed frames directly to the resulting video, without saving them as images (for video targets with one frame processor, or with the fused chain)'
+            },
+            {
+                'parameter': 'stream-checkpoint',
+                'type': int,
+                'default': 1000,
+                'help': 'Count of frames in every encoded part of the streamed output; finished parts are kept to continue an interrupted processing (0 to encode everything in one part)'
+            },
+            {
+                'parameter': {'start', 'start-position'},
+                'attribute': 'start_position',
+                'valid': lambda: self.is_position(str(self.start_position)),
+                'help': 'Process the target from this position: a frame number, a time in seconds with the "s" suffix (e.g. 12.5s), or a time in the [HH:]MM:SS[.ms] form'
+            },
+            {
+                'parameter': {'end', 'end-position'},
+                'attribute': 'end_position',
+                'valid': lambda: self.is_position(str(self.end_position)),
+                'help': 'Process the target up to this position (exclusive), in the same form as the start position'
+            },
+            {
+                'parameter': 'stride',
+                'type': int,
+                'default': 1,
+                'valid': lambda: self.stride >= 1,
+                'help': 'Process only every N-th frame; the result of such processing is a contact sheet image of processed frames'
+            },
+            {
+                'parameter': 'segmented-output',
+                'default': False,
+                'help': 'Encode the resulting video by segments in the background, as soon as all frames of a segment are processed, and join segments at the end'
+            },
+            {
+                'parameter': 'segment-length',
+                'type': int,
+                'default': 250,
+                'help': 'Count of frames in every segment of the segmented output'
+            },
+            {
+                'parameter': 'segment-encoders',
+                'type': int,
+                'default': 2,
+                'help': 'Count of simultaneously encoded segments of the segmented output'
+            },
+            {
+                'parameter': 'auto-threads',
+                'default': False,
+                'help': 'Tune the count of processing threads while processing, starting from the execution-threads value'
+            },
+            {
+                'parameter': 'batch-size',
+                'type': int,
+                'default': 1,
+                'help': 'The maximum count of frames, passed to frame processors at once. Frames are collected from processing threads, so batches are not larger than the execution-threads value'
+            },
+            {
+                'parameter': 'batch-latency',
+                'default': 0.1,
+                'help': 'Seconds to wait for a full batch of frames, before an incomplete batch is processed'
+            },
+            {
+                'parameter': 'decode-queue',
+                'type': int,
+                'default': 0,
+                'help': 'Count of extracted frames, waiting for processing (0 to use the doubled execution threads count)'
+            },
+            {
+                'parameter': 'write-queue',
+                'type': int,
+                'default': 0,
+                'help': 'Count of processed frames, waiting for saving (0 to use the doubled execution threads count)'
+            },
+            {
+                'parameter': 'fused-chain',
+                'default': False,
+                'help': 'Run every frame through all frame processors at once, saving only the final frames (needs memory for all processors models)'
+            },
+            {
+                'parameter': 'frames-range',
+                'valid': lambda: re.fullmatch(r'\d*:\d*', str(self.frames_range)) is not None,
+                'help': 'Process only frames from START to END (exclusive) in the START:END form, as a shard of the target. The result is made with --finalize'
+            },
+            {
+                'parameter': 'shard',
+                'valid': lambda: self.parse_shard(str(self.shard)) is not None,
+                'help': 'Process only the I-th of N equal parts of frames (or of the frames range) in the I/N form, e.g. in one of N processes or hosts. The result is made with --finalize'
+            },
+            {
+                'parameter': 'finalize',
+                'default': False,
+                'help': 'Merge processed shards of the target, check their completeness and make the result'
+            },
             {
                 'module_help': 'The batch processing handler'
             }
@@ -107,21 +236,61 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
                 #  should never happen, output_path is validated in the rules
                 raise Exception(f'Output filename {self.output_path} is invalid, reason: {e.reason}')
 
-    def __init__(self, parameters: Namespace):
+    def __init__(self, parameters: Namespace, processors_pool: Dict[str, BaseFrameProcessor] | None = None):
+        """
+        :param parameters: the processing parameters
+        :param processors_pool: already loaded processors to reuse, new processors are added to it
+        """
         self.parameters = parameters
+        self._processors_pool = processors_pool
         super().__init__(parameters)
         self.configure_output_filename()
 
     def run(self) -> None:
+        if self.finalize:
+            self.finalize_shards()
+            return
+        if self.sharded:
+            self.process_shard()
+            return
+        if StreamHandler.is_stream(self.target_path):
+            self.process_stream()
+            return
         current_target_path = self.target_path
         temp_resources: List[str] = []  # list of temporary created resources
-        for processor_name in self.frame_processor:
-            current_processor = BaseFrameProcessor.create(processor_name, self.parameters)
+        streamed = False
+        segments: List[str] | None = None
+        selection: range | None = None  # frames of the target, selected for processing
+        state: State | None = None
+        result_handler = self.suggest_handler(self.target_path, self.parameters) if self.segmented_output and not self.selecting else None
+        for pass_number, current_processor in enumerate(self.processors()):
+            processor_name = current_processor.name if isinstance(current_processor, ProcessorChain) else current_processor.__class__.__name__
             handler = self.suggest_handler(current_target_path, self.parameters)
-            state = State(parameters=self.parameters, target_path=current_target_path, temp_dir=self.temp_dir, frames_count=handler.fc, processor_name=processor_name)
+            if self.selecting and selection is None:
+                if current_processor.self_processing:
+                    raise Exception(f"{processor_name} processes the whole target, and can't be used with the start, end or stride options")
+                selection = self.frames_selection(handler)
+            state = State(parameters=self.parameters, target_path=current_target_path, temp_dir=self.temp_dir, frames_count=handler.fc if selection is None or pass_number > 0 else len(selection), processor_name=processor_name)
+            if selection is not None:  # selected frames are kept apart from frames of the whole target
+                state.path = os.path.join(state.path, 'selection', f'{selection.start}-{selection.stop}-{selection.step}')
             current_processor.configure_state(state)
             current_processor.configure_output_filename(self.configure_output_filename)
-            if state.is_finished:
+            streaming = isinstance(handler, VideoHandler) and self.can_stream(current_processor)
+            encoder: SegmentEncoder | None = None
+            if isinstance(result_handler, VideoHandler) and not streaming and (isinstance(current_processor, ProcessorChain) or pass_number == len(self.frame_processor) - 1):
+                encoder = SegmentEncoder(
+                    storage=state.storage,
+                    path=state.make_path(os.path.join(state.path, 'segments')),
+                    length=self.segment_length,
+                    writer=result_handler.stream_writer,
+                    workers=self.segment_encoders,
+                    extension=os.path.splitext(str(self._output_file))[1] or '.mp4'
+                )
+            if isinstance(handler, VideoHandler) and streaming:
+                self.stream(current_processor, handler, state)
+                current_processor.release_resources()
+                streamed = True
+            elif state.is_finished:
                 self.update_status(f'Processing with {processor_name} already done ({state.processed_frames_count}/{state.frames_count})')
             else:
                 if state.is_started:
@@ -129,14 +298,26 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
                 if current_processor.self_processing:
                     current_processor.process(handler, state)
                 else:
-                    self.process(current_processor, handler, state)
+                    self.process(current_processor, handler, state, encoder, selection if pass_number == 0 else None)
                 current_processor.release_resources()
+            if encoder is not None:
+                segments = encoder.finish()
+            state.storage.release()
+            handler.release_resources()
             current_target_path = state.path
             temp_resources.append(state.path)
 
-        if current_target_path is not None:
+        if streamed:
+            self.update_status(f'The result is encoded to {self._output_file}')
+        elif isinstance(result_handler, VideoHandler) and segments is not None:
+            if not result_handler.concat(segments, str(self._output_file), self.target_path):
+                raise Exception(f"Error joining encoded segments to {self._output_file}")
+        elif state is not None and selection is not None and selection.step > 1:
+            self.contact_sheet(state)
+        elif current_target_path is not None:
             handler = self.suggest_handler(self.target_path, self.parameters)
-            handler.result(from_dir=current_target_path, filename=str(self._output_file), audio_target=self.target_path)
+            audio_range = None if selection is None else (selection.start / handler.fps, selection.stop / handler.fps)
+            handler.result(from_dir=current_target_path, filename=str(self._output_file), audio_target=self.target_path, audio_range=audio_range)
         else:
             self.update_status('Target path is empty, ignoring', mood=Mood.BAD)
 
@@ -144,18 +325,237 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
             self.update_status('Deleting temp resources')
             for dir_path in temp_resources:
                 shutil.rmtree(dir_path, ignore_errors=True)
+                if selection is not None:  # the selection is kept in the state directory, which is removed too, if it is empty
+                    for parent_path in (os.path.dirname(dir_path), os.path.dirname(os.path.dirname(dir_path))):
+                        if is_dir(parent_path) and not os.listdir(parent_path):
+                            os.rmdir(parent_path)
+
+    @property
+    def selecting(self) -> bool:
+        return self.start_position is not None or self.end_position is not None or self.stride > 1
 
-    def process_frame(self, frame_num: int, extract: Callable[[int], NumberedFrame], process: Callable[[Frame], Frame], save: Callable[[NumberedFrame], None]) -> None:
+    @staticmethod
+    def is_position(position: str) -> bool:
         try:
-            numbered_frame = extract(frame_num)
-            numbered_frame.frame = process(numbered_frame.frame)
-            save(numbered_frame)
-        except Exception as exception:
-            self.update_status(message=str(exception), mood=Mood.BAD)
-            quit()
-
-    def process(self, processor: BaseFrameProcessor, handler: BaseFrameHandler, state: State) -> None:
+            parse_position(position, 1)
+            return True
+        except ValueError:
+            return False
+
+    def frames_selection(self, handler: BaseFrameHandler) -> range:
+        """
+        Returns indices of target frames, selected with the start, end and stride options
+        """
+        start = 0 if self.start_position is None else min(parse_position(self.start_position, handler.fps), handler.fc)
+        end = handler.fc if self.end_position is None else max(min(parse_position(self.end_position, handler.fps), handler.fc), start)
+        return range(start, end, self.stride)
+
+    def contact_sheet(self, state: State) -> None:
+        """
+        Saves processed frames as one image
+        """
+        filename = str(self._output_file)
+        mimetype, _ = mimetypes.guess_type(filename)
+        if not mimetype or not mimetype.startswith('image/'):
+            filename = os.path.splitext(filename)[0] + '.jpg'
+        frames = [frame for frame in (state.storage.read(index) for index in state.storage.indices()) if frame is not None]
+        if not frames:
+            raise Exception(f"There are no processed frames in {state.path}")
+        self.update_status(f'Saving the contact sheet of {len(frames)} frames to {filename}')
+        if not write_to_image(contact_sheet(frames, tile_size=self.sheet_tile_size), filename):
+            raise Exception(f"Error saving the contact sheet to {filename}")
+        state.storage.release()
+
+    def processors(self) -> Iterator[BaseFrameProcessor]:
+        """
+        Yields processors for every processing pass. Processors are created one by one, or all together, if they are
+        fused to one chain
+        """
+        if (self.fused_chain or self.sharded or self.finalize or StreamHandler.is_stream(self.target_path)) and len(self.frame_processor) > 1:
+            processors = [self.create_processor(processor_name) for processor_name in self.frame_processor]
+            if not any(processor.self_processing for processor in processors):
+                yield ProcessorChain(self.parameters, processors)
+                return
+            self.update_status('Self-processing frame processors can not be fused, processing them one by one', mood=Mood.NEUTRAL)
+            yield from processors
+            return
+        for processor_name in self.frame_processor:
+            yield self.create_processor(processor_name)
+
+    def create_processor(self, processor_name: str) -> BaseFrameProcessor:
+        """
+        Creates the processor, or takes it from the processors pool, reloading it with the current parameters
+        """
+        if self._processors_pool is None:
+            return BaseFrameProcessor.create(processor_name, self.parameters)
+        processor = self._processors_pool.get(processor_name)
+        if processor is None:
+            processor = self._processors_pool[processor_name] = BaseFrameProcessor.create(processor_name, self.parameters)
+        elif not processor.load(self.parameters):
+            raise LoadingException(processor.errors)
+        return processor
+
+    @property
+    def sharded(self) -> bool:
+        return self.frames_range is not None or self.shard is not None
+
+    @staticmethod
+    def parse_shard(shard: str) -> tuple[int, int] | None:
+        """
+        Parses the I/N shard definition, returns None, if it is invalid
+        """
+        match = re.fullmatch(r'(\d+)/(\d+)', shard)
+        if match is None or not 1 <= int(match.group(1)) <= int(match.group(2)):
+            return None
+        return int(match.group(1)), int(match.group(2))
+
+    def frames_slice(self, frames_count: int) -> tuple[int, int]:
+        """
+        Returns the first and the next after the last frames indices of the current shard
+        """
+        start, end = 0, frames_count
+        if self.frames_range is not None:
+            first, last = self.frames_range.split(':')
+            start = min(int(first or 0), frames_count)
+            end = max(min(int(last or frames_count), frames_count), start)
+        if self.shard is not None:
+            number, count = self.parse_shard(self.shard) or (1, 1)
+            length = end - start
+            start, end = start + length * (number - 1) // count, start + length * number // count
+        return start, end
+
+    def fused_processor(self, mode: str) -> BaseFrameProcessor:
+        """
+        Returns the one processor for all frame processors, fused to the chain, if there are many of them
+        :param mode: the name of the processing mode, which requires the single processing pass
+        """
+        processors = list(self.processors())
+        if len(processors) != 1 or processors[0].self_processing:
+            raise Exception(f"{mode} is possible only with frame processors, which can be fused to one chain")
+        return processors[0]
+
+    def shard_state(self, handler: BaseFrameHandler) -> tuple[BaseFrameProcessor, State]:
+        """
+        Returns the processor and the state of the whole target, shared by all its shards. All processors are fused
+        to one chain, because every shard has frames only of its own slice
+        """
+        processor = self.fused_processor('Sharded processing')
+        processor_name = processor.name if isinstance(processor, ProcessorChain) else processor.__class__.__name__
+        state = State(parameters=self.parameters, target_path=self.target_path, temp_dir=self.temp_dir, frames_count=handler.fc, processor_name=processor_name)
+        processor.configure_state(state)
+        processor.configure_output_filename(self.configure_output_filename)
+        return processor, state
+
+    def process_shard(self) -> None:
+        """
+        Processes frames of the current shard to its own subdirectory of the target state, so shards processes don't
+        share any files
+        """
+        handler = self.suggest_handler(self.target_path, self.parameters)
+        processor, state = self.shard_state(handler)
+        start, end = self.frames_slice(state.frames_count)
+        state.path = os.path.join(state.path, self.shards_dir, f'{str(start).zfill(state.zfill_length)}-{str(end).zfill(state.zfill_length)}')
+        frames = [index for index in range(start, end) if not state.storage.has(index)]
+        with tqdm(
+                total=end - start,
+                desc=f'{state.processor_name} [{start}..{end - 1}]', unit='frame',
+                dynamic_ncols=True,
+                bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]',
+                initial=end - start - len(frames),
+        ) as progress:
+            self.multi_process_frame(processor=processor, frames=frames, extract=handler.extract_frame, save=state.save_temp_frame, progress=progress)
+        processor.release_resources()
+        handler.release_resources()
+        lost_frames = [index for index in range(start, end) if not state.storage.has(index)]
+        state.storage.release()
+        if lost_frames:
+            raise Exception(f"There are lost frames in the shard: {format_sequences(lost_frames)}")
+        self.update_status(f'Frames {start}..{end - 1} are processed to {state.path}, run with --finalize after all shards are done')
+
+    def process_stream(self) -> None:
+        """
+        Processes frames of the streamed target in the stream order, and writes them to the output as they are
+        processed: to the video (or a named pipe) through ffmpeg, or to the image sequence, if the output is a
+        directory. The stream can't be reread, so frames are not kept in the state. A continued image sequence is
+        numbered after existing images instead of being overwritten.
+        """
+        output_path = self.output_path
+        if output_path is None:
+            raise Exception("The output path should be set for the streamed target")
+        processor = self.fused_processor('Stream processing')
+        handler = StreamHandler(self.target_path, self.parameters)
+        writer: FFmpegStreamWriter | None = None
+        if is_dir(output_path):
+            existing = [int(get_file_name(file_path)) for file_path in glob.glob(os.path.join(glob.escape(output_path), '*.png')) if get_file_name(file_path).isdigit()]
+            offset = max(existing) + 1 if existing else 0
+            if offset:
+                self.update_status(f'The image sequence in {output_path} is continued from the frame {offset}')
+
+            def save(frame: NumberedFrame) -> None:
+                if not write_to_image(frame.frame, os.path.join(output_path, f'{str(offset + frame.index).zfill(self.stream_zfill_length)}.png')):
+                    raise Exception(f"Error saving frame {offset + frame.index} to {output_path}")
+        else:
+            writer = handler.stream_writer(output_path)
+
+            def save(frame: NumberedFrame) -> None:
+                writer.write(frame.frame)  # type: ignore[union-attr]
+        try:
+            with tqdm(
+                    desc=f'{processor.__class__.__name__} (stream)', unit='frame',
+                    dynamic_ncols=True,
+                    bar_format='{l_bar}{bar}| {n_fmt} [{elapsed}, {rate_fmt}{postfix}]',
+            ) as progress:
+                self.multi_process_frame(processor=processor, frames=handler, extract=handler.extract_frame, save=save, progress=progress, ordered=True)
+        finally:
+            if writer is not None:
+                writer.close()
+            handler.release_resources()
+            processor.release_resources()
+        self.update_status(f'{handler.fc} streamed frames are processed to {output_path}')
+
+    def finalize_shards(self) -> None:
+        """
+        Merges all processed shards into the target state, checks that all frames are processed, and makes the result
+        """
+        handler = self.suggest_handler(self.target_path, self.parameters)
+        processor, state = self.shard_state(handler)
+        shards_path = os.path.join(state.path, self.shards_dir)
+        if is_dir(shards_path):
+            with os.scandir(shards_path) as entries:
+                shards_paths = sorted(entry.path for entry in entries if entry.is_dir())
+            for shard_path in shards_paths:
+                self.update_status(f'Merging the shard {os.path.basename(shard_path)}')
+                state.storage.merge(BaseFrameStorage.create(state.frame_storage, shard_path, state.frames_count, state.codec))
+                shutil.rmtree(shard_path)
+            shutil.rmtree(shards_path)
+        is_ok, lost_frames = state.final_check()
+        if not is_ok:
+            raise Exception(f"Shards of {self.target_path} are not complete" + (f", lost frames: {format_sequences(lost_frames)}" if lost_frames else ''))
+        state.storage.release()
+        processor.release_resources()
+        handler.result(from_dir=state.path, filename=str(self._output_file), audio_target=self.target_path)
+        handler.release_resources()
+        if self.keep_frames is False:
+            self.update_status('Deleting temp resources')
+            shutil.rmtree(state.path, ignore_errors=True)
+
+    def process(self, processor: BaseFrameProcessor, handler: BaseFrameHandler, state: State, encoder: SegmentEncoder | None = None, selection: range | None = None) -> None:
+        """
+        :param encoder: the segment encoder, which is notified about saved frames
+        :param selection: indices of target frames to process, they are stored as a continuous sequence
+        """
+        def save(frame: NumberedFrame) -> None:
+            state.save_temp_frame(frame)
+            if encoder is not None:
+                encoder.frame_stored(frame.index)
+
+        def extract(index: int) -> NumberedFrame:
+            if selection is None:
+                return handler.extract_frame(index)
+            return NumberedFrame(index, handler.extract_frame(selection[index]).frame)
+
         handler.current_frame_index = state.processed_frames_count
+        frames: Iterable[int] = handler if selection is None else range(state.processed_frames_count, len(selection))
         with tqdm(
                 total=state.frames_count,
                 desc=state.processor_name, unit='frame',
@@ -163,7 +563,10 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
                 bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]',
                 initial=state.processed_frames_count,
         ) as progress:
-            self.multi_process_frame(processor=processor, frames=handler, extract=handler.extract_frame, save=state.save_temp_frame, progress=progress)
+            self.multi_process_frame(processor=processor, frames=frames, extract=extract, save=save, progress=progress)
+        if isinstance(handler, CV2VideoHandler):
+            statistics = ', '.join(f'{key}: {value}' for key, value in handler.decoder_statistics.items())
+            self.update_status(f'Decoder statistics: {statistics}', mood=Mood.NEUTRAL)
         _, lost_frames = state.final_check()
         if lost_frames:
             with tqdm(
@@ -172,53 +575,90 @@ class BatchProcessingCore(AttributeLoader, StatusMixin):
                     dynamic_ncols=True,
                     bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]',
             ) as progress:
-                self.multi_process_frame(processor=processor, frames=lost_frames, extract=handler.extract_frame, save=state.save_temp_frame, progress=progress)
+                self.multi_process_frame(processor=processor, frames=lost_frames, extract=extract, save=save, progress=progress)
         is_ok, _ = state.final_check()
         if not is_ok:
             raise Exception("Something went wrong on processed frames check")
 
-    def multi_process_frame(self, processor: BaseFrameProcessor, frames: Iterable[int], extract: Callable[[int], NumberedFrame], save: Callable[[NumberedFrame], None], progress: tqdm) -> None:  # type: ignore[type-arg]
-        def process_done(future_: Future[None]) -> None:
-            futures.remove(future_)
-            progress.set_postfix(self.get_postfix(len(futures)))
+    def can_stream(self, processor: BaseFrameProcessor) -> bool:
+        return self.stream_output and not self.selecting and (len(self.frame_processor) == 1 or isinstance(processor, ProcessorChain)) and not processor.self_processing
+
+    def stream(self, processor: BaseFrameProcessor, handler: VideoHandler, state: State) -> None:
+        """
+        Processes the video target, encoding frames in order directly to the resulting video. Frames are encoded in parts,
+        finished parts are kept in the state directory and skipped when the processing is continued
+        """
+        parts_path = state.make_path(os.path.join(state.path, 'parts'))
+        part_length = self.stream_checkpoint if self.stream_checkpoint > 0 else state.frames_count
+        extension = os.path.splitext(str(self._output_file))[1] or '.mp4'
+        parts: List[str] = []
+        with tqdm(
+                total=state.frames_count,
+                desc=state.processor_name, unit='frame',
+                dynamic_ncols=True,
+                bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]',
+        ) as progress:
+            for start in range(0, state.frames_count, part_length):
+                end = min(start + part_length, state.frames_count)
+                part = os.path.join(parts_path, str(start).zfill(state.zfill_length) + extension)
+                parts.append(part)
+                if path_exists(part):
+                    progress.update(end - start)
+                    continue
+                partial = os.path.join(parts_path, f'partial{extension}')
+                writer = handler.stream_writer(partial)
+                buffer = ReorderBuffer(lambda numbered_frame: writer.write(numbered_frame.frame), start)
+                self.multi_process_frame(processor=processor, frames=range(start, end), extract=handler.extract_frame, save=buffer.push, progress=progress)
+                writer.close()
+                if buffer.next_index != end:
+                    raise Exception(f"Frames {buffer.next_index}..{end - 1} are not encoded")
+                os.replace(partial, part)
+        if not handler.concat(parts, str(self._output_file), self.target_path):
+            raise Exception(f"Error joining encoded parts from {parts_path}")
+
+    def multi_process_frame(self, processor: BaseFrameProcessor, frames: Iterable[int], extract: Callable[[int], NumberedFrame], save: Callable[[NumberedFrame], None], progress: tqdm, ordered: bool = False) -> None:  # type: ignore[type-arg]
+        def frame_saved() -> None:
+            progress.set_postfix(self.get_postfix(pipeline.occupancy if tuner is None else {**pipeline.occupancy, 'threads': tuner.threads}))
             progress.update()
 
-        with ThreadPoolExecutor(max_workers=self.execution_threads) as executor:
-            futures: list[Future[None]] = []
-            for frame_num in frames:
-                future: Future[None] = executor.submit(self.process_frame, frame_num, extract, processor.process_frame, save)
-                future.add_done_callback(process_done)
-                futures.append(future)
-                progress.set_postfix(self.get_postfix(len(futures)))
-                if get_mem_usage('vms', 'g') >= self.max_memory:
-                    futures[:1][0].result()
-                    self._statistics['limits_reaches'] += 1
-            for completed_future in as_completed(futures):
-                completed_future.result()
-
-    def get_mem_usage(self) -> str:
-        mem_rss = get_mem_usage()
-        mem_vms = get_mem_usage('vms')
-        if self._statistics['mem_rss_max'] < mem_rss:
-            self._statistics['mem_rss_max'] = mem_rss
-        if self._statistics['mem_vms_max'] < mem_vms:
-            self._statistics['mem_vms_max'] = mem_vms
-        return '{:.2f}'.format(mem_rss).zfill(5) + 'MB [MAX:{:.2f}'.format(self._statistics['mem_rss_max']).zfill(5) + 'MB]' + '/' + '{:.2f}'.format(mem_vms).zfill(5) + 'MB [MAX:{:.2f}'.format(
-            self._statistics['mem_vms_max']).zfill(5) + 'MB]'
-
-    def get_postfix(self, futures_length: int) -> dict[str, Any]:
-        postfix = {
+        tuner = ThreadsTuner(self.execution_threads, governor=MemoryGovernor.get()) if self.auto_threads else None
+        batch_size = min(self.batch_size, tuner.maximum if tuner is not None else self.execution_threads)
+        pipeline = FramePipeline(
+            extract=extract,
+            process=MicroBatcher(processor.process_frames, batch_size, self.batch_latency).process_frame if batch_size > 1 else processor.process_frame,
+            save=save,
+            workers=self.execution_threads,
+            decode_depth=self.decode_queue or self.execution_threads * 2,
+            write_depth=self.write_queue or self.execution_threads * 2,
+            ordered=ordered,
+            on_saved=frame_saved,
+            governor=MemoryGovernor.get(self.max_memory),
+            tuner=tuner
+        )
+        pipeline.run(frames)  # pipeline errors are raised to the caller, e.g. the batch queue continues with the next job
+        if tuner is not None:
+            self.update_status(f'Tuned execution threads count: {tuner.threads} ({round(tuner.fps or 0, 2)} FPS)')
+            self.execution_threads = tuner.threads  # the next pass starts from the tuned value
+
+    @staticmethod
+    def get_mem_usage() -> str:
+        return MemoryGovernor.get().usage()
+
+    def get_postfix(self, occupancy: dict[str, int]) -> dict[str, Any]:
+        postfix: dict[str, Any] = {
             'memory_usage': self.get_mem_usage(),
-            'futures': futures_length,
+            **occupancy,
         }
-        if self._statistics['limits_reaches'] > 0:
-            postfix['limit_reaches'] = self._statistics['limits_reaches']
+        if MemoryGovernor.get().throttles > 0:
+            postfix['limit_reaches'] = MemoryGovernor.get().throttles
         return postfix
 
     @staticmethod
     def suggest_handler(target_path: str | None, parameters: Namespace) -> BaseFrameHandler:  # todo: refactor this
         if target_path is None:
             raise Exception("The target path is not set")
+        if StreamHandler.is_stream(target_path):
+            return StreamHandler(target_path, parameters)
         if is_dir(target_path):
             return DirectoryHandler(target_path, parameters)
         if is_image(target_path):
@@ -0,0 +1,212 @@
+import glob
+import os
+import queue
+import time
+from argparse import Namespace
+from pathlib import Path
+from typing import List, Dict, Any, Set, Tuple
+
+from sinner.BatchProcessingCore import BatchProcessingCore
+from sinner.models.BatchJob import BatchJob
+from sinner.models.status.Mood import Mood
+from sinner.models.status.StatusMixin import StatusMixin
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.utilities import is_dir, is_image, is_video, normalize_path, path_exists
+from sinner.validators.AttributeLoader import AttributeLoader, Rules
+
+
+class BatchQueue(AttributeLoader, StatusMixin):
+    """
+    Processes many targets (optionally with many sources) in one run. Jobs are taken from the prioritized queue, and
+    every job is processed by its own BatchProcessingCore with its own state and output name, but all of them share
+    one set of frame processors, so models are loaded once per queue.
+    """
+    emoji: str = '📋'
+
+    targets: List[str]
+    sources: List[str]
+    source_path: str | None
+    output_path: str | None
+    watch: str | None
+    watch_interval: float
+    watch_timeout: float
+    queue_order: str
+
+    parameters: Namespace
+
+    _queue: queue.PriorityQueue[Tuple[Any, int, BatchJob]]
+    _sequence: int = 0
+    _known: Set[str]  # all targets, which were queued
+    _sizes: Dict[str, int]  # sizes of new files in the watched directory, they are queued when the size is stable
+    _processors_pool: Dict[str, BaseFrameProcessor]
+
+    processed: List[BatchJob]
+    failed: List[BatchJob]
+
+    # parameters, which are replaced in every job
+    JOB_PARAMETERS: List[str] = ['target', 'target_path', 'target-path', 'source', 'source_path', 'source-path', 'output', 'output_path', 'output-path']
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'parameter': 'targets',
+                'default': [],
+                'help': 'Paths or glob patterns of targets to process in one queue'
+            },
+            {
+                'parameter': 'sources',
+                'default': [],
+                'help': 'Paths or glob patterns of sources, every target is processed with every source'
+            },
+            {
+                'parameter': {'source', 'source-path'},
+                'attribute': 'source_path',
+                'filter': lambda: normalize_path(self.source_path),
+            },
+            {
+                'parameter': {'output', 'output-path'},
+                'attribute': 'output_path',
+                'filter': lambda: normalize_path(self.output_path),
+            },
+            {
+                'parameter': 'watch',
+                'valid': lambda: self.watch is None or is_dir(self.watch),
+                'filter': lambda: normalize_path(self.watch),
+                'help': 'The directory to watch for new targets, they are added to the queue as they appear'
+            },
+            {
+                'parameter': 'watch-interval',
+                'default': 5.0,
+                'help': 'Seconds between checks of the watched directory'
+            },
+            {
+                'parameter': 'watch-timeout',
+                'default': 0.0,
+                'help': 'Stop watching after this count of seconds without new targets (0 to watch forever)'
+            },
+            {
+                'parameter': 'queue-order',
+                'default': 'name',
+                'choices': ['name', 'size', 'mtime'],
+                'help': 'The order of jobs in the queue: by the target name, from the smallest target, or from the oldest target'
+            },
+            {
+                'module_help': 'The batch queue of many targets. The output path is used as a directory for all results'
+            }
+        ]
+
+    def __init__(self, parameters: Namespace):
+        self.parameters = parameters
+        super().__init__(parameters)
+        self._queue = queue.PriorityQueue()
+        self._known = set()
+        self._sizes = {}
+        self._processors_pool = {}
+        self.processed = []
+        self.failed = []
+
+    @staticmethod
+    def requested(parameters: Namespace) -> bool:
+        """
+        Checks if the parameters are set for the queue processing
+        """
+        return bool(getattr(parameters, 'targets', None) or getattr(parameters, 'watch', None))
+
+    @property
+    def processors_pool(self) -> Dict[str, BaseFrameProcessor]:
+        return self._processors_pool
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @staticmethod
+    def expand(patterns: List[str]) -> List[str]:
+        """
+        Expands paths and glob patterns to the sorted list of existing paths
+        """
+        paths: List[str] = []
+        for pattern in patterns:
+            matches = sorted(glob.glob(str(normalize_path(pattern)))) if glob.has_magic(pattern) else [str(normalize_path(pattern))]
+            paths.extend(path for path in matches if path_exists(path) and path not in paths)
+        return paths
+
+    def list_sources(self) -> List[str | None]:
+        sources: List[str | None] = list(self.expand(self.sources))
+        return sources or [self.source_path]
+
+    def priority(self, target_path: str) -> Any:
+        if self.queue_order == 'size':
+            return os.path.getsize(target_path)
+        if self.queue_order == 'mtime':
+            return os.path.getmtime(target_path)
+        return target_path
+
+    def enqueue(self, target_paths: List[str]) -> None:
+        for target_path in target_paths:
+            if target_path in self._known:
+                continue
+            self._known.add(target_path)
+            for source_path in self.list_sources():
+                self._queue.put((self.priority(target_path), self._sequence, BatchJob(target_path, source_path)))
+                self._sequence += 1
+
+    def scan_watched(self) -> List[str]:
+        """
+        Returns new targets in the watched directory, which sizes haven't changed since the previous scan (so they are
+        completely written)
+        """
+        if self.watch is None:
+            return []
+        ready: List[str] = []
+        with os.scandir(self.watch) as entries:
+            for entry in entries:
+                if entry.path in self._known or not (is_video(entry.path) or is_image(entry.path)):
+                    continue
+                size = entry.stat().st_size
+                if self._sizes.get(entry.path) == size:
+                    ready.append(entry.path)
+                    del self._sizes[entry.path]
+                else:
+                    self._sizes[entry.path] = size
+        return sorted(ready)
+
+    def job_parameters(self, job: BatchJob) -> Namespace:
+        parameters = {key: value for key, value in vars(self.parameters).items() if key not in self.JOB_PARAMETERS}
+        parameters['target_path'] = job.target_path
+        if job.source_path is not None:
+            parameters['source_path'] = job.source_path
+        if self.output_path is not None:
+            Path(self.output_path).mkdir(parents=True, exist_ok=True)
+            parameters['output_path'] = self.output_path
+        return Namespace(**parameters)
+
+    def process(self, job: BatchJob) -> None:
+        self.update_status(f'Processing {job.name} ({self.pending} more in the queue)')
+        try:
+            BatchProcessingCore(parameters=self.job_parameters(job), processors_pool=self._processors_pool).run()
+            self.processed.append(job)
+        except Exception as exception:  # one broken job should not stop the queue
+            self.update_status(f'Processing {job.name} failed: {exception}', mood=Mood.BAD)
+            self.failed.append(job)
+
+    def run(self) -> None:
+        self.enqueue(self.expand(self.targets))
+        idle_since = time.monotonic()
+        while True:
+            while not self._queue.empty():
+                _, _, job = self._queue.get()
+                self.process(job)
+                idle_since = time.monotonic()
+            if self.watch is None:
+                break
+            new_targets = self.scan_watched()
+            if new_targets:
+                self.enqueue(new_targets)
+                continue
+            if 0 < self.watch_timeout <= time.monotonic() - idle_since and not self._sizes:  # files being written are awaited
+                break
+            time.sleep(self.watch_interval)
+        for processor in self._processors_pool.values():
+            processor.release_resources()
+        self.update_status(f'Queue is done: {len(self.processed)} jobs processed, {len(self.failed)} failed', mood=Mood.GOOD if not self.failed else Mood.BAD)
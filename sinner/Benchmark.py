@@ -11,6 +11,7 @@ import torch
 
 from sinner.BatchProcessingCore import BatchProcessingCore
 from sinner.models.status.StatusMixin import StatusMixin
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
 from sinner.utilities import resolve_relative_path, get_app_dir, suggest_execution_providers, decode_execution_providers, list_class_descendants
 from sinner.validators.AttributeLoader import Rules, AttributeLoader
 
@@ -25,6 +26,7 @@ class Benchmark(AttributeLoader, StatusMixin):
     max_memory: int
     execution_provider: List[str]
     frame_processor: str
+    benchmark_codecs: bool
 
     execution_threads: int
     frame_processors: list[str]
@@ -83,6 +85,11 @@ class Benchmark(AttributeLoader, StatusMixin):
                 'choices': list_class_descendants(resolve_relative_path('processors/frame'), 'BaseFrameProcessor'),
                 'help': 'Select the frame processor from available processors'
             },
+            {
+                'parameter': 'benchmark-codecs',
+                'default': False,
+                'help': 'Benchmark temporary frames codecs (encoding/decoding time versus size) instead of frame processors'
+            },
             {
                 'module_help': 'The benchmarking module'
             }
@@ -94,6 +101,9 @@ class Benchmark(AttributeLoader, StatusMixin):
         super().__init__(parameters)
         self.parameters = parameters
         self.update_parameters(parameters)  # load validated values back to parameters
+        if self.benchmark_codecs:
+            self.benchmark_frame_codecs()
+            return
 
         if self.execution_provider is None:
             execution_providers = onnxruntime.get_available_providers()
@@ -130,6 +140,13 @@ class Benchmark(AttributeLoader, StatusMixin):
         self.release_resources()
         return end_time - start_time
 
+    def benchmark_frame_codecs(self) -> None:
+        frame = BatchProcessingCore.suggest_handler(self.target_path, self.parameters).extract_frame(0).frame
+        for codec_name in BaseFrameCodec.list():
+            codec = BaseFrameCodec.create(codec_name, self.parameters)
+            result = codec.benchmark(frame, os.path.join(self.temp_dir, f'benchmark{codec.extension}'))
+            self.update_status(f"{Fore.YELLOW}{codec_name}{Style.RESET_ALL}: encoding {result['encode'] * 1000:.2f} ms, decoding {result['decode'] * 1000:.2f} ms, size {result['size'] / 1024:.0f} KB")
+
     def print_results(self) -> None:
         style_set = [Fore.YELLOW, Fore.BLUE, Fore.MAGENTA, Fore.CYAN]
         self.results = sorted(self.results, key=lambda x: (x['processor'], x['provider'], x['threads']))
@@ -1,21 +1,40 @@
 import contextlib
 import io
 import threading
-from typing import List
+from typing import List, Dict, Tuple, Any
+
+import cv2
+import numpy
 from insightface.app import FaceAnalysis
 from insightface.app.common import Face
+from insightface.model_zoo.arcface_onnx import ArcFaceONNX
+from insightface.model_zoo.attribute import Attribute
+from insightface.model_zoo.landmark import Landmark
+from insightface.model_zoo.retinaface import distance2bbox, distance2kps
+from insightface.utils import face_align, transform
 
 from sinner.typing import Frame
 
+Detection = Tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any] | None]  # bboxes with scores, and keypoints
+
 
 class FaceAnalyser:
     _face_analyser: FaceAnalysis | None = None
     _execution_providers: List[str]
     _less_output: bool = True
+    _batch_size: int = 32
+    _anchor_centers: Dict[Tuple[int, int, int], numpy.ndarray[Any, Any]]
 
-    def __init__(self, execution_providers: List[str], less_output: bool = True):
+    def __init__(self, execution_providers: List[str], less_output: bool = True, batch_size: int = 32):
+        """
+        :param execution_providers: onnxruntime execution providers
+        :param less_output: suppress models loading messages
+        :param batch_size: the maximum count of frames or faces, passed to a model in one call
+        """
         self._execution_providers = execution_providers
         self._less_output = less_output
+        self._batch_size = max(batch_size, 1)
+        self._anchor_centers = {}
 
     @property
     def face_analyser(self) -> FaceAnalysis:
@@ -42,3 +61,147 @@ class FaceAnalyser:
             return self.face_analyser.get(frame)
         except IndexError:
             return None
+
+    def get_one_face_batch(self, frames: List[Frame]) -> List[Face | None]:
+        """
+        The batched get_one_face: returns the leftmost face (or None) for every frame
+        """
+        return [min(faces, key=lambda x: x.bbox[0]) if faces else None for faces in self.get_many_faces_batch(frames)]
+
+    def get_many_faces_batch(self, frames: List[Frame]) -> List[List[Face]]:
+        """
+        The batched get_many_faces: frames are passed to the detector in stacked batches, then crops of all found faces
+        are passed to every analysis model (landmarks, gender and age, recognition) in stacked batches too
+        """
+        faces: List[List[Face]] = []
+        for start in range(0, len(frames), self._batch_size):
+            for bboxes, kpss in self.detect_batch(frames[start:start + self._batch_size]):
+                faces.append([Face(bbox=bboxes[index, 0:4], kps=None if kpss is None else kpss[index], det_score=bboxes[index, 4]) for index in range(bboxes.shape[0])])
+        pairs = [(frame, face) for frame, frame_faces in zip(frames, faces) for face in frame_faces]
+        for task_name, model in self.face_analyser.models.items():
+            if task_name == 'detection':
+                continue
+            for start in range(0, len(pairs), self._batch_size):
+                self.analyse_batch(model, pairs[start:start + self._batch_size])
+        return faces
+
+    @staticmethod
+    def is_batchable(model: Any) -> bool:
+        """
+        Checks if the model input has a dynamic batch dimension
+        """
+        return not isinstance(model.session.get_inputs()[0].shape[0], int)
+
+    def detect_batch(self, frames: List[Frame]) -> List[Detection]:
+        """
+        Detects faces on all frames with one detector call. Falls back to the per-frame detection, if the detector
+        doesn't accept batches
+        """
+        detector = self.face_analyser.det_model
+        if len(frames) < 2 or not hasattr(detector, '_feat_stride_fpn') or not self.is_batchable(detector):
+            return [detector.detect(frame, max_num=0, metric='default') for frame in frames]
+        input_size = detector.input_size
+        letterboxed = [self.letterbox(frame, input_size) for frame in frames]
+        blob = cv2.dnn.blobFromImages([image for image, _ in letterboxed], 1.0 / detector.input_std, input_size, (detector.input_mean, detector.input_mean, detector.input_mean), swapRB=True)
+        net_outs = detector.session.run(detector.output_names, {detector.input_name: blob})
+        per_frame: List[List[numpy.ndarray[Any, Any]]] = [[] for _ in frames]
+        for index, net_out in enumerate(net_outs):
+            stride = detector._feat_stride_fpn[index % detector.fmc]
+            rows = (input_size[1] // stride) * (input_size[0] // stride) * detector._num_anchors
+            if net_out.ndim == 3 and net_out.shape[0] == len(frames):  # the model with the batch dimension in outputs
+                frame_outs = list(net_out)
+            elif net_out.shape[0] == rows * len(frames):  # the model with outputs, flattened over the batch
+                frame_outs = list(net_out.reshape((len(frames), rows) + net_out.shape[1:]))
+            else:
+                return [detector.detect(frame, max_num=0, metric='default') for frame in frames]
+            for frame_index, frame_out in enumerate(frame_outs):
+                per_frame[frame_index].append(frame_out)
+        return [self.decode_detection(detector, outs, input_size, scale) for outs, (_, scale) in zip(per_frame, letterboxed)]
+
+    @staticmethod
+    def letterbox(frame: Frame, input_size: Tuple[int, int]) -> Tuple[Frame, float]:
+        """
+        Resizes the frame into the detector input with the same aspect ratio, as the detector does
+        """
+        if float(frame.shape[0]) / frame.shape[1] > float(input_size[1]) / input_size[0]:
+            new_height = input_size[1]
+            new_width = int(new_height / (float(frame.shape[0]) / frame.shape[1]))
+        else:
+            new_width = input_size[0]
+            new_height = int(new_width * (float(frame.shape[0]) / frame.shape[1]))
+        image = numpy.zeros((input_size[1], input_size[0], 3), dtype=numpy.uint8)
+        image[:new_height, :new_width, :] = cv2.resize(frame, (new_width, new_height))
+        return image, float(new_height) / frame.shape[0]
+
+    def decode_detection(self, detector: Any, net_outs: List[numpy.ndarray[Any, Any]], input_size: Tuple[int, int], scale: float) -> Detection:
+        """
+        Converts the detector outputs of one frame to bboxes and keypoints, as the detector does
+        """
+        scores_list, bboxes_list, kpss_list = [], [], []
+        for index, stride in enumerate(detector._feat_stride_fpn):
+            scores = net_outs[index]
+            height, width = input_size[1] // stride, input_size[0] // stride
+            key = (height, width, stride)
+            if key not in self._anchor_centers:
+                anchor_centers = (numpy.stack(numpy.meshgrid(numpy.arange(width), numpy.arange(height)), axis=-1).astype(numpy.float32) * stride).reshape((-1, 2))
+                if detector._num_anchors > 1:
+                    anchor_centers = numpy.stack([anchor_centers] * detector._num_anchors, axis=1).reshape((-1, 2))
+                self._anchor_centers[key] = anchor_centers
+            anchor_centers = self._anchor_centers[key]
+            positive = numpy.where(scores >= detector.det_thresh)[0]
+            scores_list.append(scores[positive])
+            bboxes_list.append(distance2bbox(anchor_centers, net_outs[index + detector.fmc] * stride)[positive])
+            if detector.use_kps:
+                kpss = distance2kps(anchor_centers, net_outs[index + detector.fmc * 2] * stride)
+                kpss_list.append(kpss.reshape((kpss.shape[0], -1, 2))[positive])
+        scores = numpy.vstack(scores_list)
+        order = scores.ravel().argsort()[::-1]
+        pre_det = numpy.hstack((numpy.vstack(bboxes_list) / scale, scores)).astype(numpy.float32, copy=False)[order, :]
+        keep = detector.nms(pre_det)
+        if not detector.use_kps:
+            return pre_det[keep, :], None
+        return pre_det[keep, :], (numpy.vstack(kpss_list) / scale)[order, :, :][keep, :, :]
+
+    def analyse_batch(self, model: Any, pairs: List[Tuple[Frame, Face]]) -> None:
+        """
+        Runs one analysis model on faces crops in one call, and fills faces with results, as the model does
+        """
+        if len(pairs) < 2 or not self.is_batchable(model) or not isinstance(model, (ArcFaceONNX, Attribute, Landmark)) or (isinstance(model, Attribute) and model.taskname != 'genderage'):
+            for frame, face in pairs:
+                model.get(frame, face)
+            return
+        if isinstance(model, ArcFaceONNX):
+            crops = [face_align.norm_crop(frame, landmark=face.kps, image_size=model.input_size[0]) for frame, face in pairs]
+            for (_, face), embedding in zip(pairs, model.get_feat(crops)):
+                face.embedding = embedding.flatten()
+            return
+        crops, matrices = [], []
+        for frame, face in pairs:
+            width, height = face.bbox[2] - face.bbox[0], face.bbox[3] - face.bbox[1]
+            center = (face.bbox[2] + face.bbox[0]) / 2, (face.bbox[3] + face.bbox[1]) / 2
+            crop, matrix = face_align.transform(frame, center, model.input_size[0], model.input_size[0] / (max(width, height) * 1.5), 0)
+            crops.append(crop)
+            matrices.append(matrix)
+        blob = cv2.dnn.blobFromImages(crops, 1.0 / model.input_std, model.input_size, (model.input_mean, model.input_mean, model.input_mean), swapRB=True)
+        predictions = model.session.run(model.output_names, {model.input_name: blob})[0]
+        for (_, face), prediction, matrix in zip(pairs, predictions, matrices):
+            if isinstance(model, Attribute):
+                face['gender'] = numpy.argmax(prediction[:2])
+                face['age'] = int(numpy.round(prediction[2] * 100))
+            else:
+                self.set_landmarks(model, face, prediction, matrix)
+
+    @staticmethod
+    def set_landmarks(model: Landmark, face: Face, prediction: numpy.ndarray[Any, Any], matrix: numpy.ndarray[Any, Any]) -> None:
+        landmarks = prediction.reshape((-1, 3) if prediction.shape[0] >= 3000 else (-1, 2))
+        if model.lmk_num < landmarks.shape[0]:
+            landmarks = landmarks[model.lmk_num * -1:, :]
+        landmarks[:, 0:2] += 1
+        landmarks[:, 0:2] *= (model.input_size[0] // 2)
+        if landmarks.shape[1] == 3:
+            landmarks[:, 2] *= (model.input_size[0] // 2)
+        landmarks = face_align.trans_points(landmarks, cv2.invertAffineTransform(matrix))
+        face[model.taskname] = landmarks
+        if model.require_pose:
+            _, rotation, _ = transform.P2sRt(transform.estimate_affine_matrix_3d23d(model.mean_lmk, landmarks))
+            face['pose'] = numpy.array(transform.matrix2angle(rotation), dtype=numpy.float32)
@@ -0,0 +1,209 @@
+import glob
+import hashlib
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import numpy
+from insightface.app.common import Face
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.FaceTracker import FaceTracker
+from sinner.typing import Frame
+
+
+class FaceIndex:
+    """
+    The persistent index of target faces: faces of every analysed frame (bbox, keypoints, detection score, gender,
+    age and the normed embedding) are kept on the disk, so the next processing of the same target takes faces from the
+    index instead of the analysis. Frames are found by the fingerprint of their pixels, so the index doesn't depend on
+    frame numbers, and frames, which differ from the analysed ones (like scaled or already processed frames), are just
+    analysed and added. The index is a directory of chunks, every save appends a new chunk file with faces of new
+    frames in columns: arrays of all faces, and offsets of faces of every frame. Chunks files are never rewritten, so
+    concurrent writers (like shards or several processors) don't lose additions of each other.
+    """
+    sample_size: int = 1024 * 1024  # bytes of the target file, read for its hash from the start, the middle and the end
+    save_interval: int = 500  # new frames are saved every save_interval frames, to survive an interruption
+
+    _path: str
+    _source: FaceAnalyser | FaceTracker
+    _lock: threading.Lock
+    _save_lock: threading.Lock  # chunks are built and written outside the main lock, one at a time
+    _chunks: List[Dict[str, numpy.ndarray[Any, Any]]]
+    _rows: Dict[int, Tuple[int, int]]  # the fingerprint of a stored frame -> the chunk and the row of the frame
+    _added: Dict[int, List[Face]]  # frames, analysed since the last save
+    _unsaved: int = 0
+
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, path: str, source: FaceAnalyser | FaceTracker):
+        """
+        :param path: the index directory
+        :param source: the analyser of frames, which are not in the index
+        """
+        self._path = path
+        self._source = source
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._added = {}
+        self.load()
+
+    @staticmethod
+    def target_hash(target_path: str) -> str:
+        """
+        The hash of the target: of its size and sampled content for a file, or of files names, sizes and modification
+        times for a directory
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if os.path.isdir(target_path):
+            with os.scandir(target_path) as entries:
+                for entry in sorted(entries, key=lambda item: item.name):
+                    digest.update(f'{entry.name}:{entry.stat().st_size}:{entry.stat().st_mtime_ns};'.encode())
+            return digest.hexdigest()
+        size = os.path.getsize(target_path)
+        digest.update(str(size).encode())
+        with open(target_path, 'rb') as target:
+            for position in sorted({0, max(size // 2 - FaceIndex.sample_size // 2, 0), max(size - FaceIndex.sample_size, 0)}):
+                target.seek(position)
+                digest.update(target.read(FaceIndex.sample_size))
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint(frame: Frame) -> int:
+        digest = hashlib.blake2b(str(frame.shape).encode(), digest_size=8)
+        digest.update(numpy.ascontiguousarray(frame).data)
+        return int.from_bytes(digest.digest(), 'little')
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows) + sum(1 for fingerprint in self._added if fingerprint not in self._rows)
+
+    def load(self) -> None:
+        """
+        Reads all chunks of the index
+        """
+        chunks_paths = sorted(glob.glob(os.path.join(glob.escape(self._path), '*.npz'))) if os.path.isdir(self._path) else []
+        with self._lock:
+            self._chunks = []
+            self._rows = {}
+            for chunk_path in chunks_paths:
+                with numpy.load(chunk_path) as stored:
+                    self.append_chunk({name: stored[name] for name in stored.files})
+
+    def append_chunk(self, columns: Dict[str, numpy.ndarray[Any, Any]]) -> None:
+        chunk = len(self._chunks)
+        self._chunks.append(columns)
+        for row, fingerprint in enumerate(columns['fingerprints']):
+            self._rows.setdefault(int(fingerprint), (chunk, row))
+
+    def get(self, fingerprint: int) -> List[Face] | None:
+        """
+        Returns faces of the indexed frame, or None, if the frame is not in the index
+        """
+        with self._lock:
+            if fingerprint in self._added:
+                return self._added[fingerprint]
+            position = self._rows.get(fingerprint)
+            if position is None:
+                return None
+            columns = self._chunks[position[0]]
+        start, end = columns['offsets'][position[1]:position[1] + 2]
+        return [Face(
+            bbox=columns['bbox'][index],
+            kps=columns['kps'][index],
+            det_score=columns['det_score'][index],
+            gender=int(columns['gender'][index]) if columns['gender'][index] >= 0 else None,
+            age=int(columns['age'][index]) if columns['age'][index] >= 0 else None,
+            embedding=columns['embedding'][index].astype(numpy.float32),
+        ) for index in range(start, end)]
+
+    def add(self, fingerprint: int, faces: List[Face]) -> None:
+        """
+        Adds faces of the frame, faces without keypoints or embeddings can't be indexed, and are not added
+        """
+        if any(face.kps is None or face.embedding is None for face in faces):
+            return
+        with self._lock:
+            self._added[fingerprint] = faces
+            self._unsaved += 1
+            save = self._unsaved >= self.save_interval
+            if save:
+                self._unsaved = 0
+        if save:
+            self.save()
+
+    @staticmethod
+    def columns(frames: Dict[int, List[Face]]) -> Dict[str, numpy.ndarray[Any, Any]]:
+        faces = [face for frame_faces in frames.values() for face in frame_faces]
+        return {
+            'fingerprints': numpy.array(list(frames.keys()), dtype=numpy.uint64),
+            'offsets': numpy.concatenate([[0], numpy.cumsum([len(frame_faces) for frame_faces in frames.values()])]).astype(numpy.int64),
+            'bbox': numpy.array([face.bbox for face in faces], dtype=numpy.float32).reshape((-1, 4)),
+            'kps': numpy.array([face.kps for face in faces], dtype=numpy.float32).reshape((-1, 5, 2)),
+            'det_score': numpy.array([face.det_score for face in faces], dtype=numpy.float32),
+            'gender': numpy.array([face.gender if face.gender is not None else -1 for face in faces], dtype=numpy.int8),
+            'age': numpy.array([face.age if face.age is not None else -1 for face in faces], dtype=numpy.int16),
+            'embedding': numpy.array([face.normed_embedding for face in faces], dtype=numpy.float16).reshape((-1, 512)),
+        }
+
+    def save(self) -> None:
+        """
+        Writes new frames to a new chunk file. Frames stay readable from memory, while the chunk is written
+        """
+        with self._save_lock:
+            with self._lock:
+                taken = list(self._added.keys())
+                added = {fingerprint: faces for fingerprint, faces in self._added.items() if fingerprint not in self._rows}
+                self._unsaved = 0
+            if added:
+                columns = self.columns(added)
+                Path(self._path).mkdir(parents=True, exist_ok=True)
+                chunk_path = os.path.join(self._path, f'{uuid.uuid4().hex}.npz')
+                with open(f'{chunk_path}.partial', 'wb') as chunk_file:  # a file object prevents numpy from adding the extension
+                    numpy.savez(chunk_file, **columns)  # type: ignore[arg-type]
+                os.replace(f'{chunk_path}.partial', chunk_path)
+            with self._lock:
+                if added:
+                    self.append_chunk(columns)
+                for fingerprint in taken:
+                    self._added.pop(fingerprint, None)
+
+    def get_many_faces(self, frame: Frame) -> List[Face]:
+        fingerprint = self.fingerprint(frame)
+        faces = self.get(fingerprint)
+        if faces is not None:
+            self.hits += 1
+            return faces
+        self.misses += 1
+        faces = self._source.get_many_faces(frame) or []
+        self.add(fingerprint, faces)
+        return faces
+
+    def get_one_face(self, frame: Frame) -> None | Face:
+        faces = self.get_many_faces(frame)
+        return min(faces, key=lambda x: x.bbox[0]) if faces else None
+
+    def get_many_faces_batch(self, frames: List[Frame]) -> List[List[Face]]:
+        """
+        Takes indexed frames faces from the index, other frames are analysed in one batched call
+        """
+        fingerprints = [self.fingerprint(frame) for frame in frames]
+        faces = [self.get(fingerprint) for fingerprint in fingerprints]
+        missed = [index for index, frame_faces in enumerate(faces) if frame_faces is None]
+        self.hits += len(frames) - len(missed)
+        self.misses += len(missed)
+        if missed:
+            for index, analysed in zip(missed, self._source.get_many_faces_batch([frames[index] for index in missed])):
+                faces[index] = analysed
+                self.add(fingerprints[index], analysed)
+        return [frame_faces or [] for frame_faces in faces]
+
+    def get_one_face_batch(self, frames: List[Frame]) -> List[Face | None]:
+        return [min(faces, key=lambda x: x.bbox[0]) if faces else None for faces in self.get_many_faces_batch(frames)]
@@ -0,0 +1,145 @@
+import threading
+from typing import List, Any
+
+import cv2
+import numpy
+from insightface.app.common import Face
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.typing import Frame
+
+
+class FaceTracker:
+    """
+    Replaces the full faces analysis on most of frames: faces are detected on every N-th frame, and on frames between
+    detections they are tracked from the previous frame with the optical flow of their keypoints. Tracked faces keep
+    all analysis results (gender, age, embedding) of detected faces, only their positions are moved. The full
+    detection is also done on a tracking failure (lost or unstable keypoints) and on a scene change. Faces, which
+    appear between detections, are found with the next detection.
+    The tracker keeps the state of the last frame, so it works best, when frames are passed in their order. Frames,
+    passed from concurrent threads, are close to each other, and far frames (like after a rewind) are detected as a
+    scene change.
+    """
+    scene_threshold: float = 30.0  # the mean difference of thumbnails pixels, which is considered as a scene change
+    thumbnail_size: tuple[int, int] = (64, 36)
+    flow_window: tuple[int, int] = (21, 21)
+    flow_levels: int = 3
+
+    _analyser: FaceAnalyser
+    _interval: int
+    _max_error: float
+    _lock: threading.Lock
+    _gray: Frame | None = None  # the last frame in grayscale
+    _thumbnail: Frame | None = None
+    _faces: List[Face]  # faces of the last frame
+    _since_detection: int = 0  # count of frames, tracked since the last detection
+
+    detections: int = 0  # count of frames with the full detection
+    tracks: int = 0  # count of frames with tracked faces
+
+    def __init__(self, analyser: FaceAnalyser, interval: int = 10, max_error: float = 1.0):
+        """
+        :param analyser: the analyser for full detections
+        :param interval: run the full detection on every interval-th frame
+        :param max_error: the maximum forward-backward tracking error of a keypoint, in pixels
+        """
+        self._analyser = analyser
+        self._interval = max(interval, 1)
+        self._max_error = max_error
+        self._lock = threading.Lock()
+        self._faces = []
+
+    def get_one_face(self, frame: Frame) -> None | Face:
+        faces = self.get_many_faces(frame)
+        return min(faces, key=lambda x: x.bbox[0]) if faces else None
+
+    def get_many_faces(self, frame: Frame) -> List[Face]:
+        return self.track_or_detect(frame, *self.prepare(frame))
+
+    def track_or_detect(self, frame: Frame, gray: Frame, thumbnail: Frame) -> List[Face]:
+        faces = self.track(gray, thumbnail)
+        if faces is None:
+            faces = self._analyser.get_many_faces(frame) or []
+            self.detected(gray, thumbnail, faces)
+        return faces
+
+    def get_one_face_batch(self, frames: List[Frame]) -> List[Face | None]:
+        return [min(faces, key=lambda x: x.bbox[0]) if faces else None for faces in self.get_many_faces_batch(frames)]
+
+    def get_many_faces_batch(self, frames: List[Frame]) -> List[List[Face]]:
+        """
+        Tracks faces over the batch in its order. From the first frame, which can't be tracked, every interval-th frame
+        is detected in one batched call, and frames between them are tracked from detected frames
+        """
+        prepared = [self.prepare(frame) for frame in frames]
+        faces: List[List[Face]] = []
+        while len(faces) < len(frames) and (tracked := self.track(*prepared[len(faces)])) is not None:
+            faces.append(tracked)
+        keyframes = list(range(len(faces), len(frames), self._interval))
+        detected = dict(zip(keyframes, self._analyser.get_many_faces_batch([frames[index] for index in keyframes]))) if keyframes else {}
+        for index in range(len(faces), len(frames)):
+            if index in detected:
+                self.detected(*prepared[index], detected[index])
+                faces.append(detected[index])
+            else:
+                faces.append(self.track_or_detect(frames[index], *prepared[index]))
+        return faces
+
+    def prepare(self, frame: Frame) -> tuple[Frame, Frame]:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return gray, cv2.resize(gray, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+
+    def track(self, gray: Frame, thumbnail: Frame) -> List[Face] | None:
+        """
+        Moves faces of the last frame to the frame, returns None, if the frame should be detected
+        """
+        with self._lock:
+            if self._gray is None or self._thumbnail is None or self._since_detection + 1 >= self._interval or gray.shape != self._gray.shape:
+                self._since_detection = 0  # the detection is reserved, concurrent frames are tracked meanwhile
+                return None
+            if float(numpy.mean(cv2.absdiff(thumbnail, self._thumbnail))) > self.scene_threshold:
+                self._since_detection = 0
+                return None
+            faces = [self.track_face(face, self._gray, gray) for face in self._faces]
+            if any(face is None for face in faces):
+                self._since_detection = 0
+                return None
+            self._gray, self._thumbnail, self._faces = gray, thumbnail, faces  # type: ignore[assignment]
+            self._since_detection += 1
+            self.tracks += 1
+            return self._faces
+
+    def detected(self, gray: Frame, thumbnail: Frame, faces: List[Face]) -> None:
+        with self._lock:
+            self._gray, self._thumbnail, self._faces = gray, thumbnail, faces
+            self._since_detection = 0
+            self.detections += 1
+
+    def track_face(self, face: Face, previous: Frame, current: Frame) -> Face | None:
+        """
+        Tracks face keypoints with the forward-backward optical flow, and moves the face with their transformation
+        """
+        if face.kps is None:
+            return None
+        points = face.kps.reshape((-1, 1, 2)).astype(numpy.float32)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(previous, current, points, points.copy(), winSize=self.flow_window, maxLevel=self.flow_levels)
+        returned, back_status, _ = cv2.calcOpticalFlowPyrLK(current, previous, moved, moved.copy(), winSize=self.flow_window, maxLevel=self.flow_levels)
+        if not status.all() or not back_status.all() or float(numpy.max(numpy.linalg.norm(points - returned, axis=2))) > self._max_error:
+            return None
+        matrix, _ = cv2.estimateAffinePartial2D(points, moved)
+        if matrix is None:
+            return None
+        tracked = Face(face)
+        tracked.kps = moved.reshape((-1, 2))
+        corners = self.transform(matrix, numpy.array([[face.bbox[0], face.bbox[1]], [face.bbox[2], face.bbox[1]], [face.bbox[0], face.bbox[3]], [face.bbox[2], face.bbox[3]]], dtype=numpy.float32))
+        tracked.bbox = numpy.array([*corners.min(axis=0), *corners.max(axis=0)], dtype=numpy.float32)
+        for key in ['landmark_2d_106', 'landmark_3d_68']:
+            if tracked.get(key) is not None:
+                landmarks = numpy.array(tracked[key], dtype=numpy.float32)
+                landmarks[:, 0:2] = self.transform(matrix, landmarks[:, 0:2])
+                tracked[key] = landmarks
+        return tracked
+
+    @staticmethod
+    def transform(matrix: numpy.ndarray[Any, Any], points: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+        return points @ matrix[:, :2].T + matrix[:, 2]
@@ -0,0 +1,146 @@
+import queue
+import threading
+from argparse import Namespace
+from typing import List, Iterable, Iterator, Any, Dict, Callable
+
+import numpy
+
+from sinner.BatchProcessingCore import BatchProcessingCore
+from sinner.models.FramePipeline import FramePipeline
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.status.StatusMixin import StatusMixin
+from sinner.processors.ProcessorChain import ProcessorChain
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.typing import Frame
+
+
+class StreamingCore(StatusMixin):
+    """
+    The library interface: frames are passed in memory and processed frames are returned as a generator, without
+    temporary files and without results on the disk. Frames are processed in the same staged pipeline, as in the batch
+    processing, and are returned in the order they are passed.
+
+    Usage:
+        with StreamingCore(['FaceSwapper'], source_path='face.jpg', workers=4) as core:
+            for frame in core.process(frames):
+                ...
+    """
+    emoji: str = '🚰'
+
+    workers: int
+    depth: int
+    max_memory: int
+
+    parameters: Namespace
+    processor: BaseFrameProcessor
+
+    poll_interval: float = 0.1  # seconds, how often a blocked output checks if the stream is closed
+
+    def __init__(self, processors: List[str | BaseFrameProcessor], workers: int = 1, depth: int = 0, max_memory: int = 0, **parameters: Any):
+        """
+        :param processors: names of frame processors, or already created processors to reuse
+        :param workers: count of processing threads
+        :param depth: count of frames, waiting in every stage queue (0 to use the doubled workers count)
+        :param max_memory: the memory limit in GB, extraction waits while it is exhausted (0 for no limit)
+        :param parameters: processors parameters, like source_path='face.jpg' or many_faces=True
+        """
+        self.workers = max(workers, 1)
+        self.depth = depth or self.workers * 2
+        self.max_memory = max_memory
+        self.parameters = Namespace(**parameters)
+        loaded = [BaseFrameProcessor.create(processor, self.parameters) if isinstance(processor, str) else processor for processor in processors]
+        if not loaded:
+            raise ValueError("At least one frame processor should be set")
+        self.processor = loaded[0] if len(loaded) == 1 else ProcessorChain(self.parameters, loaded)
+
+    def __enter__(self) -> 'StreamingCore':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+    def process_frame(self, frame: Frame) -> Frame:
+        """
+        Processes one frame in the calling thread
+        """
+        return self.processor.process_frame(frame)
+
+    def process(self, frames: Iterable[Frame] | numpy.ndarray[Any, Any]) -> Iterator[Frame]:
+        """
+        Processes frames from the iterator, or from the array of frames (a single frame array is processed as one frame)
+        :return: the generator of processed frames, in the order of passed frames
+        """
+        if isinstance(frames, numpy.ndarray) and frames.ndim == 3:
+            frames = [frames]
+        pending: Dict[int, Frame] = {}  # frames, taken from the iterator, but not extracted yet
+
+        def indices() -> Iterator[int]:  # indices and frames are requested from the one decoding thread
+            for index, frame in enumerate(frames):
+                pending[index] = frame
+                yield index
+
+        return self.stream(indices(), lambda index: NumberedFrame(index, pending.pop(index)))
+
+    def process_target(self, target_path: str, frames: Iterable[int] | None = None) -> Iterator[Frame]:
+        """
+        Decodes frames of the target file (or of the frames directory) and processes them
+        :param target_path: the image, the video or the directory of frames
+        :param frames: indices of frames to process, all frames by default
+        :return: the generator of processed frames, in the order of indices
+        """
+        handler = BatchProcessingCore.suggest_handler(target_path, self.parameters)
+        try:
+            yield from self.stream(range(handler.fc) if frames is None else frames, handler.extract_frame)
+        finally:
+            handler.release_resources()
+
+    def stream(self, frames: Iterable[int], extract: Callable[[int], NumberedFrame]) -> Iterator[Frame]:
+        """
+        Runs the processing pipeline in the background, and yields processed frames. The count of processed, but not
+        taken frames is limited by the depth, so the pipeline waits for the consumer
+        """
+        output: queue.Queue[Frame | None] = queue.Queue(maxsize=self.depth)
+        error: List[BaseException] = []
+        closed = threading.Event()  # the consumer doesn't take frames anymore
+
+        def put(frame: Frame | None) -> None:
+            while not closed.is_set():
+                try:
+                    output.put(frame, timeout=self.poll_interval)
+                    return
+                except queue.Full:
+                    continue
+
+        def run() -> None:
+            try:
+                pipeline.run(frames)
+            except BaseException as exception:
+                error.append(exception)
+            finally:
+                put(None)  # the end mark
+
+        pipeline = FramePipeline(
+            extract=extract,
+            process=self.processor.process_frame,
+            save=lambda numbered_frame: put(numbered_frame.frame),
+            workers=self.workers,
+            decode_depth=self.depth,
+            write_depth=self.depth,
+            ordered=True,
+            governor=MemoryGovernor.get(self.max_memory) if self.max_memory else None
+        )
+        runner = threading.Thread(target=run, name=self.__class__.__name__, daemon=True)
+        runner.start()
+        try:
+            while (frame := output.get()) is not None:
+                yield frame
+        finally:  # the consumer can stop taking frames at any moment
+            closed.set()
+            pipeline.stop()
+            runner.join()
+        if error:
+            raise error[0]
+
+    def release(self) -> None:
+        self.processor.release_resources()
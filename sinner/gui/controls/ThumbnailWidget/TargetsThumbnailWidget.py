@@ -58,8 +58,10 @@ class TargetsThumbnailWidget(BaseThumbnailWidget):
         )
 
     def get_frame(self, video_path: str) -> Tuple[Frame, str, int]:
-        handler = VideoHandler(video_path, self.parameters)
+        handler = VideoHandler(video_path, Namespace(**{**vars(self.parameters), 'fast_probe': True}))  # the exact frames count is not required for a thumbnail
         fc = int(handler.fc * self.frame_position)
         caption = f"{get_file_name(video_path)} [{handler.resolution[0]}x{handler.resolution[1]}]"
         pixel_count = handler.resolution[0] * handler.resolution[1]
-        return handler.extract_frame(fc).frame, caption, pixel_count
+        frame = handler.extract_frame(fc).frame
+        handler.release_resources()
+        return frame, caption, pixel_count
@@ -5,23 +5,41 @@ from argparse import Namespace
 from typing import List, Self
 
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.VideoIndex import VideoIndex
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.status.Mood import Mood
 from sinner.models.status.StatusMixin import StatusMixin
 from sinner.validators.AttributeLoader import Rules, AttributeLoader
 from sinner.typing import NumeratedFramePath
-from sinner.utilities import load_class, get_file_name, is_file, normalize_path
+from sinner.utilities import load_class, get_file_name, is_file, normalize_path, suggest_temp_dir
 
 
 class BaseFrameHandler(AttributeLoader, ABC, StatusMixin):
     current_frame_index: int = 0
+    use_video_index: bool = False
+    temp_dir: str | None = None
+
+    parameters: Namespace
 
     _target_path: str
     _fps: float | None = None
     _fc: int | None = None
     _resolution: tuple[int, int] | None = None
     _length: float | None = None
+    _video_index: VideoIndex | None = None
 
     def rules(self) -> Rules:
         return [
+            {
+                'parameter': 'video-index',
+                'attribute': 'use_video_index',
+                'default': False,
+                'help': 'Build (once) and use the keyframes/PTS index of the target for exact and fast seeking'
+            },
+            {
+                'parameter': 'temp-dir',  # key defined in the processing core, but class can be called separately in tests
+                'default': None,
+            },
         ]
 
     @staticmethod
@@ -43,6 +61,7 @@ class BaseFrameHandler(AttributeLoader, ABC, StatusMixin):
 
     def __init__(self, target_path: str, parameters: Namespace):
         self._target_path = str(normalize_path(target_path))
+        self.parameters = parameters
         super().__init__(parameters)
         # self.update_status(f"Handle frames for {self._target_path} ({self.fc} frame(s)/{self.fps} FPS)")
 
@@ -79,6 +98,19 @@ class BaseFrameHandler(AttributeLoader, ABC, StatusMixin):
             self._length = self.fc / self.fps
         return self._length
 
+    @property
+    def video_index(self) -> VideoIndex | None:
+        """
+        Returns the keyframes/PTS index of the target, if it is enabled. The index is built once and cached in the temp dir
+        """
+        if self._video_index is None and self.use_video_index:
+            try:
+                self._video_index = VideoIndex.load(self._target_path, suggest_temp_dir(self.temp_dir))
+            except Exception as exception:
+                self.update_status(message=f"Unable to build the video index: {exception}", mood=Mood.BAD)
+                self.use_video_index = False
+        return self._video_index
+
     def get_frames_paths(self, path: str, frames_range: tuple[int | None, int | None] = (None, None)) -> List[NumeratedFramePath]:
         """
         Returns all frames paths (extracting them into files, if needed). File names starting from zero index
@@ -86,7 +118,7 @@ class BaseFrameHandler(AttributeLoader, ABC, StatusMixin):
         :param frames_range: sets the range of returned (and extracted) frames
         :return: list of requested frames
         """
-        frames_path = sorted(glob.glob(os.path.join(glob.escape(path), '*.png')))
+        frames_path = sorted(file_path for file_path in glob.glob(os.path.join(glob.escape(path), '*.*')) if BaseFrameCodec.is_frame_file(file_path))
         return [(int(get_file_name(file_path)), file_path) for file_path in frames_path if is_file(file_path)][frames_range[0]:frames_range[1]]
 
     @abstractmethod
@@ -97,9 +129,17 @@ class BaseFrameHandler(AttributeLoader, ABC, StatusMixin):
         pass
 
     @abstractmethod
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         """
         Creates a result file from processed frame, return success of operation
+        :param audio_target: the file to take the audio track from
+        :param audio_range: the start and the end (in seconds) of the audio track part, if only a part of the target is processed
+        """
+        pass
+
+    def release_resources(self) -> None:
+        """
+        Releases resources (e.g. opened decoders), which can be kept by the handler between frames requests
         """
         pass
 
@@ -0,0 +1,109 @@
+import threading
+from typing import List, Dict
+
+import cv2
+from cv2 import VideoCapture
+
+from sinner.models.VideoIndex import VideoIndex
+from sinner.typing import Frame
+
+
+class DecoderState:
+    capture: VideoCapture
+    next_position: int  # the position of the frame, which will be returned by the next capture.read() call
+
+    def __init__(self, capture: VideoCapture):
+        self.capture = capture
+        self.next_position = 0
+
+
+class CV2DecoderSession:
+    """
+    Keeps a long-living VideoCapture for every worker thread. Sequential requests are read forward without seeking,
+    short forward jumps are grabbed, and only real jumps do a seek. If the video index is provided, seeks land on the
+    nearest preceding keyframe and decode forward to the exact frame.
+    """
+    max_skip: int  # the maximal forward gap (in frames), which is grabbed instead of seeking
+
+    _target_path: str
+    _index: VideoIndex | None
+    _local: threading.local
+    _states: List[DecoderState]
+    _lock: threading.Lock
+    _statistics: Dict[str, int]
+
+    def __init__(self, target_path: str, max_skip: int = 16, index: VideoIndex | None = None):
+        self._target_path = target_path
+        self.max_skip = max_skip
+        self._index = index
+        self._local = threading.local()
+        self._states = []
+        self._lock = threading.Lock()
+        self._statistics = {'opens': 0, 'hits': 0, 'skips': 0, 'seeks': 0}
+
+    def open(self) -> VideoCapture:
+        cap = cv2.VideoCapture(self._target_path)
+        if not cap.isOpened():
+            raise Exception("Error opening frame file")
+        return cap
+
+    @property
+    def state(self) -> DecoderState:
+        """
+        The decoder state of the current thread, created on the first request
+        """
+        state: DecoderState | None = getattr(self._local, 'state', None)
+        if state is None:
+            state = DecoderState(self.open())
+            self._local.state = state
+            with self._lock:
+                self._states.append(state)
+                self._statistics['opens'] += 1
+        return state
+
+    def read(self, position: int) -> Frame | None:
+        """
+        Returns the frame at the zero-based position, or None if it can't be read
+        """
+        state = self.state
+        gap = position - state.next_position
+        if gap == 0:
+            self._count('hits')
+        elif 0 < gap <= self.max_skip or (gap > 0 and state.next_position >= 0 and self._index is not None and self._index.same_gop(state.next_position, position)):
+            for _ in range(gap):
+                state.capture.grab()
+            self._count('skips')
+        elif self._index is not None:
+            keyframe = self._index.keyframe_before(position)
+            state.capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            for _ in range(position - keyframe):
+                state.capture.grab()
+            self._count('seeks')
+        else:
+            state.capture.set(cv2.CAP_PROP_POS_FRAMES, position)
+            self._count('seeks')
+        ret, frame = state.capture.read()
+        if not ret:
+            state.next_position = -1  # the capture position is unknown, so the next request will seek
+            return None
+        state.next_position = position + 1
+        return frame
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._statistics[key] += 1
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._statistics)
+
+    def release(self) -> None:
+        """
+        Releases all opened captures. The session can be used after that, captures will be reopened on demand.
+        """
+        with self._lock:
+            for state in self._states:
+                state.capture.release()
+            self._states = []
+            self._local = threading.local()
@@ -1,7 +1,7 @@
 import glob
 import os.path
 from pathlib import Path
-from typing import List, Any
+from typing import List, Any, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 import cv2
 import psutil
@@ -10,11 +10,15 @@ from tqdm import tqdm
 
 from sinner.models.status.Mood import Mood
 from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
+from sinner.handlers.frame.CV2DecoderSession import CV2DecoderSession
 from sinner.handlers.frame.EOutOfRange import EOutOfRange
-from sinner.helpers.FrameHelper import write_to_image, read_from_image
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.MemoryGovernor import MemoryGovernor
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from sinner.typing import NumeratedFramePath, Frame
-from sinner.utilities import get_file_name, is_file, get_mem_usage, suggest_max_memory
+from sinner.utilities import get_file_name, is_file, suggest_max_memory
 from sinner.validators.AttributeLoader import Rules
 
 
@@ -23,8 +27,10 @@ class CV2VideoHandler(BaseFrameHandler):
 
     output_fps: float
     max_memory: int
+    frame_codec: str
 
-    _statistics: dict[str, int] = {'mem_rss_max': 0, 'mem_vms_max': 0, 'limits_reaches': 0}
+    _decoder_session: CV2DecoderSession | None = None
+    _codec: BaseFrameCodec | None = None
 
     def rules(self) -> Rules:
         return [
@@ -37,6 +43,11 @@ class CV2VideoHandler(BaseFrameHandler):
                 'parameter': 'max-memory',  # key defined in Sin, but class can be called separately in tests
                 'default': suggest_max_memory(),
             },
+            {
+                'parameter': 'frame-codec',  # key defined in State, but class can be called separately in tests
+                'default': 'PNGFrameCodec',
+                'choices': BaseFrameCodec.list(),
+            },
             {
                 'module_help': 'The video processing module, based on CV2 library'
             }
@@ -52,6 +63,12 @@ class CV2VideoHandler(BaseFrameHandler):
             raise Exception("Error opening frame file")
         return cap
 
+    @property
+    def codec(self) -> BaseFrameCodec:
+        if self._codec is None:
+            self._codec = BaseFrameCodec.create(self.frame_codec, self.parameters)
+        return self._codec
+
     @property
     def fps(self) -> float:
         if self._fps is None:
@@ -63,9 +80,12 @@ class CV2VideoHandler(BaseFrameHandler):
     @property
     def fc(self) -> int:  # this value can be inaccurate
         if self._fc is None:
-            capture = self.open()
-            self._fc = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))  # cv2.CAP_PROP_FRAME_COUNT returns value from the video header, which not always correct. In this case we need to search last good frame
-            capture.release()
+            if self.video_index is not None:
+                self._fc = self.video_index.frames_count
+            else:
+                capture = self.open()
+                self._fc = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))  # cv2.CAP_PROP_FRAME_COUNT returns value from the video header, which not always correct. In this case we need to search last good frame
+                capture.release()
         return self._fc
 
     @property
@@ -85,6 +105,7 @@ class CV2VideoHandler(BaseFrameHandler):
         start = frames_range[0] if frames_range[0] is not None else 0
         stop = frames_range[1] if frames_range[1] is not None else self.fc - 1
 
+        governor = MemoryGovernor.get(self.max_memory)
         with ThreadPoolExecutor(max_workers=psutil.cpu_count()) as executor:  # use one worker per cpu core
             futures: list[Future[bool]] = []
             future_to_frame = {}
@@ -107,16 +128,16 @@ class CV2VideoHandler(BaseFrameHandler):
                     ret, frame = capture.read()
                     if not ret:
                         break
-                    filename: str = os.path.join(path, str(frame_index).zfill(filename_length) + ".png")
+                    filename: str = os.path.join(path, str(frame_index).zfill(filename_length) + self.codec.extension)
                     # Submit only the write_to_image function to the executor, excluding it processing time from the loop
-                    future: Future[bool] = executor.submit(write_to_image, frame, filename)
+                    future: Future[bool] = executor.submit(self.codec.write, frame, filename)
                     future.add_done_callback(write_done)
                     futures.append(future)
                     progress.set_postfix(self.get_postfix(len(futures)))
                     future_to_frame[future] = frame_index  # Keep track of which frame the future corresponds to
-                    if get_mem_usage('vms', 'g') >= self.max_memory:
+                    if len(futures) > 1 and governor.budget(frame.nbytes) < 1:
                         futures[:1][0].result()
-                        self._statistics['limits_reaches'] += 1
+                        governor.throttle()
 
                 for future in as_completed(future_to_frame):
                     frame_index = future_to_frame[future]
@@ -128,57 +149,75 @@ class CV2VideoHandler(BaseFrameHandler):
 
                 capture.release()
 
-        frames_path = sorted(glob.glob(os.path.join(glob.escape(path), '*.png')))
+        frames_path = sorted(glob.glob(os.path.join(glob.escape(path), f'*{self.codec.extension}')))
         return [(int(get_file_name(file_path)), file_path) for file_path in frames_path if is_file(file_path)]
 
-    def get_mem_usage(self) -> str:
-        mem_rss = get_mem_usage()
-        mem_vms = get_mem_usage('vms')
-        if self._statistics['mem_rss_max'] < mem_rss:
-            self._statistics['mem_rss_max'] = mem_rss
-        if self._statistics['mem_vms_max'] < mem_vms:
-            self._statistics['mem_vms_max'] = mem_vms
-        return '{:.2f}'.format(mem_rss).zfill(5) + 'MB [MAX:{:.2f}'.format(self._statistics['mem_rss_max']).zfill(5) + 'MB]' + '/' + '{:.2f}'.format(mem_vms).zfill(5) + 'MB [MAX:{:.2f}'.format(
-            self._statistics['mem_vms_max']).zfill(5) + 'MB]'
+    @staticmethod
+    def get_mem_usage() -> str:
+        return MemoryGovernor.get().usage()
 
     def get_postfix(self, futures_length: int) -> dict[str, Any]:
         postfix = {
             'memory_usage': self.get_mem_usage(),
             'futures': futures_length,
         }
-        if self._statistics['limits_reaches'] > 0:
-            postfix['limit_reaches'] = self._statistics['limits_reaches']
+        if MemoryGovernor.get().throttles > 0:
+            postfix['limit_reaches'] = MemoryGovernor.get().throttles
         return postfix
 
+    @property
+    def decoder_session(self) -> CV2DecoderSession:
+        if self._decoder_session is None:
+            self._decoder_session = CV2DecoderSession(self._target_path, index=self.video_index)
+        return self._decoder_session
+
+    @property
+    def decoder_statistics(self) -> dict[str, int]:
+        """
+        Returns the decoder session counters: opened captures, sequential hits, short forward skips and seeks
+        """
+        return self.decoder_session.statistics
+
     def extract_frame(self, frame_number: int) -> NumberedFrame:
         if frame_number > self.fc:
             raise EOutOfRange(frame_number, 0, self.fc)
-        capture = self.open()
-        capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number - 1)  # zero-based frames
         # Note: we can get a message like
         # [mov,mp4,m4a,3gp,3g2,mj2 @ 000001cb3b65c780] stream 1, offset 0x20e8c99: partial file
         # here, but can't do anything with it (because it is from ffmpeg backend). It means that the file is broken.
-        ret, frame = capture.read()
-        capture.release()
-        if not ret:
+        frame = self.decoder_session.read(min(frame_number, self.fc - 1))  # zero-based frames, the frame with index fc is the last one
+        if frame is None:
             raise Exception(f"Error reading frame {frame_number}")
         return NumberedFrame(frame_number, frame)
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def release_resources(self) -> None:
+        if self._decoder_session is not None:
+            self._decoder_session.release()
+        super().release_resources()
+
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         self.update_status(f"Resulting frames from {from_dir} to {filename} with {self.output_fps} FPS")
         if audio_target is not None:
             self.update_status(message='Sound copying is not supported in CV2VideoHandler', mood=Mood.NEUTRAL)
         try:
             Path(os.path.dirname(filename)).mkdir(parents=True, exist_ok=True)
-            frame_files = glob.glob(os.path.join(glob.escape(from_dir), '*.png'))
-            first_frame = read_from_image(frame_files[0])
+            storage: MemoryMappedFrameStorage | None = None
+            frames: Iterator[Frame]
+            if MemoryMappedFrameStorage.exists(from_dir):
+                storage = MemoryMappedFrameStorage(from_dir, 0, read_only=True)
+                frames = storage.frames()
+            else:
+                frame_files = sorted(file_path for file_path in glob.glob(os.path.join(glob.escape(from_dir), '*.*')) if BaseFrameCodec.is_frame_file(file_path))
+                frames = (read_from_image(frame_path) for frame_path in frame_files)
+            first_frame = next(frames)
             height, width, channels = first_frame.shape
             fourcc = self.suggest_codec()
             video_writer = cv2.VideoWriter(filename, fourcc, self.output_fps, (width, height))
-            for frame_path in frame_files:
-                frame = read_from_image(frame_path)
+            video_writer.write(first_frame)
+            for frame in frames:
                 video_writer.write(frame)
             video_writer.release()
+            if storage is not None:
+                storage.release()
             return True
         except Exception as exception:
             self.update_status(message=str(exception), mood=Mood.BAD)
@@ -1,4 +1,3 @@
-import glob
 import os
 import shutil
 from argparse import Namespace
@@ -6,8 +5,11 @@ from typing import List
 
 from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
 from sinner.handlers.frame.EOutOfRange import EOutOfRange
-from sinner.helpers.FrameHelper import read_from_image
+from sinner.helpers.FrameHelper import read_from_image, write_to_image
+from sinner.models.FramePrefetcher import FramePrefetcher
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from sinner.typing import NumeratedFramePath
 from sinner.utilities import is_image, get_file_name, path_exists, is_dir
 from sinner.validators.AttributeLoader import Rules
@@ -19,12 +21,22 @@ class DirectoryHandler(BaseFrameHandler):
     _fps: float | None
     _fc: int | None
     _resolution: tuple[int, int]
+    read_ahead: int
+
     _frames_path: list[str] | None = None
+    _prefetcher: FramePrefetcher | None = None
+    _storage: MemoryMappedFrameStorage | None = None
 
     def rules(self) -> Rules:
         return [
             {
-                'module_help': 'The module for processing image files in a directory'
+                'parameter': 'read-ahead',
+                'type': int,
+                'default': 0,
+                'help': 'Count of images, which are read in background ahead of the requested one (0 to disable)'
+            },
+            {
+                'module_help': 'The module for processing image files or a frames container in a directory'
             }
         ]
 
@@ -32,8 +44,12 @@ class DirectoryHandler(BaseFrameHandler):
         if not path_exists(target_path) or not is_dir(target_path):  # todo: move to validator
             raise Exception(f"{target_path} should point to a directory with image files")
         super().__init__(target_path, parameters)
+        if MemoryMappedFrameStorage.exists(target_path):  # frames of a previous processing stage are stored in one container
+            self._storage = MemoryMappedFrameStorage(target_path, 0, read_only=True)
         self._fps = fps
         self._fc = fc
+        if resolution is None and self._storage is not None and self._storage.shape is not None:
+            resolution = (self._storage.shape[1], self._storage.shape[0])
         self.resolution = (0, 0) if resolution is None else resolution
 
     @property
@@ -46,12 +62,10 @@ class DirectoryHandler(BaseFrameHandler):
 
     @property
     def fc(self) -> int:
+        if self._fc is None and self._storage is not None:
+            self._fc = self._storage.frames_count
         if self._fc is None:
-            image_count = 0
-            for file in os.scandir(self._target_path):
-                if is_image(file.path):
-                    image_count += 1
-            self._fc = image_count
+            self._fc = len(self.frames_paths)
         return self._fc
 
     @fc.setter
@@ -66,26 +80,75 @@ class DirectoryHandler(BaseFrameHandler):
     def resolution(self, value: tuple[int, int]) -> None:
         self._resolution = value
 
-    def get_frames_paths(self, path: str, frames_range: tuple[int | None, int | None] = (None, None)) -> List[NumeratedFramePath]:
+    @property
+    def frames_paths(self) -> List[str]:
+        """
+        The sorted manifest of frames files, it is built once
+        """
         if self._frames_path is None:
-            self._frames_path = sorted((file_path for file_path in glob.glob(os.path.join(glob.escape(self._target_path), '*.*')) if is_image(file_path)))
+            with os.scandir(self._target_path) as entries:
+                self._frames_path = sorted(entry.path for entry in entries if BaseFrameCodec.is_frame_file(entry.path) or is_image(entry.path))
+        return self._frames_path
+
+    def get_frames_paths(self, path: str, frames_range: tuple[int | None, int | None] = (None, None)) -> List[NumeratedFramePath]:
         start_frame = frames_range[0] if frames_range[0] is not None else 0
         if frames_range[1] is None:
             stop_frame = self.fc
         elif frames_range[1] == self.fc:
-            return [(self.fc, self._frames_path[self.fc - 1])]
+            return [(self.fc, self.frames_paths[self.fc - 1])]
         else:
             stop_frame = frames_range[1] + 1
-        return [(frames_index, file_path) for frames_index, file_path in enumerate(self._frames_path)][start_frame:stop_frame]
+        return [(frames_index, self.frames_paths[frames_index]) for frames_index in range(start_frame, min(stop_frame, len(self.frames_paths)))]
 
     def extract_frame(self, frame_number: int) -> NumberedFrame:
         if frame_number > self.fc:
             raise EOutOfRange(frame_number, 0, self.fc)
-        list_frame = self.get_frames_paths(self._target_path, (frame_number, frame_number))
-        frame_path = list_frame[0][1]
+        if self._storage is not None:
+            frame = self._storage.read(frame_number)
+            if frame is None:
+                raise Exception(f"Frame {frame_number} is not stored in {self._target_path}")
+            return NumberedFrame(frame_number, frame)
+        if self.read_ahead > 0:
+            if self._prefetcher is None:
+                self._prefetcher = FramePrefetcher(self.read_frame, self.read_ahead, self.fc + 1)
+            return self._prefetcher.get(frame_number)
+        return self.read_frame(frame_number)
+
+    def read_frame(self, frame_number: int) -> NumberedFrame:
+        frame_path = self.frames_paths[min(frame_number, len(self.frames_paths) - 1)]  # the frame with index fc is the last one
         return NumberedFrame(frame_number, read_from_image(frame_path), get_file_name(frame_path))  # zero-based sorted frames list
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         self.update_status(f"Copying results from {from_dir} to {filename}")
-        shutil.copytree(from_dir, filename, dirs_exist_ok=True)
-        return True  # Handler can't product any result
+        os.makedirs(filename, exist_ok=True)
+        if MemoryMappedFrameStorage.exists(from_dir):  # frames are decoded from the frames container
+            return self.write_container(MemoryMappedFrameStorage(from_dir, 0, read_only=True), filename)
+        is_written = True
+        with os.scandir(from_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and BaseFrameCodec.is_frame_file(entry.name):  # the directory also keeps the storage service files
+                    if entry.name.lower().endswith('.png'):
+                        shutil.copyfile(entry.path, os.path.join(filename, entry.name))
+                    else:  # frames of other codecs are converted to images
+                        is_written = write_to_image(read_from_image(entry.path), os.path.join(filename, get_file_name(entry.path) + '.png')) and is_written
+        return is_written
+
+    @staticmethod
+    def write_container(storage: MemoryMappedFrameStorage, filename: str) -> bool:
+        """
+        Writes frames of the container as numbered images
+        """
+        zfill_length = len(str(storage.frames_count))
+        is_written = True
+        for index, frame in zip(storage.indices(), storage.frames()):
+            is_written = write_to_image(frame, os.path.join(filename, str(index).zfill(zfill_length) + '.png')) and is_written
+        storage.release()
+        return is_written
+
+    def release_resources(self) -> None:
+        if self._storage is not None:
+            self._storage.release()
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        super().release_resources()
@@ -0,0 +1,109 @@
+import subprocess
+import threading
+from typing import List, Dict, Iterator
+
+from numpy import uint8, frombuffer
+
+from sinner.models.VideoIndex import VideoIndex
+from sinner.typing import Frame
+
+
+class FFmpegStreamReader:
+    """
+    Decodes a video with one persistent `ffmpeg -f rawvideo` process. Frames are returned as numpy views over a reused
+    buffer, so they are valid only until the next read. The process is restarted with the `-ss` key only on a backward
+    or a long forward seek, so sequential reading takes linear time. If the video index is provided, the exact frame
+    timestamps are used for seeking, and forward jumps inside the same GOP are read through.
+    """
+    max_skip: int  # the maximal forward gap (in frames), which is read through instead of restarting the process
+
+    _target_path: str
+    _resolution: tuple[int, int]
+    _fps: float
+    _index: VideoIndex | None
+    _process: subprocess.Popen[bytes] | None = None
+    _buffer: bytearray
+    _frame: Frame
+    _next_position: int
+    _lock: threading.RLock
+    _statistics: Dict[str, int]
+
+    def __init__(self, target_path: str, resolution: tuple[int, int], fps: float, max_skip: int = 64, index: VideoIndex | None = None):
+        self._target_path = target_path
+        self._resolution = resolution
+        self._fps = fps
+        self._index = index
+        self.max_skip = max_skip
+        width, height = resolution
+        self._buffer = bytearray(width * height * 3)
+        self._frame = frombuffer(self._buffer, dtype=uint8).reshape((height, width, 3))
+        self._next_position = -1
+        self._lock = threading.RLock()
+        self._statistics = {'starts': 0, 'hits': 0, 'skips': 0}
+
+    def command(self, position: int) -> List[str]:
+        command = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+        if position > 0:
+            command.extend(['-ss', str(self._index.pts_time(position) if self._index is not None else position / self._fps)])
+        command.extend(['-i', self._target_path, '-an', '-sn', '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-'])
+        return command
+
+    def start(self, position: int = 0) -> None:
+        self.close()
+        self._process = subprocess.Popen(self.command(position), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=len(self._buffer))
+        self._next_position = position
+        self._statistics['starts'] += 1
+
+    def _read_next(self) -> bool:
+        if self._process is None or self._process.stdout is None:
+            return False
+        view = memoryview(self._buffer)
+        offset = 0
+        while offset < len(self._buffer):
+            read_bytes = self._process.stdout.readinto(view[offset:])  # type: ignore[attr-defined]
+            if not read_bytes:
+                self._next_position = -1
+                return False
+            offset += read_bytes
+        self._next_position += 1
+        return True
+
+    def read(self, position: int) -> Frame | None:
+        """
+        Returns a view to the frame at the zero-based position, or None if it can't be read
+        """
+        with self._lock:
+            gap = position - self._next_position
+            if self._next_position < 0 or gap < 0 or (gap > self.max_skip and not (self._index is not None and self._index.same_gop(self._next_position, position))):
+                self.start(position)
+            elif gap == 0:
+                self._statistics['hits'] += 1
+            else:
+                self._statistics['skips'] += 1
+                for _ in range(gap):
+                    if not self._read_next():
+                        return None
+            return self._frame if self._read_next() else None
+
+    def frames(self, start: int = 0) -> Iterator[Frame]:
+        """
+        Yields views to all frames from the start position
+        """
+        position = start
+        while (frame := self.read(position)) is not None:
+            yield frame
+            position += 1
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        return dict(self._statistics)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process is not None:
+                if self._process.stdout is not None:
+                    self._process.stdout.close()
+                self._process.kill()
+                self._process.wait()
+                self._process = None
+            self._next_position = -1
@@ -0,0 +1,70 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import List
+
+from numpy import ascontiguousarray
+
+from sinner.typing import Frame
+
+
+class FFmpegStreamWriter:
+    """
+    Encodes frames with one persistent ffmpeg process, fed with raw BGR frames through stdin. The process is started on
+    the first written frame, so the resulting resolution is taken from it.
+    """
+    _filename: str
+    _fps: float
+    _parameters: List[str]
+    _process: subprocess.Popen[bytes] | None = None
+    _resolution: tuple[int, int] | None = None
+    _audio_target: str | None
+    _audio_range: tuple[float, float] | None
+    frames_written: int
+
+    def __init__(self, filename: str, fps: float, parameters: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None):
+        """
+        :param audio_target: the file to take the audio track from
+        :param audio_range: the start and the end (in seconds) of the audio track part
+        """
+        self._filename = filename
+        self._fps = fps
+        self._parameters = parameters.split(' ')
+        self._audio_target = audio_target
+        self._audio_range = audio_range
+        self.frames_written = 0
+
+    def command(self, resolution: tuple[int, int]) -> List[str]:
+        command = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{resolution[0]}x{resolution[1]}', '-framerate', str(self._fps), '-i', '-']
+        command.extend(self._parameters)
+        command.extend(['-r', str(self._fps), self._filename])
+        if self._audio_target:
+            if self._audio_range is not None:
+                command.extend(['-ss', str(self._audio_range[0]), '-to', str(self._audio_range[1])])
+            command.extend(['-i', self._audio_target, '-shortest'])
+        return command
+
+    def write(self, frame: Frame) -> None:
+        height, width = frame.shape[:2]
+        if self._process is None:
+            Path(os.path.dirname(self._filename)).mkdir(parents=True, exist_ok=True)
+            self._resolution = (width, height)
+            self._process = subprocess.Popen(self.command(self._resolution), stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        if self._resolution != (width, height):
+            raise Exception(f"Frame resolution {width}x{height} differs from the stream resolution {self._resolution}")
+        if self._process.stdin is None or self._process.poll() is not None:
+            raise Exception(f"Encoding of {self._filename} is terminated")
+        self._process.stdin.write(ascontiguousarray(frame).data)
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """
+        Finishes the encoding, raises an exception if the encoder failed
+        """
+        if self._process is None:
+            return
+        _, errors = self._process.communicate()  # closes stdin and waits for the encoder
+        return_code = self._process.returncode
+        self._process = None
+        if return_code != 0:
+            raise Exception(f"Encoding of {self._filename} failed: {errors.decode(errors='replace').strip()}")
@@ -3,16 +3,23 @@ import shutil
 import subprocess
 from argparse import Namespace
 from pathlib import Path
-from typing import List
+from typing import List, Iterable
 
 import cv2
 from numpy import uint8, frombuffer
 
 from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
 from sinner.handlers.frame.EOutOfRange import EOutOfRange
+from sinner.handlers.frame.FFmpegStreamReader import FFmpegStreamReader
+from sinner.handlers.frame.FFmpegStreamWriter import FFmpegStreamWriter
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.MediaMetaData import MediaMetaData
+from sinner.models.MediaProbe import MediaProbe
 from sinner.models.NumberedFrame import NumberedFrame
 from sinner.models.status.Mood import Mood
-from sinner.typing import NumeratedFramePath
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
+from sinner.typing import NumeratedFramePath, Frame
+from sinner.utilities import suggest_temp_dir, get_file_name
 from sinner.validators.AttributeLoader import Rules
 
 
@@ -21,6 +28,11 @@ class FFmpegVideoHandler(BaseFrameHandler):
 
     output_fps: float
     ffmpeg_resulting_parameters: str
+    ffmpeg_streaming: bool
+    fast_probe: bool = False
+
+    _metadata: MediaMetaData | None = None
+    _stream_reader: FFmpegStreamReader | None = None
 
     def rules(self) -> Rules:
         return [
@@ -34,6 +46,16 @@ class FFmpegVideoHandler(BaseFrameHandler):
                 'default': '-c:v libx264 -preset medium -crf 20 -pix_fmt yuv420p',
                 'help': 'ffmpeg command-line part to adjust resulting video parameters'
             },
+            {
+                'parameter': 'ffmpeg-streaming',
+                'default': True,
+                'help': 'Decode frames with one persistent ffmpeg process instead of running ffmpeg for every frame'
+            },
+            {
+                'parameter': 'fast-probe',
+                'default': False,
+                'help': 'Estimate the frames count from the media header, and count frames exactly in the background'
+            },
             {
                 'module_help': 'The video processing module, based on ffmpeg'
             }
@@ -62,45 +84,39 @@ class FFmpegVideoHandler(BaseFrameHandler):
         super().__init__(target_path, parameters)
 
     @property
-    def fps(self) -> float:
-        if self._fps is None:
-            command = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=avg_frame_rate', '-of', 'default=noprint_wrappers=1:nokey=1', self._target_path]
-            output = subprocess.check_output(command).decode().strip().split('/')
+    def metadata(self) -> MediaMetaData:
+        """
+        Returns the target metadata, probed once with one ffprobe call and cached by the file identity
+        """
+        if self._metadata is None:  # the estimated frames count is updated in place, when the exact value is ready
             try:
-                numerator, denominator = map(int, output)
-                self._fps = numerator / denominator
+                self._metadata = MediaProbe.probe(self._target_path, suggest_temp_dir(self.temp_dir), exact=not self.fast_probe)
             except Exception as exception:
                 self.update_status(message=str(exception), mood=Mood.BAD)
-                self._fps = 30.0
+                self._metadata = MediaMetaData(fps=30.0)
+        return self._metadata
+
+    @property
+    def fps(self) -> float:
+        if self._fps is None:
+            self._fps = self.metadata.fps or 30.0
         return self._fps
 
     @property
     def fc(self) -> int:
         if self._fc is None:
-            try:
-                command = ['ffprobe', '-v', 'error', '-count_frames', '-select_streams', 'v:0', '-show_entries', 'stream=nb_frames', '-of', 'default=nokey=1:noprint_wrappers=1', self._target_path]
-                output = subprocess.check_output(command, stderr=subprocess.STDOUT).decode().strip()  # can be very slow!
-                if 'N/A' == output:
-                    return 1  # non-frame files, still processable
-                self._fc = int(output)
-            except Exception as exception:
-                self.update_status(message=str(exception), mood=Mood.BAD)
-                self._fc = 0
+            if self.video_index is not None:
+                self._fc = self.video_index.frames_count
+            elif not self.metadata.exact_frames_count:
+                return self.metadata.frames_count  # the estimated value is not stored, the exact one is counted in the background
+            else:
+                self._fc = self.metadata.frames_count
         return self._fc
 
     @property
     def resolution(self) -> tuple[int, int]:
         if self._resolution is None:
-            try:
-                command = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0', self._target_path]
-                output = subprocess.check_output(command, stderr=subprocess.STDOUT).decode().strip()  # can be very slow!
-                if 'N/A' == output:
-                    self._resolution = (0, 0)  # non-frame files, still processable
-                w, h = output.split('x')
-                self._resolution = int(w), int(h)
-            except Exception as exception:
-                self.update_status(message=str(exception), mood=Mood.BAD)
-                self._resolution = 0, 0
+            self._resolution = self.metadata.resolution
         return self._resolution
 
     def get_frames_paths(self, path: str, frames_range: tuple[int | None, int | None] = (None, None)) -> List[NumeratedFramePath]:
@@ -111,20 +127,83 @@ class FFmpegVideoHandler(BaseFrameHandler):
         self.run(['-i', self._target_path, '-vf', f"select='between(n,{start_frame},{stop_frame})'", '-vsync', '0', '-pix_fmt', 'rgb24', '-frame_pts', '1', os.path.join(path, f'%{filename_length}d.png')])
         return super().get_frames_paths(path)
 
+    @property
+    def stream_reader(self) -> FFmpegStreamReader:
+        if self._stream_reader is None:
+            self._stream_reader = FFmpegStreamReader(self._target_path, self.resolution, self.fps, index=self.video_index)
+        return self._stream_reader
+
     def extract_frame(self, frame_number: int) -> NumberedFrame:
         if frame_number > self.fc:
             raise EOutOfRange(frame_number, 0, self.fc)
+        if self.ffmpeg_streaming:
+            frame = self.stream_reader.read(frame_number)
+            if frame is None:
+                raise Exception(f"Error reading frame {frame_number}")
+            return NumberedFrame(frame_number, frame.copy())  # the reader buffer is reused
         command = ['ffmpeg', '-i', self._target_path, '-pix_fmt', 'rgb24', '-vf', f"select='eq(n,{frame_number})',setpts=N/FRAME_RATE/TB", '-vframes', '1', '-f', 'image2pipe', '-c:v', 'png', '-']
         output = subprocess.check_output(command, stderr=subprocess.DEVNULL)
         return NumberedFrame(frame_number, cv2.imdecode(frombuffer(output, uint8), cv2.IMREAD_COLOR))
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def release_resources(self) -> None:
+        if self._stream_reader is not None:
+            self._stream_reader.close()
+        super().release_resources()
+
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         self.update_status(f"Resulting frames from {from_dir} to {filename} with {self.output_fps} FPS")
-        filename_length = len(str(self.fc))  # a way to determine frame names length
+        if MemoryMappedFrameStorage.exists(from_dir):  # frames are stored in one container, they are piped to the encoder
+            storage = MemoryMappedFrameStorage(from_dir, 0, read_only=True)
+            try:
+                return self.pipe_result(storage.frames(), filename, audio_target, audio_range)
+            finally:
+                storage.release()
+        frames_paths = BaseFrameHandler.get_frames_paths(self, from_dir)
+        if frames_paths and os.path.splitext(frames_paths[0][1])[1] == '.npy':  # ffmpeg can't read raw numpy frames, so they are piped
+            return self.pipe_result((read_from_image(frame_path) for _, frame_path in frames_paths), filename, audio_target, audio_range)
+        extension = os.path.splitext(frames_paths[0][1])[1] if frames_paths else '.png'
+        filename_length = len(get_file_name(frames_paths[0][1])) if frames_paths else len(str(self.fc))  # frames may be only a part of the target
         Path(os.path.dirname(filename)).mkdir(parents=True, exist_ok=True)
-        command = ['-framerate', str(self.output_fps), '-i', os.path.join(from_dir, f'%0{filename_length}d.png')]
+        command = ['-framerate', str(self.output_fps), '-i', os.path.join(from_dir, f'%0{filename_length}d{extension}')]
         command.extend(self.ffmpeg_resulting_parameters.split(' '))
         command.extend(['-r', str(self.output_fps), filename])
         if audio_target:
+            if audio_range is not None:
+                command.extend(['-ss', str(audio_range[0]), '-to', str(audio_range[1])])
             command.extend(['-i', audio_target, '-shortest'])
         return self.run(command)
+
+    def pipe_result(self, frames: Iterable[Frame], filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
+        writer = self.stream_writer(filename, audio_target, audio_range)
+        try:
+            for frame in frames:
+                writer.write(frame)
+            writer.close()
+            return True
+        except Exception as exception:
+            self.update_status(message=str(exception), mood=Mood.BAD)
+            return False
+
+    def stream_writer(self, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> FFmpegStreamWriter:
+        """
+        Returns a writer, which encodes frames directly to the file with resulting parameters
+        """
+        return FFmpegStreamWriter(filename, self.output_fps, self.ffmpeg_resulting_parameters, audio_target, audio_range)
+
+    def concat(self, parts: List[str], filename: str, audio_target: str | None = None) -> bool:
+        """
+        Joins encoded parts without re-encoding, adding the audio track from the audio target, if it is set
+        """
+        self.update_status(f"Joining {len(parts)} encoded parts to {filename}")
+        Path(os.path.dirname(filename)).mkdir(parents=True, exist_ok=True)
+        list_file = f'{filename}.parts.txt'
+        with open(list_file, 'w', encoding='utf-8') as file:
+            file.writelines("file '" + os.path.abspath(part).replace("'", "'\\''") + "'\n" for part in parts)  # concat demuxer quoting
+        command = ['-f', 'concat', '-safe', '0', '-i', list_file]
+        if audio_target:
+            command.extend(['-i', audio_target, '-map', '0:v:0', '-map', '1:a?', '-shortest'])
+        command.extend(['-c', 'copy', filename])
+        try:
+            return self.run(command)
+        finally:
+            os.remove(list_file)
@@ -6,8 +6,10 @@ from typing import List
 from sinner.models.status.Mood import Mood
 from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
 from sinner.handlers.frame.EOutOfRange import EOutOfRange
-from sinner.helpers.FrameHelper import read_from_image
+from sinner.helpers.FrameHelper import read_from_image, write_to_image
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from sinner.typing import NumeratedFramePath
 from sinner.utilities import is_image, path_exists, is_file
 from sinner.validators.AttributeLoader import Rules
@@ -52,14 +54,22 @@ class ImageHandler(BaseFrameHandler):
             raise EOutOfRange(frame_number, 0, self.fc)
         return NumberedFrame(frame_number, read_from_image(self._target_path))
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         try:
-            result_file = os.path.join(from_dir, os.listdir(from_dir).pop())
-            self.update_status(f"Copy frame from {result_file} to {filename}")
+            if MemoryMappedFrameStorage.exists(from_dir):  # the frame is decoded from the frames container
+                self.update_status(f"Write frame from the frames container in {from_dir} to {filename}")
+                storage = MemoryMappedFrameStorage(from_dir, 0, read_only=True)
+                is_written = write_to_image(next(storage.frames()), filename)
+                storage.release()
+                return is_written
+            result_file = sorted(os.path.join(from_dir, name) for name in os.listdir(from_dir) if BaseFrameCodec.is_frame_file(name))[0]  # the directory also keeps the storage service files
             Path(os.path.dirname(filename)).mkdir(parents=True, exist_ok=True)
-            # fixme: there can by other files in the from_dir
-            shutil.copyfile(result_file, filename)
-            return True
+            if os.path.splitext(result_file)[1].lower() == os.path.splitext(filename)[1].lower():
+                self.update_status(f"Copy frame from {result_file} to {filename}")
+                shutil.copyfile(result_file, filename)
+                return True
+            self.update_status(f"Convert frame from {result_file} to {filename}")  # frames are stored in the format of the frame codec
+            return write_to_image(read_from_image(result_file), filename)
         except Exception as exception:
             self.update_status(message=str(exception), mood=Mood.BAD)
             return False
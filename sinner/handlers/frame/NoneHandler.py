@@ -21,5 +21,5 @@ class NoneHandler(BaseFrameHandler):
     def extract_frame(self, frame_number: int) -> NumberedFrame:
         return NumberedFrame(0, EmptyFrame)
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         return False
@@ -0,0 +1,223 @@
+import glob
+import os
+import re
+import socket
+import stat
+import subprocess
+import sys
+from argparse import Namespace
+from typing import BinaryIO, Self
+
+import cv2
+import numpy
+
+from sinner.handlers.frame.BaseFrameHandler import BaseFrameHandler
+from sinner.handlers.frame.EOutOfRange import EOutOfRange
+from sinner.handlers.frame.FFmpegStreamWriter import FFmpegStreamWriter
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.status.Mood import Mood
+from sinner.typing import Frame
+from sinner.validators.AttributeLoader import Rules
+
+
+class StreamHandler(BaseFrameHandler):
+    """
+    Reads frames from the standard input (the "-" target), a named pipe or a local (unix) socket. The stream length is
+    unknown, and it can't be rewound, so frames are read strictly in the stream order, while the stream lasts. Raw
+    BGR24 frames are read directly, any other stream is decoded with ffmpeg.
+    """
+    emoji: str = '🚿'
+
+    stream_format: str
+    stream_resolution: str | None
+    stream_fps: float
+    ffmpeg_resulting_parameters: str
+
+    _source: BinaryIO | None = None
+    _socket: socket.socket | None = None
+    _decoder: subprocess.Popen[bytes] | None = None
+    _next_frame: Frame | None = None
+    _frames_read: int = 0
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'parameter': 'stream-format',
+                'default': 'auto',
+                'choices': ['auto', 'rawvideo'],
+                'help': 'The format of the streamed target: any format, decoded with ffmpeg, or raw BGR24 frames'
+            },
+            {
+                'parameter': 'stream-resolution',
+                'valid': lambda: re.fullmatch(r'\d+x\d+', str(self.stream_resolution)) is not None,
+                'help': 'The resolution of raw streamed frames, in the WIDTHxHEIGHT form'
+            },
+            {
+                'parameter': 'stream-fps',
+                'default': 30.0,
+                'help': 'The frame rate of the streamed target, it is used for the resulting video'
+            },
+            {
+                'parameter': ['ffmpeg_resulting_parameters'],
+                'default': '-c:v libx264 -preset medium -crf 20 -pix_fmt yuv420p',
+                'help': 'ffmpeg command-line part to adjust resulting video parameters'
+            },
+            {
+                'module_help': 'The module for processing frames from pipes and sockets. When the result is written to a named pipe, set its format in the resulting parameters, e.g. "-f matroska"'
+            }
+        ]
+
+    @staticmethod
+    def is_stream(target_path: str | None) -> bool:
+        """
+        Checks if the target is the standard input, a named pipe or a socket
+        """
+        if target_path == '-':
+            return True
+        try:
+            mode = os.stat(str(target_path)).st_mode
+        except (OSError, ValueError):
+            return False
+        return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+    def __init__(self, target_path: str, parameters: Namespace):
+        super().__init__(target_path, parameters)
+        if self.stream_format == 'rawvideo' and self.stream_resolution is None:
+            raise Exception("The stream resolution should be set for raw streamed frames")
+
+    @property
+    def fps(self) -> float:
+        return self.stream_fps
+
+    @property
+    def fc(self) -> int:
+        """
+        Count of frames, read from the stream so far, the total count is unknown
+        """
+        return self._frames_read
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        if self._resolution is None and self.stream_resolution is not None:
+            width, height = self.stream_resolution.split('x')
+            self._resolution = (int(width), int(height))
+        return self._resolution or (0, 0)
+
+    @property
+    def source(self) -> BinaryIO:
+        """
+        The opened stream, it is opened on the first request (opening of a named pipe waits for its writer)
+        """
+        if self._source is None:
+            if self._target_path == '-':
+                self._source = sys.stdin.buffer
+            elif stat.S_ISSOCK(os.stat(self._target_path).st_mode):
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.connect(self._target_path)
+                self._source = self._socket.makefile('rb')
+            else:
+                self._source = open(self._target_path, 'rb')
+        return self._source
+
+    @property
+    def frames_source(self) -> BinaryIO:
+        """
+        The stream of frames: the target itself for raw frames, or the ffmpeg output, where every frame is a BMP image
+        """
+        if self.stream_format == 'rawvideo':
+            return self.source
+        if self._decoder is None:
+            command = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0', '-f', 'image2pipe', '-c:v', 'bmp', '-']
+            self.update_status(message=' '.join(command), mood=Mood.NEUTRAL)
+            self._decoder = subprocess.Popen(command, stdin=self.source, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return self._decoder.stdout  # type: ignore[return-value]
+
+    @staticmethod
+    def read_exactly(source: BinaryIO, size: int) -> bytes | None:
+        """
+        Reads exactly size bytes, returns None if the stream ends before
+        """
+        chunks = []
+        while size > 0:
+            chunk = source.read(size)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def read_frame(self) -> Frame | None:
+        """
+        Reads the next frame from the stream, returns None at the end of the stream
+        """
+        if self.stream_format == 'rawvideo':
+            width, height = self.resolution
+            data = self.read_exactly(self.frames_source, width * height * 3)
+            return None if data is None else numpy.frombuffer(data, dtype=numpy.uint8).reshape((height, width, 3)).copy()
+        header = self.read_exactly(self.frames_source, 14)  # the BMP file header, it contains the file size
+        if header is None:
+            return None
+        data = self.read_exactly(self.frames_source, int.from_bytes(header[2:6], 'little') - len(header))
+        if data is None:
+            return None
+        frame = cv2.imdecode(numpy.frombuffer(header + data, dtype=numpy.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise Exception(f"Frame {self._frames_read} of the stream can't be decoded")
+        if self._resolution is None:
+            self._resolution = (frame.shape[1], frame.shape[0])
+        return frame
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self) -> int:
+        """
+        Reads the next frame ahead, so the iteration stops right at the end of the stream
+        """
+        self._next_frame = self.read_frame()
+        if self._next_frame is None:
+            raise StopIteration
+        self._frames_read += 1
+        self.current_frame_index = self._frames_read
+        return self._frames_read - 1
+
+    def extract_frame(self, frame_number: int) -> NumberedFrame:
+        """
+        Returns the frame, read with the last iteration step, or reads the stream up to the requested frame
+        """
+        if frame_number < self._frames_read - 1 or (frame_number == self._frames_read - 1 and self._next_frame is None):
+            raise EOutOfRange(frame_number, self._frames_read, sys.maxsize)  # the stream can't be rewound
+        while frame_number >= self._frames_read:
+            next(self)
+        frame, self._next_frame = self._next_frame, None
+        return NumberedFrame(frame_number, frame)  # type: ignore[arg-type]
+
+    def stream_writer(self, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> FFmpegStreamWriter:
+        return FFmpegStreamWriter(filename, self.fps, self.ffmpeg_resulting_parameters, audio_target, audio_range)
+
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
+        self.update_status(f"Resulting frames from {from_dir} to {filename} with {self.fps} FPS")
+        writer = self.stream_writer(filename)
+        try:
+            for frame_path in sorted(file_path for file_path in glob.glob(os.path.join(glob.escape(from_dir), '*.*')) if BaseFrameCodec.is_frame_file(file_path)):
+                writer.write(read_from_image(frame_path))
+            writer.close()
+            return True
+        except Exception as exception:
+            self.update_status(message=str(exception), mood=Mood.BAD)
+            return False
+
+    def release_resources(self) -> None:
+        if self._decoder is not None:
+            self._decoder.kill()
+            self._decoder.wait()
+            self._decoder = None
+        if self._source is not None and self._source is not sys.stdin.buffer:
+            self._source.close()
+        self._source = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        super().release_resources()
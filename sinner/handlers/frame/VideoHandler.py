@@ -8,11 +8,14 @@ class VideoHandler(CV2VideoHandler, FFmpegVideoHandler):
 
     keep_audio: bool
 
-    fps: float
-    fc: int
     _target_path: str
     current_frame_index: int = 0
 
+    # media properties are taken from one cached ffprobe call instead of opening a capture for each of them
+    fps = FFmpegVideoHandler.fps
+    fc = FFmpegVideoHandler.fc
+    resolution = FFmpegVideoHandler.resolution
+
     def rules(self) -> Rules:
         return [
             {
@@ -25,7 +28,7 @@ class VideoHandler(CV2VideoHandler, FFmpegVideoHandler):
             }
         ]
 
-    def result(self, from_dir: str, filename: str, audio_target: str | None = None) -> bool:
+    def result(self, from_dir: str, filename: str, audio_target: str | None = None, audio_range: tuple[float, float] | None = None) -> bool:
         if FFmpegVideoHandler.available():
-            return FFmpegVideoHandler.result(self, from_dir, filename, audio_target)
-        return super().result(from_dir, filename, audio_target)
+            return FFmpegVideoHandler.result(self, from_dir, filename, audio_target, audio_range)
+        return super().result(from_dir, filename, audio_target, audio_range)
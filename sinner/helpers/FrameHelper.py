@@ -1,9 +1,11 @@
 # helper methods to work with frames entity
 
+import math
 import os.path
 from pathlib import Path
+from typing import List
 import cv2
-from numpy import fromfile, uint8, full, dstack
+from numpy import fromfile, uint8, full, dstack, load
 from psutil import WINDOWS
 
 from sinner.typing import Frame
@@ -17,6 +19,8 @@ def create(size: tuple[int, int] = (1, 1)) -> Frame:
 
 
 def read_from_image(path: str) -> Frame:
+    if path.endswith('.npy'):  # raw frames, saved by NPYFrameCodec
+        return load(path)
     if WINDOWS:  # issue #511
         image = cv2.imdecode(fromfile(path, dtype=uint8), cv2.IMREAD_UNCHANGED)
         if len(image.shape) == 2:  # fixes the b/w images issue
@@ -28,14 +32,18 @@ def read_from_image(path: str) -> Frame:
         return cv2.imread(path)
 
 
-def write_to_image(image: Frame, path: str) -> bool:
+def write_to_image(image: Frame, path: str, params: List[int] | None = None) -> bool:
+    """
+    Saves the image in the format, defined by the path extension
+    :param params: cv2.imwrite format-specific parameters, like [cv2.IMWRITE_PNG_COMPRESSION, 3]
+    """
     Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)  # todo: can be replaced with os.makedirs
     if WINDOWS:  # issue #511
-        is_success, im_buf_arr = cv2.imencode(".png", image)
+        is_success, im_buf_arr = cv2.imencode(os.path.splitext(path)[1] or ".png", image, params or [])
         im_buf_arr.tofile(path)
         return is_success
     else:
-        return cv2.imwrite(path, image)
+        return cv2.imwrite(path, image, params or [])
 
 
 def scale(frame: Frame, scale_: float = 0.2) -> Frame:
@@ -69,3 +77,23 @@ def resize_proportionally(frame: Frame, new_shape: tuple[int, int]) -> Frame:
         new_width = 1
     # note: cv2.resize uses WIDTH, HEIGHT order, instead of frames HEIGHT, WIDTH order
     return cv2.resize(frame, (new_width, new_height))
+
+
+def contact_sheet(frames: List[Frame], tile_size: tuple[int, int] = (180, 320), columns: int | None = None) -> Frame:
+    """
+    Places frames on one image as a grid of tiles
+    :param frames: frames to place, in the order of tiles
+    :param tile_size: tuple[HEIGHT, WIDTH] bounds of every tile, frames are resized proportionally to fit them
+    :param columns: count of tiles in a row, by default the grid is close to a square
+    :return: the sheet frame
+    """
+    columns = columns or max(math.ceil(math.sqrt(len(frames))), 1)
+    rows = max(math.ceil(len(frames) / columns), 1)
+    tile_height, tile_width = tile_size
+    sheet = create((rows * tile_height, columns * tile_width))
+    for number, frame in enumerate(frames):
+        tile = resize_proportionally(frame, tile_size)
+        top = number // columns * tile_height
+        left = number % columns * tile_width
+        sheet[top:top + tile.shape[0], left:left + tile.shape[1]] = tile[:, :, :3]
+    return sheet
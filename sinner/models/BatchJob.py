@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchJob:
+    """
+    One target of the batch queue, processed with one source
+    """
+    target_path: str
+    source_path: str | None = None
+
+    @property
+    def name(self) -> str:
+        return self.target_path if self.source_path is None else f'{self.source_path} -> {self.target_path}'
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+from sinner.typing import Frame
+
+
+@dataclass(eq=False)
+class BatchRequest:
+    """
+    One frame, waiting in the micro-batcher, and its processing result
+    """
+    frame: Frame
+    result: Frame | None = None
+    error: BaseException | None = None
+    done: bool = False
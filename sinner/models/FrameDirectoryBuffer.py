@@ -1,33 +1,46 @@
 import os
+import shutil
 import threading
 from pathlib import Path
 from typing import List, Optional, ClassVar, Self
 
-from sinner.helpers.FrameHelper import write_to_image, read_from_image
 from sinner.models.NumberedFrame import NumberedFrame
-from sinner.utilities import is_absolute_path, path_exists, get_file_name, normalize_path
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+from sinner.models.storage.PNGFrameCodec import PNGFrameCodec
+from sinner.utilities import is_absolute_path, path_exists, normalize_path
 
 
 class FrameDirectoryBuffer:
+    """
+    Keeps processed preview frames of the source/target pair in the frame storage. Frames are numbered from 1 here,
+    so the storage keeps frames_count + 1 frames.
+    """
     endpoint_name: ClassVar[str] = 'preview'
     _temp_dir: str
+    _codec: BaseFrameCodec
+    _storage_name: str
+    _storage: BaseFrameStorage | None = None
+    _lock: threading.Lock
 
     _source_name: Optional[str] = None
     _target_name: Optional[str] = None
     _frames_count: int = 0
-    _zfill_length: Optional[int] = None
     _path: Optional[str] = None
     _indices: List[int] = []
     _miss: int = 0  # the current miss between requested frame and the returned one
 
     _loaded: bool = False  # flag to check if source & target names are loaded
 
-    def __init__(self, temp_dir: str):
+    def __init__(self, temp_dir: str, codec: BaseFrameCodec | None = None, storage_name: str = 'DirectoryFrameStorage'):
         self.temp_dir = temp_dir
+        self._codec = PNGFrameCodec() if codec is None else codec
+        self._storage_name = storage_name
+        self._lock = threading.Lock()
 
     def load(self, source_name: str, target_name: str, frames_count: int) -> Self:
+        self.release_storage()
         self._path = None
-        self._zfill_length = None
         self._source_name = source_name
         self._target_name = target_name
         self._frames_count = frames_count
@@ -36,8 +49,8 @@ class FrameDirectoryBuffer:
         return self
 
     def flush(self) -> None:
+        self.release_storage()
         self._path = None
-        self._zfill_length = None
         self._source_name = None
         self._target_name = None
         self._frames_count = 0
@@ -54,12 +67,6 @@ class FrameDirectoryBuffer:
             raise Exception("Relative paths are not supported")
         self._temp_dir = os.path.abspath(os.path.join(str(normalize_path(value or '')), self.endpoint_name))
 
-    @property
-    def zfill_length(self) -> int:
-        if self._zfill_length is None:
-            self._zfill_length = len(str(self._frames_count))
-        return self._zfill_length
-
     @staticmethod
     def make_path(path: str) -> str:
         if not path_exists(path):
@@ -74,61 +81,70 @@ class FrameDirectoryBuffer:
             self.make_path(self._path)
         return self._path
 
-    #  Returns a processed file name for an unprocessed frame index
-    def get_frame_processed_name(self, frame: NumberedFrame) -> str:
-        if frame.name:
-            filename = frame.name + '.png'
-        else:
-            filename = str(frame.index).zfill(self.zfill_length) + '.png'
-        return str(os.path.join(self.path, filename))
+    @property
+    def storage(self) -> BaseFrameStorage:
+        if self._storage is None:
+            self._storage = BaseFrameStorage.create(self._storage_name, self.path, self._frames_count + 1, self._codec)
+        return self._storage
+
+    def release_storage(self) -> None:
+        if self._storage is not None:
+            self._storage.release()
+            self._storage = None
 
     def clean(self) -> None:
         pass
         # shutil.rmtree(self._path)
 
     def add_frame(self, frame: NumberedFrame) -> None:
-        with threading.Lock():
-            if not self._loaded:
-                return
-                # raise Exception(f"{self.__class__.__name__} isn't in loaded state. Call load() method properly first!")
-
-            if not write_to_image(frame.frame, self.get_frame_processed_name(frame)):
-                raise Exception(f"Error saving frame: {self.get_frame_processed_name(frame)}")
-            self._indices.append(frame.index)
+        if not self._loaded:
+            return
+            # raise Exception(f"{self.__class__.__name__} isn't in loaded state. Call load() method properly first!")
+        if self.storage.frames_files:
+            written = self.storage.write(frame)
+        else:
+            with self._lock:  # one container keeps frames of one shape, so it is recreated, when the preview quality is changed
+                if getattr(self.storage, 'shape', None) not in (None, frame.frame.shape):
+                    self.release_storage()
+                    shutil.rmtree(self.path, ignore_errors=True)
+                    self.make_path(self.path)
+                    self._indices = []
+                written = self.storage.write(frame)
+        if not written:
+            raise Exception(f"Error saving frame {frame.index} to {self.path}")
+        self._indices.append(frame.index)
+
+    def read_frame(self, index: int) -> NumberedFrame | None:
+        try:
+            frame = self.storage.read(index)
+        except Exception:  # the file may exist but can be locked in another thread.
+            return None
+        if frame is None:
+            return None
+        return NumberedFrame(index, frame if self.storage.frames_files else frame.copy())  # a container view is not changed by the player
 
     def get_frame(self, index: int, return_previous: bool = True) -> NumberedFrame | None:
         if not self._loaded:  # not loaded
             return None
-        filename = str(index).zfill(self.zfill_length) + '.png'
-        filepath = str(os.path.join(self.path, filename))
-        if path_exists(filepath):  # todo: check within indexes should be faster
-            try:
+        if self.storage.has(index):
+            frame = self.read_frame(index)
+            if frame is not None:
                 self._miss = 0
-                return NumberedFrame(index, read_from_image(filepath))
-            except Exception:
-                pass
+            return frame
         elif return_previous:
             for previous_number in range(index - 1, 0, -1):
                 if self.has_index(previous_number):
-                    previous_filename = str(previous_number).zfill(self.zfill_length) + '.png'
-                    previous_file_path = os.path.join(self.path, previous_filename)
-                    if path_exists(previous_file_path):
-                        try:
-                            self._miss = index - previous_number
-                            return NumberedFrame(previous_number, read_from_image(previous_file_path))
-                        except Exception:  # the file may exist but can be locked in another thread.
-                            pass
+                    frame = self.read_frame(previous_number)
+                    if frame is not None:
+                        self._miss = index - previous_number
+                        return frame
         return None
 
     def has_index(self, index: int) -> bool:
         return index in self._indices
 
     def init_indices(self) -> None:
-        self._indices = []
-        with os.scandir(self.path) as entries:
-            for entry in entries:
-                if entry.is_file() and entry.name.endswith(".png"):
-                    self._indices.append(int(get_file_name(entry.name)))
+        self._indices = self.storage.indices()
 
     def get_indices(self) -> List[int]:
         return self._indices
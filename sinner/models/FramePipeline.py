@@ -0,0 +1,199 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Dict, Any
+
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.ThreadsTuner import ThreadsTuner
+from sinner.typing import Frame
+
+
+class FramePipeline:
+    """
+    Staged frames processing: one thread extracts frames, a pool of workers processes them, and one thread saves the
+    results. Stages are connected with bounded queues, so the count of frames in memory is limited by queues depths
+    and workers count, while extraction, processing and saving are overlapped. If the memory governor is set,
+    extraction waits while the memory budget is exhausted, so fewer frames are in flight. If the threads tuner is
+    set, the pool is started with the maximal count of workers, but only the tuned count of them is active.
+    """
+    poll_interval: float = 0.1  # seconds, how often blocked stages check if the pipeline is stopped
+
+    _extract: Callable[[int], NumberedFrame]
+    _process: Callable[[Frame], Frame]
+    _save: Callable[[NumberedFrame], None]
+    _on_saved: Callable[[], None] | None
+    _workers: int
+    _ordered: bool
+    _decoded: queue.Queue[tuple[int, NumberedFrame] | None]
+    _processed: queue.Queue[tuple[int, NumberedFrame] | None]
+    _stop: threading.Event
+    _error: BaseException | None = None
+    _governor: MemoryGovernor | None
+    _in_flight: int  # count of extracted, but not saved frames
+    _frame_size: int  # the estimated memory size of one frame in flight
+    _lock: threading.Lock
+    _tuner: ThreadsTuner | None
+    _decoding_done: threading.Event
+
+    def __init__(self, extract: Callable[[int], NumberedFrame], process: Callable[[Frame], Frame], save: Callable[[NumberedFrame], None], workers: int = 1, decode_depth: int = 2, write_depth: int = 2, ordered: bool = False, on_saved: Callable[[], None] | None = None, governor: MemoryGovernor | None = None, tuner: ThreadsTuner | None = None):
+        """
+        :param extract: returns the frame by its index
+        :param process: processes the frame
+        :param save: saves the processed frame
+        :param workers: count of processing threads
+        :param decode_depth: count of extracted frames, waiting for processing
+        :param write_depth: count of processed frames, waiting for saving
+        :param ordered: save frames in the order they are requested
+        :param on_saved: is called after every saved frame
+        :param governor: the memory governor to limit frames in flight
+        :param tuner: the threads tuner to change the count of active workers
+        """
+        self._extract = extract
+        self._process = process
+        self._save = save
+        self._tuner = tuner
+        self._workers = max(tuner.maximum if tuner is not None else workers, 1)
+        self._ordered = ordered
+        self._on_saved = on_saved
+        self._decoded = queue.Queue(maxsize=max(decode_depth, 1))
+        self._processed = queue.Queue(maxsize=max(write_depth, 1))
+        self._stop = threading.Event()
+        self._governor = governor
+        self._in_flight = 0
+        self._frame_size = 0
+        self._lock = threading.Lock()
+        self._decoding_done = threading.Event()
+
+    @property
+    def occupancy(self) -> Dict[str, int]:
+        """
+        Count of frames, waiting in every queue
+        """
+        return {'decoded': self._decoded.qsize(), 'processed': self._processed.qsize()}
+
+    def run(self, frames: Iterable[int]) -> None:
+        """
+        Passes all frames through the pipeline, re-raises the first error from any stage
+        """
+        self._stop.clear()
+        self._decoding_done.clear()
+        self._error = None
+        decoder = threading.Thread(target=self._stage, args=(self._decode, frames), name='pipeline-decode', daemon=True)
+        workers = [threading.Thread(target=self._stage, args=(self._work, number), name=f'pipeline-worker-{number}', daemon=True) for number in range(self._workers)]
+        writer = threading.Thread(target=self._stage, args=(self._write,), name='pipeline-write', daemon=True)
+        for thread in [decoder, *workers, writer]:
+            thread.start()
+        decoder.join()
+        for thread in workers:
+            thread.join()
+        self._put(self._processed, None)
+        writer.join()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self) -> None:
+        """
+        Stops all stages, frames in flight are dropped
+        """
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def _stage(self, target: Callable[..., None], *args: Any) -> None:
+        try:
+            target(*args)
+        except BaseException as exception:  # SystemExit should stop the pipeline too
+            if self._error is None:
+                self._error = exception
+            self._stop.set()
+
+    def _decode(self, frames: Iterable[int]) -> None:
+        try:
+            for sequence, frame_index in enumerate(frames):
+                self._await_budget()
+                if self._stop.is_set():
+                    break
+                numbered_frame = self._extract(frame_index)
+                self._frame_size = numbered_frame.frame.nbytes * 2  # the source and the processed frames
+                with self._lock:
+                    self._in_flight += 1
+                if not self._put(self._decoded, (sequence, numbered_frame)):
+                    break
+        finally:
+            self._decoding_done.set()
+            for _ in range(self._workers):
+                self._put(self._decoded, None)
+
+    def _await_budget(self) -> None:
+        """
+        Holds the extraction while the memory budget is exhausted, but at least one frame is always allowed in flight
+        """
+        if self._governor is None:
+            return
+        self._governor.track(self.__class__.__name__, self._in_flight * self._frame_size)
+        if self._in_flight == 0 or self._governor.budget(self._frame_size) > 0:
+            return
+        self._governor.throttle()
+        while not self._stop.is_set() and self._in_flight > 0 and self._governor.budget(self._frame_size) < 1:
+            time.sleep(self.poll_interval)
+
+    def _await_activation(self, number: int) -> None:
+        """
+        Holds the worker, while it is out of the tuned workers count
+        """
+        while self._tuner is not None and number >= self._tuner.threads and not self._stop.is_set() and not self._decoding_done.is_set():
+            time.sleep(self.poll_interval)
+
+    def _work(self, number: int) -> None:
+        while True:
+            self._await_activation(number)
+            item = self._get(self._decoded)
+            if item is None:
+                break
+            sequence, numbered_frame = item
+            numbered_frame.frame = self._process(numbered_frame.frame)
+            if not self._put(self._processed, (sequence, numbered_frame)):
+                break
+
+    def _write(self) -> None:
+        pending: Dict[int, NumberedFrame] = {}  # frames, waiting for their predecessors in the ordered mode
+        next_sequence = 0
+        while (item := self._get(self._processed)) is not None:
+            sequence, numbered_frame = item
+            if not self._ordered:
+                self._save_frame(numbered_frame)
+                continue
+            pending[sequence] = numbered_frame
+            while next_sequence in pending:
+                self._save_frame(pending.pop(next_sequence))
+                next_sequence += 1
+
+    def _save_frame(self, numbered_frame: NumberedFrame) -> None:
+        self._save(numbered_frame)
+        with self._lock:
+            self._in_flight -= 1
+        if self._tuner is not None:
+            self._tuner.frame_done(self._frame_size)
+        if self._on_saved is not None:
+            self._on_saved()
+
+    def _put(self, target: queue.Queue[Any], item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue[Any]) -> Any:
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+        return None
+
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict
+
+from sinner.models.NumberedFrame import NumberedFrame
+
+
+class FramePrefetcher:
+    """
+    Reads frames ahead in a background pool: every request schedules reading of the next frames, so they are likely
+    ready when they are requested
+    """
+    _extract: Callable[[int], NumberedFrame]
+    _depth: int
+    _frames_count: int
+    _threads: int
+    _executor: ThreadPoolExecutor | None = None
+    _futures: Dict[int, Future[NumberedFrame]]
+    _lock: threading.Lock
+
+    def __init__(self, extract: Callable[[int], NumberedFrame], depth: int, frames_count: int, threads: int = 2):
+        self._extract = extract
+        self._depth = depth
+        self._frames_count = frames_count
+        self._threads = threads
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._threads, thread_name_prefix=self.__class__.__name__)
+        return self._executor
+
+    def get(self, index: int) -> NumberedFrame:
+        with self._lock:
+            future = self._futures.pop(index, None)
+            for ahead_index in range(index + 1, min(index + 1 + self._depth, self._frames_count)):
+                if ahead_index not in self._futures:
+                    self._futures[ahead_index] = self.executor.submit(self._extract, ahead_index)
+            # frames, which were read, but never requested (e.g. after a seek), are dropped
+            for stale_index in [i for i in self._futures if i < index - self._depth or i > index + self._depth]:
+                self._futures.pop(stale_index).cancel()
+        if future is None:
+            return self._extract(index)
+        return future.result()
+
+    @property
+    def pending(self) -> int:
+        """
+        Count of frames, which are read or being read ahead
+        """
+        with self._lock:
+            return len(self._futures)
+
+    def close(self) -> None:
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures = {}
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
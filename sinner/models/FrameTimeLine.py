@@ -4,6 +4,7 @@ from typing import List, Optional, Self
 
 from sinner.models.FrameDirectoryBuffer import FrameDirectoryBuffer
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
 
 
 class FrameTimeLine:
@@ -23,9 +24,9 @@ class FrameTimeLine:
     _last_returned_index: Optional[int] = None
     _temp_dir: str
 
-    def __init__(self, temp_dir: str) -> None:
+    def __init__(self, temp_dir: str, codec: BaseFrameCodec | None = None, storage_name: str = 'DirectoryFrameStorage') -> None:
         self._temp_dir = temp_dir
-        self._FrameBuffer = FrameDirectoryBuffer(self._temp_dir)
+        self._FrameBuffer = FrameDirectoryBuffer(self._temp_dir, codec, storage_name)
 
     def load(self, source_name: Optional[str] = None, target_name: Optional[str] = None, frame_time: float = 0, start_frame: int = 0, end_frame: int = 0) -> Self:
         """Loads source/target pair to the timeline"""
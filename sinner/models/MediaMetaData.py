@@ -11,6 +11,7 @@ class MediaMetaData:
     render_resolution: Tuple[int, int] = (0, 0)  # The resolution, frame rendered with
     fps: float = 0  # Frames per second, 0 as infinite value
     frames_count: int = 0  # Total number of frames
+    exact_frames_count: bool = True  # False, if the frames count is estimated
 
     @property
     def length(self) -> float:
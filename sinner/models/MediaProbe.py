@@ -0,0 +1,121 @@
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, Set
+
+from sinner.models.MediaMetaData import MediaMetaData
+from sinner.utilities import get_file_identity
+
+
+class MediaProbe:
+    """
+    Probes media files with a single ffprobe call and caches the results in memory and on disk, keyed by the file
+    identity. In the fast mode the frames count is estimated from the stream header (or the duration multiplied by fps),
+    and the exact count is computed in the background; cached values are updated when it is ready.
+    """
+    cache_subdir: str = 'metadata'
+
+    _cache: Dict[str, MediaMetaData] = {}
+    _counting: Set[str] = set()  # keys of files, which frames are being counted in the background
+    _lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def cache_path(target_path: str, temp_dir: str) -> str:
+        return os.path.join(temp_dir, MediaProbe.cache_subdir, f'{get_file_identity(target_path)}.json')
+
+    @staticmethod
+    def probe(target_path: str, temp_dir: str | None = None, exact: bool = True) -> MediaMetaData:
+        """
+        Returns the target metadata. If exact is False, the frames count can be estimated
+        """
+        key = get_file_identity(target_path)
+        with MediaProbe._lock:
+            metadata = MediaProbe._cache.get(key)
+        if metadata is None and temp_dir is not None:
+            metadata = MediaProbe.read_cache(MediaProbe.cache_path(target_path, temp_dir))
+            if metadata is not None:
+                with MediaProbe._lock:
+                    MediaProbe._cache[key] = metadata
+        if metadata is None or (exact and not metadata.exact_frames_count):
+            metadata = MediaProbe.run(target_path, count_frames=exact)
+            MediaProbe.store(key, metadata, target_path, temp_dir)
+        if not metadata.exact_frames_count:
+            MediaProbe.count_frames_async(key, metadata, target_path, temp_dir)
+        return metadata
+
+    @staticmethod
+    def run(target_path: str, count_frames: bool = True) -> MediaMetaData:
+        """
+        Runs ffprobe once, with counting of packets (without decoding), if required
+        """
+        command = ['ffprobe', '-v', 'error', '-select_streams', 'v:0']
+        if count_frames:
+            command.append('-count_packets')
+        command.extend(['-show_entries', 'stream=width,height,avg_frame_rate,nb_frames,nb_read_packets,duration:format=duration', '-of', 'json', target_path])
+        output: Dict[str, Any] = json.loads(subprocess.check_output(command, stderr=subprocess.DEVNULL))
+        streams = output.get('streams') or [{}]
+        stream: Dict[str, Any] = streams[0]
+        fps = MediaProbe.parse_rate(stream.get('avg_frame_rate', '0/0'))
+        resolution = (int(stream.get('width', 0)), int(stream.get('height', 0)))
+        if count_frames and str(stream.get('nb_read_packets', 'N/A')).isdigit():
+            return MediaMetaData(resolution=resolution, fps=fps, frames_count=int(stream['nb_read_packets']), exact_frames_count=True)
+        if str(stream.get('nb_frames', 'N/A')).isdigit():
+            frames_count = int(stream['nb_frames'])
+        else:
+            duration = stream.get('duration') or output.get('format', {}).get('duration') or 0
+            frames_count = round(float(duration) * fps) if duration != 'N/A' else 0
+        return MediaMetaData(resolution=resolution, fps=fps, frames_count=max(frames_count, 1), exact_frames_count=False)
+
+    @staticmethod
+    def parse_rate(rate: str) -> float:
+        numerator, _, denominator = rate.partition('/')
+        try:
+            return int(numerator) / int(denominator or 1)
+        except (ValueError, ZeroDivisionError):
+            return 0
+
+    @staticmethod
+    def count_frames_async(key: str, metadata: MediaMetaData, target_path: str, temp_dir: str | None) -> None:
+        def count() -> None:
+            try:
+                exact_metadata = MediaProbe.run(target_path, count_frames=True)
+                metadata.frames_count = exact_metadata.frames_count
+                metadata.exact_frames_count = exact_metadata.exact_frames_count
+                MediaProbe.store(key, metadata, target_path, temp_dir)
+            except Exception:  # the estimated value stays in use
+                pass
+            finally:
+                with MediaProbe._lock:
+                    MediaProbe._counting.discard(key)
+
+        with MediaProbe._lock:
+            if key in MediaProbe._counting:
+                return
+            MediaProbe._counting.add(key)
+        threading.Thread(target=count, name='MediaProbe', daemon=True).start()
+
+    @staticmethod
+    def store(key: str, metadata: MediaMetaData, target_path: str, temp_dir: str | None) -> None:
+        with MediaProbe._lock:
+            MediaProbe._cache[key] = metadata
+        if temp_dir is not None:
+            MediaProbe.write_cache(MediaProbe.cache_path(target_path, temp_dir), metadata)
+
+    @staticmethod
+    def read_cache(path: str) -> MediaMetaData | None:
+        try:
+            with open(path) as file:
+                data = json.load(file)
+            return MediaMetaData(resolution=tuple(data['resolution']), fps=data['fps'], frames_count=data['frames_count'], exact_frames_count=data['exact_frames_count'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def write_cache(path: str, metadata: MediaMetaData) -> None:
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}'
+        with open(temp_path, 'w') as file:
+            json.dump({'resolution': metadata.resolution, 'fps': metadata.fps, 'frames_count': metadata.frames_count, 'exact_frames_count': metadata.exact_frames_count}, file)
+        os.replace(temp_path, path)
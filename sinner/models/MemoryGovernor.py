@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+from typing import ClassVar, Dict
+
+import psutil
+
+
+class MemoryGovernor:
+    """
+    The process-wide memory watcher. It samples the process memory usage in a background thread (so the usage is
+    read without a system call on every frame), keeps the sizes of frames buffers reported by processing stages and
+    gives them the memory budget: how many more frames can be held in memory before the limit is reached.
+    """
+    sample_interval: float = 0.5  # seconds
+    watermark: float = 0.9  # the part of the memory limit, available for frames buffers
+
+    _instance: ClassVar['MemoryGovernor | None'] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    limit: int  # bytes, 0 if the memory is not limited
+    rss: int
+    vms: int
+    rss_max: int
+    vms_max: int
+    throttles: int  # count of times, when the work was reduced to fit the budget
+
+    _pid: int
+    _process: psutil.Process
+    _buffers: Dict[str, int]
+    _thread: threading.Thread
+    _stopped: threading.Event
+
+    @classmethod
+    def get(cls, max_memory: int = 0) -> 'MemoryGovernor':
+        """
+        Returns the shared governor of the current process
+        :param max_memory: the memory limit in GB, 0 to keep the current limit
+        """
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance._pid != os.getpid() or cls._instance._stopped.is_set():  # the forked process needs its own sampler
+                cls._instance = MemoryGovernor(max_memory)
+            elif max_memory:
+                cls._instance.limit = max_memory * 1024 ** 3
+            return cls._instance
+
+    def __init__(self, max_memory: int = 0):
+        self.limit = max_memory * 1024 ** 3
+        self.rss_max = 0
+        self.vms_max = 0
+        self.throttles = 0
+        self._pid = os.getpid()
+        self._process = psutil.Process(self._pid)
+        self._buffers = {}
+        self._stopped = threading.Event()
+        self.sample()
+        self._thread = threading.Thread(target=self._sampling, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def sample(self) -> None:
+        memory_info = self._process.memory_info()
+        self.rss = memory_info.rss
+        self.vms = memory_info.vms
+        self.rss_max = max(self.rss_max, self.rss)
+        self.vms_max = max(self.vms_max, self.vms)
+
+    def _sampling(self) -> None:
+        while not self._stopped.wait(self.sample_interval):
+            try:
+                self.sample()
+            except psutil.Error:
+                pass
+
+    def stop(self) -> None:
+        """
+        Stops the sampling thread, the shared governor is replaced by a new one on the next get() call
+        """
+        self._stopped.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def track(self, stage: str, size: int) -> None:
+        """
+        Reports the current size (in bytes) of the stage frames buffer
+        """
+        self._buffers[stage] = size
+
+    @property
+    def buffers(self) -> Dict[str, int]:
+        return dict(self._buffers)
+
+    def budget(self, frame_size: int) -> int:
+        """
+        Returns the count of frames of the given size (in bytes), which can be additionally held in memory
+        """
+        if not self.limit:
+            return sys.maxsize
+        return max(0, int(self.limit * self.watermark) - self.rss) // max(frame_size, 1)
+
+    def throttle(self) -> None:
+        """
+        Counts the reduction of the work by a stage
+        """
+        self.throttles += 1
+
+    def usage(self) -> str:
+        """
+        Returns the formatted memory usage: resident/virtual, with maximal values
+        """
+        mb = 1024 ** 2
+        return f'{self.rss / mb:05.2f}MB [MAX:{self.rss_max / mb:05.2f}MB]/{self.vms / mb:05.2f}MB [MAX:{self.vms_max / mb:05.2f}MB]'
@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Callable, List
+
+from sinner.models.BatchRequest import BatchRequest
+from sinner.typing import Frame
+
+
+class MicroBatcher:
+    """
+    Collects frames from concurrent processing threads into batches for a batch-aware processor. Every thread passes
+    one frame and waits for its result. The batch is processed by the thread of its first frame, when the batch is
+    full, or when the first frame has waited for the latency deadline, so a lone frame is delayed by the deadline at
+    most. Batches are never larger than the count of threads, passing frames.
+    """
+    _process: Callable[[List[Frame]], List[Frame]]
+    _batch_size: int
+    _latency: float
+    _pending: List[BatchRequest]
+    _condition: threading.Condition
+
+    def __init__(self, process: Callable[[List[Frame]], List[Frame]], batch_size: int, latency: float):
+        """
+        :param process: processes the list of frames, and returns the list of processed frames in the same order
+        :param batch_size: the maximum count of frames in one batch
+        :param latency: seconds, how long the first frame of the batch waits for other frames
+        """
+        self._process = process
+        self._batch_size = max(batch_size, 1)
+        self._latency = max(latency, 0)
+        self._pending = []
+        self._condition = threading.Condition()
+
+    def process_frame(self, frame: Frame) -> Frame:
+        """
+        Passes the frame to the next batch, and returns it processed
+        """
+        if self._batch_size == 1:
+            return self._process([frame])[0]
+        request = BatchRequest(frame)
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify_all()
+            deadline = time.monotonic() + self._latency
+            while not request.done:
+                leading = bool(self._pending) and self._pending[0] is request
+                if leading and (len(self._pending) >= self._batch_size or time.monotonic() >= deadline):
+                    break
+                self._condition.wait(timeout=max(deadline - time.monotonic(), 0) if leading else None)
+            if not request.done:
+                batch = self._pending[:self._batch_size]
+                del self._pending[:self._batch_size]
+                self._condition.notify_all()  # the next frame leads the next batch
+        if not request.done:
+            self.process_batch(batch)
+        if request.error is not None:
+            raise request.error
+        return request.result  # type: ignore[return-value]
+
+    def process_batch(self, batch: List[BatchRequest]) -> None:
+        try:
+            results = self._process([request.frame for request in batch])
+            if len(results) != len(batch):
+                raise Exception(f"{len(results)} frames are returned for the batch of {len(batch)} frames")
+            for request, result in zip(batch, results):
+                request.result = result
+        except BaseException as exception:  # every waiting thread gets the error
+            for request in batch:
+                request.error = exception
+        with self._condition:
+            for request in batch:
+                request.done = True
+            self._condition.notify_all()
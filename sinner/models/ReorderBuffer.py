@@ -0,0 +1,45 @@
+import threading
+from typing import Callable, Dict
+
+from sinner.models.NumberedFrame import NumberedFrame
+
+
+class ReorderBuffer:
+    """
+    Collects frames, coming in any order from processing threads, and passes them to the consumer strictly in the
+    order of their indices, starting from the given one
+    """
+    _consumer: Callable[[NumberedFrame], None]
+    _next_index: int
+    _frames: Dict[int, NumberedFrame]
+    _lock: threading.Lock
+
+    def __init__(self, consumer: Callable[[NumberedFrame], None], start: int = 0):
+        self._consumer = consumer
+        self._next_index = start
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def push(self, frame: NumberedFrame) -> None:
+        with self._lock:
+            if frame.index < self._next_index:
+                return  # the frame is already consumed
+            self._frames[frame.index] = frame
+            while self._next_index in self._frames:
+                self._consumer(self._frames.pop(self._next_index))
+                self._next_index += 1
+
+    @property
+    def next_index(self) -> int:
+        """
+        The index of the frame, which is awaited to be passed to the consumer
+        """
+        return self._next_index
+
+    @property
+    def pending(self) -> int:
+        """
+        Count of frames, held in the buffer until their predecessors arrive
+        """
+        with self._lock:
+            return len(self._frames)
@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, List, Set
+
+from sinner.handlers.frame.FFmpegStreamWriter import FFmpegStreamWriter
+from sinner.models.status.StatusMixin import StatusMixin
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+
+
+class SegmentEncoder(StatusMixin):
+    """
+    Encodes stored frames to the resulting video by fixed-length segments in background threads. A segment is encoded
+    as soon as all its frames are stored, so encoding overlaps with processing, and already encoded segments are kept
+    to continue an interrupted processing. Every segment is encoded separately, so it starts with a keyframe, and
+    segments can be joined without re-encoding.
+    """
+    emoji: str = '🎞️'
+
+    _storage: BaseFrameStorage
+    _path: str
+    _length: int
+    _extension: str
+    _writer: Callable[[str], FFmpegStreamWriter]
+    _stored: bytearray  # 1 for every stored frame index
+    _counts: List[int]  # count of stored frames in every segment
+    _submitted: Set[int]
+    _futures: List[Future[None]]
+    _executor: ThreadPoolExecutor
+    _lock: threading.Lock
+
+    def __init__(self, storage: BaseFrameStorage, path: str, length: int, writer: Callable[[str], FFmpegStreamWriter], workers: int = 2, extension: str = '.mp4'):
+        """
+        :param storage: the storage of processed frames
+        :param path: the directory for encoded segments
+        :param length: count of frames in every segment
+        :param writer: returns the frames writer for the segment file
+        :param workers: count of simultaneously encoded segments
+        :param extension: the segment files extension
+        """
+        self._storage = storage
+        self._path = path
+        self._length = max(length, 1)
+        self._extension = extension
+        self._writer = writer
+        self._stored = bytearray(storage.frames_count)
+        self._counts = [0] * self.segments_count
+        self._submitted = set()
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix=self.__class__.__name__)
+        self._lock = threading.Lock()
+        for index in storage.indices():
+            self.frame_stored(index)
+
+    @property
+    def segments_count(self) -> int:
+        return (self._storage.frames_count + self._length - 1) // self._length
+
+    @property
+    def segments(self) -> List[str]:
+        """
+        Paths of all segments files in the order of frames
+        """
+        return [self.segment_path(number) for number in range(self.segments_count)]
+
+    @property
+    def encoded(self) -> List[str]:
+        """
+        Paths of already encoded segments files
+        """
+        return [segment for segment in self.segments if os.path.exists(segment)]
+
+    def segment_bounds(self, number: int) -> tuple[int, int]:
+        return number * self._length, min((number + 1) * self._length, self._storage.frames_count)
+
+    def segment_path(self, number: int) -> str:
+        start, _ = self.segment_bounds(number)
+        return os.path.join(self._path, str(start).zfill(len(str(self._storage.frames_count))) + self._extension)
+
+    def frame_stored(self, index: int) -> None:
+        """
+        Counts the stored frame, and starts the segment encoding, if all its frames are stored
+        """
+        if not 0 <= index < len(self._stored):
+            return
+        with self._lock:
+            if self._stored[index]:
+                return
+            self._stored[index] = 1
+            number = index // self._length
+            self._counts[number] += 1
+            start, end = self.segment_bounds(number)
+            if self._counts[number] == end - start:
+                self.submit(number)
+
+    def submit(self, number: int) -> None:
+        if number not in self._submitted:
+            self._submitted.add(number)
+            self._futures.append(self._executor.submit(self.encode, number))
+
+    def encode(self, number: int) -> None:
+        segment = self.segment_path(number)
+        if os.path.exists(segment):
+            return
+        start, end = self.segment_bounds(number)
+        partial = os.path.join(self._path, f'partial-{start}{self._extension}')
+        writer = self._writer(partial)
+        for index in range(start, end):
+            frame = self._storage.read(index)
+            if frame is None:
+                writer.close()
+                raise Exception(f"Frame {index} of the segment {os.path.basename(segment)} is not stored")
+            writer.write(frame)
+        writer.close()
+        os.replace(partial, segment)
+
+    def finish(self) -> List[str]:
+        """
+        Encodes all remaining segments, waits for all encodings and returns segments paths
+        """
+        with self._lock:
+            for number in range(self.segments_count):
+                self.submit(number)
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._executor.shutdown()
+        return self.segments
@@ -3,11 +3,13 @@ from argparse import Namespace
 from pathlib import Path
 from typing import Any, Dict, List
 
-from sinner.helpers.FrameHelper import write_to_image, EmptyFrame
 from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from sinner.models.status.StatusMixin import StatusMixin
 from sinner.models.status.Mood import Mood
-from sinner.utilities import is_absolute_path, format_sequences, path_exists, is_file, normalize_path, get_file_name
+from sinner.utilities import is_absolute_path, format_sequences, path_exists, normalize_path, is_dir
 from sinner.validators.AttributeLoader import Rules, AttributeLoader
 
 
@@ -15,6 +17,8 @@ class State(AttributeLoader, StatusMixin):
     emoji: str = '👀'
     source_path: str | None = None
     initial_target_path: str | None = None
+    frame_codec: str = 'PNGFrameCodec'
+    frame_storage: str = 'DirectoryFrameStorage'
 
     _target_path: str | None = None
     _path: str | None = None
@@ -22,6 +26,10 @@ class State(AttributeLoader, StatusMixin):
     processor_name: str
     _temp_dir: str
     _zfill_length: int | None
+    _codec: BaseFrameCodec | None = None
+    _storage: BaseFrameStorage | None = None
+
+    parameters: Namespace
 
     final_check_state: bool = True
     final_check_empty: bool = True
@@ -39,12 +47,26 @@ class State(AttributeLoader, StatusMixin):
                 'attribute': 'initial_target_path',  # issue 29: need to know this parameter to avoid names collisions
                 'filter': lambda: normalize_path(self.initial_target_path)
             },
+            {
+                'parameter': 'frame-codec',
+                'default': 'PNGFrameCodec',
+                'choices': BaseFrameCodec.list(),
+                'help': 'The format of temporary frames'
+            },
+            {
+                'parameter': 'frame-storage',
+                'default': 'DirectoryFrameStorage',
+                'choices': BaseFrameStorage.list(),
+                'valid': lambda: self.frame_storage != 'MemoryMappedFrameStorage' or self.initial_target_path is None or not is_dir(self.initial_target_path) or MemoryMappedFrameStorage.exists(self.initial_target_path),  # images of a directory can differ in size
+                'help': 'The storage of temporary frames: a directory of image files, or one memory-mapped file per processing stage (not for directories of images)'
+            },
             {
                 'module_help': 'The state control module'
             }
         ]
 
     def __init__(self, parameters: Namespace, target_path: str | None, temp_dir: str, frames_count: int, processor_name: str):
+        self.parameters = parameters
         super().__init__(parameters)
         self.target_path = target_path
         self.temp_dir = temp_dir
@@ -103,10 +125,23 @@ class State(AttributeLoader, StatusMixin):
     @path.setter
     def path(self, path: str) -> None:
         self._path = path
+        self._storage = None
         self.make_path(self._path)
 
+    @property
+    def codec(self) -> BaseFrameCodec:
+        if self._codec is None:
+            self._codec = BaseFrameCodec.create(self.frame_codec, self.parameters)
+        return self._codec
+
+    @property
+    def storage(self) -> BaseFrameStorage:
+        if self._storage is None:
+            self._storage = BaseFrameStorage.create(self.frame_storage, self.path, self.frames_count, self.codec)
+        return self._storage
+
     def save_temp_frame(self, frame: NumberedFrame) -> None:
-        if not write_to_image(frame.frame, self.get_frame_processed_name(frame)):
+        if not self.storage.write(frame):
             raise Exception(f"Error saving frame: {self.get_frame_processed_name(frame)}")
 
     #  Checks if some frame already processed
@@ -121,26 +156,19 @@ class State(AttributeLoader, StatusMixin):
 
     @property
     def processed_frames(self) -> List[str]:
-        png_files = []
-        with os.scandir(self.path) as entries:
-            for entry in entries:
-                if entry.is_file() and entry.name.endswith(".png"):
-                    png_files.append(entry.path)
-        return png_files
+        """
+        Files of processed frames, if they are stored as separate files
+        """
+        return self.storage.files()
 
     @property
     def processed_frames_indices(self) -> List[int]:
-        indices = []
-        with os.scandir(self.path) as entries:
-            for entry in entries:
-                if entry.is_file() and entry.name.endswith(".png"):
-                    indices.append((int(get_file_name(entry.name))))
-        return indices
+        return self.storage.indices()
 
     #  Returns count of already processed frame for this target (0, if none).
     @property
     def processed_frames_count(self) -> int:
-        return len(self.processed_frames)
+        return self.storage.count
 
     #  Returns count of still unprocessed frame for this target (0, if none).
     @property
@@ -150,9 +178,9 @@ class State(AttributeLoader, StatusMixin):
     #  Returns a processed file name for an unprocessed frame index
     def get_frame_processed_name(self, frame: NumberedFrame) -> str:
         if frame.name:
-            filename = frame.name + '.png'
+            filename = frame.name + self.codec.extension
         else:
-            filename = str(frame.index).zfill(self.zfill_length) + '.png'
+            filename = str(frame.index).zfill(self.zfill_length) + self.codec.extension
         return str(os.path.join(self.path, filename))
 
     @property
@@ -163,16 +191,15 @@ class State(AttributeLoader, StatusMixin):
 
     def final_check(self) -> tuple[bool, List[int]]:
         result = True
+        if self.final_check_integrity:  # frames could be changed outside the storage, e.g. removed by the user
+            self.storage.reconcile()
         processed_frames_count = self.processed_frames_count
         if self.final_check_state and not self.is_finished:
             self.update_status(message=f"The final processing check failed: processing is done, but state is not finished. Check in {self.path}, may be some frames lost?", mood=Mood.BAD)
             result = False
 
         if self.final_check_empty:  # check if all frames are non zero-sized
-            zero_sized_files_count = 0
-            for file_path in self.processed_frames:
-                if is_file(file_path) and os.path.getsize(file_path) == 0:
-                    zero_sized_files_count += 1
+            zero_sized_files_count = self.storage.empty_count()
             if zero_sized_files_count > 0:
                 self.update_status(message=f"There are zero-sized files in {self.path} temp directory ({zero_sized_files_count} of {processed_frames_count}). Check for free disk space and access rights.", mood=Mood.BAD)
                 result = False
@@ -188,7 +215,6 @@ class State(AttributeLoader, StatusMixin):
     def check_integrity(self) -> List[int]:
         result: List[int] = []
         for frame_index in range(self.frames_count):
-            f_name = self.get_frame_processed_name(NumberedFrame(frame_index, EmptyFrame))
-            if not path_exists(f_name):
+            if not self.storage.has(frame_index):
                 result.append(frame_index)
         return result
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import psutil
+
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.status.Mood import Mood
+from sinner.models.status.StatusMixin import StatusMixin
+
+
+class ThreadsTuner(StatusMixin):
+    """
+    Online tuning of the processing threads count. The processing speed is measured over sliding time windows, and
+    the threads count is changed by one after every window: in the same direction while the speed grows, and in the
+    opposite direction when it doesn't. The count stays within the CPU cores count, and isn't increased if the memory
+    budget is exhausted.
+    """
+    emoji: str = '🎛️'
+
+    window: float  # the measuring window length, seconds
+    tolerance: float = 0.03  # the relative speed change, which is considered as a noise
+    minimum: int
+    maximum: int
+
+    _threads: int
+    _direction: int = 1
+    _last_fps: float | None = None
+    _window_start: float
+    _window_frames: int = 0
+    _frame_size: int = 0
+    _governor: MemoryGovernor | None
+    _lock: threading.Lock
+
+    def __init__(self, threads: int, maximum: int | None = None, minimum: int = 1, window: float = 3.0, governor: MemoryGovernor | None = None):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum or psutil.cpu_count() or 1, self.minimum)
+        self.window = window
+        self._threads = min(max(threads, self.minimum), self.maximum)
+        self._governor = governor
+        self._lock = threading.Lock()
+        self._window_start = time.perf_counter()
+
+    @property
+    def threads(self) -> int:
+        return self._threads
+
+    @property
+    def fps(self) -> float | None:
+        """
+        The processing speed, measured in the last finished window
+        """
+        return self._last_fps
+
+    def frame_done(self, frame_size: int = 0) -> None:
+        """
+        Counts one processed frame
+        :param frame_size: the memory size of the frame in flight, it is used to check the memory budget
+        """
+        with self._lock:
+            self._window_frames += 1
+            self._frame_size = max(self._frame_size, frame_size)
+            elapsed = time.perf_counter() - self._window_start
+            if elapsed < self.window or self._window_frames < self._threads:  # every thread should finish a frame in the window
+                return
+            self.adjust(self._window_frames / elapsed)
+            self._window_frames = 0
+            self._window_start = time.perf_counter()
+
+    def adjust(self, fps: float) -> None:
+        if self._last_fps is not None and fps <= self._last_fps * (1 + self.tolerance):
+            self._direction = -self._direction  # no gain with the last step, try the other way
+        self._last_fps = fps
+        if self._direction > 0 and self._governor is not None and self._governor.budget(self._frame_size) < 1:
+            self._direction = -1  # no memory for more frames in flight
+        threads = min(max(self._threads + self._direction, self.minimum), self.maximum)
+        if threads == self._threads:
+            self._direction = -self._direction
+            return
+        self.update_status(f"Execution threads: {self._threads} -> {threads} ({round(fps, 2)} FPS with {self._threads})", mood=Mood.NEUTRAL)
+        self._threads = threads
@@ -0,0 +1,91 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import numpy
+from numpy.typing import NDArray
+
+from sinner.utilities import get_file_identity
+
+
+class VideoIndex:
+    """
+    The per-target index of a video stream: presentation timestamps of every frame and keyframes positions.
+    It is built once with ffprobe packets scanning (no decoding is required) and cached on disk, keyed by the target
+    path, size and modification time.
+    """
+    cache_subdir: str = 'index'
+
+    pts: NDArray[numpy.float64]  # presentation time of every frame (in seconds, relative to the first frame), in presentation order
+    keyframes: NDArray[numpy.int64]  # sorted zero-based positions of keyframes
+
+    def __init__(self, pts: NDArray[numpy.float64], keyframes: NDArray[numpy.int64]):
+        self.pts = pts
+        self.keyframes = keyframes
+
+    @property
+    def frames_count(self) -> int:
+        return len(self.pts)
+
+    def keyframe_before(self, position: int) -> int:
+        """
+        Returns the position of the nearest keyframe at or before the requested position
+        """
+        index = int(numpy.searchsorted(self.keyframes, position, side='right')) - 1
+        return int(self.keyframes[index]) if index >= 0 else 0
+
+    def pts_time(self, position: int) -> float:
+        return float(self.pts[min(max(position, 0), self.frames_count - 1)]) if self.frames_count > 0 else 0
+
+    def same_gop(self, position_a: int, position_b: int) -> bool:
+        """
+        Checks if both positions can be reached by decoding from the same keyframe
+        """
+        return self.keyframe_before(position_a) == self.keyframe_before(position_b)
+
+    @staticmethod
+    def cache_key(target_path: str) -> str:
+        return get_file_identity(target_path)
+
+    @staticmethod
+    def cache_path(target_path: str, temp_dir: str) -> str:
+        return os.path.join(temp_dir, VideoIndex.cache_subdir, f'{VideoIndex.cache_key(target_path)}.npz')
+
+    @staticmethod
+    def build(target_path: str) -> 'VideoIndex':
+        command = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', target_path]
+        output = subprocess.check_output(command, stderr=subprocess.DEVNULL).decode().split()
+        packets: list[tuple[float, bool]] = []
+        for line in output:
+            pts_time, _, flags = line.partition(',')
+            if pts_time == 'N/A':  # packets without timestamps are not presented
+                continue
+            packets.append((float(pts_time), 'K' in flags))
+        packets.sort(key=lambda packet: packet[0])  # decoding order -> presentation order
+        pts = numpy.array([packet[0] for packet in packets], dtype=numpy.float64)
+        if len(pts) > 0:
+            pts -= pts[0]
+        keyframes = numpy.array([position for position, packet in enumerate(packets) if packet[1]], dtype=numpy.int64)
+        return VideoIndex(pts, keyframes)
+
+    @staticmethod
+    def load(target_path: str, temp_dir: str) -> 'VideoIndex':
+        """
+        Returns the cached index of the target, building and caching it on the first request
+        """
+        cache_path = VideoIndex.cache_path(target_path, temp_dir)
+        if os.path.exists(cache_path):
+            with numpy.load(cache_path) as data:
+                return VideoIndex(data['pts'], data['keyframes'])
+        index = VideoIndex.build(target_path)
+        index.save(cache_path)
+        return index
+
+    def save(self, path: str) -> None:
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, Any] = {'pts': self.pts, 'keyframes': self.keyframes}
+        temp_path = f'{path}.{os.getpid()}'
+        with open(temp_path, 'wb') as file:  # a file object prevents numpy from adding the extension
+            numpy.savez(file, **arrays)
+        os.replace(temp_path, path)  # other processes never see a partially written index
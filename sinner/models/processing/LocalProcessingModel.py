@@ -17,16 +17,22 @@ from sinner.handlers.frame.NoneHandler import NoneHandler
 from sinner.helpers.FrameHelper import scale
 from sinner.models.Event import Event
 from sinner.models.MediaMetaData import MediaMetaData
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.MicroBatcher import MicroBatcher
+from sinner.models.ThreadsTuner import ThreadsTuner
 from sinner.models.MovingAverage import MovingAverage
 from sinner.models.PerfCounter import PerfCounter
 from sinner.models.State import State
 from sinner.models.audio.BaseAudioBackend import BaseAudioBackend
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
 from sinner.models.processing.ProcessingModelInterface import ProcessingModelInterface, PROCESSED, EXTRACTED, PROCESSING
 from sinner.models.status.StatusMixin import StatusMixin
 from sinner.models.status.Mood import Mood
 from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
 from sinner.processors.frame.FrameExtractor import FrameExtractor
-from sinner.utilities import list_class_descendants, resolve_relative_path, suggest_execution_threads, suggest_temp_dir, seconds_to_hmsms, normalize_path, get_mem_usage
+from sinner.typing import Frame
+from sinner.utilities import list_class_descendants, resolve_relative_path, suggest_execution_threads, suggest_max_memory, suggest_temp_dir, seconds_to_hmsms, normalize_path
 from sinner.validators.AttributeLoader import Rules, AttributeLoader
 
 
@@ -35,12 +41,19 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
 
     # configuration variables
     frame_processor: List[str]
+    max_memory: int
     execution_threads: int
+    auto_threads: bool
+    batch_size: int
+    batch_latency: float
     bootstrap_processors: bool  # bootstrap_processors processors on startup
     _prepare_frames: bool  # True: always extract and use, False: never extract nor use, Null: newer extract, use if exists. Note: attribute can't be typed as Optional[bool] due to AttributeLoader limitations
     _detailed_metrics: bool
+    _preview_codec: str
+    frame_storage: str
 
     _processors: dict[str, BaseFrameProcessor]  # cached processors for gui [processor_name, processor]
+    _batchers: dict[str, MicroBatcher]  # micro-batchers of processors [processor_name, batcher]
     _target_handler: Optional[BaseFrameHandler] = None  # the initial handler of the target file
 
     # player counters
@@ -68,11 +81,31 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
                 'choices': list_class_descendants(resolve_relative_path('../../processors/frame'), 'BaseFrameProcessor'),
                 'help': 'The set of frame processors to handle the target'
             },
+            {
+                'parameter': 'max-memory',  # key defined in Sin, but class can be called separately in tests
+                'default': suggest_max_memory(),
+            },
             {
                 'parameter': 'execution-threads',
                 'default': suggest_execution_threads(),
                 'help': 'The count of simultaneous processing threads'
             },
+            {
+                'parameter': 'auto-threads',
+                'default': False,
+                'help': 'Tune the count of processing threads while processing, starting from the execution-threads value'
+            },
+            {
+                'parameter': 'batch-size',
+                'type': int,
+                'default': 1,
+                'help': 'The maximum count of frames, passed to frame processors at once (not larger than the execution-threads value)'
+            },
+            {
+                'parameter': 'batch-latency',
+                'default': 0.02,
+                'help': 'Seconds to wait for a full batch of frames, keep it low for the smooth preview'
+            },
             {
                 'parameter': {'source', 'source-path'},
                 'attribute': '_source_path'
@@ -117,6 +150,18 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
                 'default': lambda: suggest_temp_dir(self.temp_dir),
                 'help': 'Select the directory for temporary files'
             },
+            {
+                'parameter': 'preview-codec',
+                'attribute': '_preview_codec',
+                'default': 'PNGFrameCodec',
+                'choices': BaseFrameCodec.list(),
+                'help': 'The format of processed preview frames, JPEGFrameCodec or NPYFrameCodec are faster than PNG'
+            },
+            {
+                'parameter': 'frame-storage',  # key defined in State, but class can be called separately in tests
+                'default': 'DirectoryFrameStorage',
+                'choices': BaseFrameStorage.list(),
+            },
             {
                 'parameter': 'detailed-metrics',
                 'attribute': '_detailed_metrics',
@@ -132,10 +177,11 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
         self.parameters = parameters
         super().__init__(parameters)
         self._processors = {}
+        self._batchers = {}
         if self.bootstrap_processors:
             self._processors = self.processors
 
-        self.TimeLine = FrameTimeLine(temp_dir=self.temp_dir).load(source_name=self._source_path, target_name=self._target_path, frame_time=self.metadata.frame_time, start_frame=1, end_frame=self.metadata.frames_count)
+        self.TimeLine = FrameTimeLine(temp_dir=self.temp_dir, codec=BaseFrameCodec.create(self._preview_codec, self.parameters), storage_name=self.frame_storage).load(source_name=self._source_path, target_name=self._target_path, frame_time=self.metadata.frame_time, start_frame=1, end_frame=self.metadata.frames_count)
         self.Player = PygameFramePlayer(width=self.metadata.resolution[0], height=self.metadata.resolution[1], caption='sinner player', on_close_event=on_close_event)
 
         if self._enable_sound:
@@ -156,6 +202,7 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
         self._target_handler = None
         self.MetaData = None
         super().__init__(self.parameters)
+        self._batchers = {}
         for _, processor in self.processors.items():
             processor.load(self.parameters)
         self.extract_frames()
@@ -258,6 +305,17 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
             pass
         return self._processors
 
+    def process_with(self, processor_name: str, processor: BaseFrameProcessor, frame: Frame) -> Frame:
+        """
+        Processes the frame with the processor, frames of concurrent threads are processed in batches, if enabled
+        """
+        batch_size = min(self.batch_size, self.execution_threads)
+        if batch_size < 2:
+            return processor.process_frame(frame)
+        if processor_name not in self._batchers:
+            self._batchers.setdefault(processor_name, MicroBatcher(processor.process_frames, batch_size, self.batch_latency))  # threads can create it simultaneously
+        return self._batchers[processor_name].process_frame(frame)
+
     @property
     def is_processors_loaded(self) -> bool:
         return self._processors != {}
@@ -388,7 +446,9 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
                 result = future_.result()
                 if result:
                     process_time, frame_index = result
-                    self._average_processing_time.update(process_time / self.execution_threads)
+                    self._average_processing_time.update(process_time / threads_count())
+                    if tuner is not None:
+                        tuner.frame_done(frame_size)
                     processing.remove(frame_index)
                     self.set_progress_index_value(frame_index, PROCESSED)
                     self._processing_fps = 1 / self._average_processing_time.get_average()
@@ -401,7 +461,14 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
         futures: list[Future[Optional[tuple[float, int]]]] = []
         processing_delta: int = 0  # additional lookahead to adjust frames synchronization
 
-        with ThreadPoolExecutor(max_workers=self.execution_threads) as executor:  # this adds processing operations into a queue
+        governor = MemoryGovernor.get(self.max_memory)
+        frame_size = self.metadata.resolution[0] * self.metadata.resolution[1] * 3 * 2  # the source and the processed frames
+        tuner = ThreadsTuner(int(self.execution_threads), governor=governor) if self.auto_threads else None
+
+        def threads_count() -> int:
+            return self.execution_threads if tuner is None else tuner.threads
+
+        with ThreadPoolExecutor(max_workers=self.execution_threads if tuner is None else tuner.maximum) as executor:  # this adds processing operations into a queue
             while next_frame <= end_frame:
                 if self._event_rewind.is_set():
                     next_frame = self._event_rewind.tag or 0
@@ -413,7 +480,10 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
                     future.add_done_callback(process_done)
                     futures.append(future)
                     self.set_progress_index_value(next_frame, PROCESSING)
-                    if len(futures) >= self.execution_threads:
+                    if len(futures) >= threads_count():
+                        futures[:1][0].result()
+                    elif len(futures) > 1 and governor.budget(frame_size) < 1:  # fewer frames in flight, if memory is short
+                        governor.throttle()
                         futures[:1][0].result()
 
                     self._status("Memory usage (resident/virtual)", self.get_mem_usage())
@@ -458,7 +528,7 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
                 # Для каждого процессора измеряем время отдельно
                 for processor_name, processor in self.processors.items():
                     processor_start = time.perf_counter() if not total_perf.ns_mode else time.perf_counter_ns()
-                    n_frame.frame = processor.process_frame(n_frame.frame)
+                    n_frame.frame = self.process_with(processor_name, processor, n_frame.frame)
                     processor_end = time.perf_counter() if not total_perf.ns_mode else time.perf_counter_ns()
                     processor_time = processor_end - processor_start
 
@@ -527,9 +597,8 @@ class LocalProcessingModel(AttributeLoader, StatusMixin, ProcessingModelInterfac
 
     @staticmethod
     def get_mem_usage() -> str:
-        mem_rss = get_mem_usage()
-        mem_vms = get_mem_usage('vms')
-        return '{:.2f}'.format(mem_rss).zfill(5) + '/' + '{:.2f}'.format(mem_vms).zfill(5) + ' MB'
+        governor = MemoryGovernor.get()
+        return '{:.2f}'.format(governor.rss / 1024 ** 2).zfill(5) + '/' + '{:.2f}'.format(governor.vms / 1024 ** 2).zfill(5) + ' MB'
 
     @property
     def frame_handler(self) -> BaseFrameHandler:
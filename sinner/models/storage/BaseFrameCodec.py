@@ -0,0 +1,68 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from argparse import Namespace
+from typing import Any, List, Dict
+
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.typing import Frame
+from sinner.utilities import load_class, list_class_descendants
+from sinner.validators.AttributeLoader import AttributeLoader, Rules
+
+FRAME_EXTENSIONS: List[str] = ['.png', '.npy', '.webp', '.jpg']  # all extensions of frames, stored by codecs
+
+
+class BaseFrameCodec(AttributeLoader, ABC):
+    """
+    The format of temporary frames files
+    """
+    extension: str
+
+    @staticmethod
+    def create(codec_name: str, parameters: Namespace) -> 'BaseFrameCodec':  # codecs factory
+        codec_class = load_class(os.path.dirname(__file__), codec_name)
+
+        if codec_class and issubclass(codec_class, BaseFrameCodec):
+            return codec_class(parameters=parameters)
+        else:
+            raise ValueError(f"Invalid codec name: {codec_name}")
+
+    @staticmethod
+    def list() -> List[str]:
+        return list_class_descendants(os.path.dirname(__file__), 'BaseFrameCodec')
+
+    @staticmethod
+    def is_frame_file(path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in FRAME_EXTENSIONS
+
+    def rules(self) -> Rules:
+        return []
+
+    def __init__(self, parameters: Namespace | None = None) -> None:
+        super().__init__(parameters or Namespace())
+
+    @abstractmethod
+    def write(self, frame: Frame, path: str) -> bool:
+        """
+        Saves the frame to the path (which should have the codec extension), returns the success of the operation
+        """
+        pass
+
+    def read(self, path: str) -> Frame:
+        return read_from_image(path)
+
+    def benchmark(self, frame: Frame, path: str, repeats: int = 10) -> Dict[str, Any]:
+        """
+        Measures the average encoding and decoding time (in seconds) and the size of the encoded frame
+        """
+        start = time.perf_counter()
+        for _ in range(repeats):
+            self.write(frame, path)
+        encode_time = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            self.read(path)
+        decode_time = (time.perf_counter() - start) / repeats
+        size = os.path.getsize(path)
+        os.remove(path)
+        return {'codec': self.__class__.__name__, 'encode': encode_time, 'decode': decode_time, 'size': size}
@@ -0,0 +1,94 @@
+import os
+from abc import ABC, abstractmethod
+from typing import List
+
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.typing import Frame
+from sinner.utilities import load_class, list_class_descendants
+
+
+class BaseFrameStorage(ABC):
+    """
+    The storage of processed frames of one processing stage, addressed by zero-based frame indices
+    """
+    path: str
+    frames_count: int
+    frames_files: bool = False  # True, if every frame is stored as a separate image file
+
+    @staticmethod
+    def create(storage_name: str, path: str, frames_count: int, codec: BaseFrameCodec | None = None) -> 'BaseFrameStorage':  # storages factory
+        storage_class = load_class(os.path.dirname(__file__), storage_name)
+
+        if storage_class and issubclass(storage_class, BaseFrameStorage):
+            return storage_class(path, frames_count, codec)
+        else:
+            raise ValueError(f"Invalid storage name: {storage_name}")
+
+    @staticmethod
+    def list() -> List[str]:
+        return list_class_descendants(os.path.dirname(__file__), 'BaseFrameStorage')
+
+    def __init__(self, path: str, frames_count: int, codec: BaseFrameCodec | None = None):
+        self.path = path
+        self.frames_count = frames_count
+
+    @abstractmethod
+    def write(self, frame: NumberedFrame) -> bool:
+        """
+        Stores the frame, returns the success of the operation
+        """
+        pass
+
+    @abstractmethod
+    def read(self, index: int) -> Frame | None:
+        """
+        Returns the stored frame, or None, if it isn't stored
+        """
+        pass
+
+    @abstractmethod
+    def has(self, index: int) -> bool:
+        pass
+
+    @abstractmethod
+    def indices(self) -> List[int]:
+        """
+        Returns indices of all stored frames
+        """
+        pass
+
+    def files(self) -> List[str]:
+        """
+        Returns paths of stored frames files, if frames are stored as separate files
+        """
+        return []
+
+    @property
+    def count(self) -> int:
+        return len(self.indices())
+
+    def reconcile(self) -> None:
+        """
+        Brings the storage progress data in line with the stored frames, e.g. after frames were written outside it
+        """
+        pass
+
+    def merge(self, storage: 'BaseFrameStorage') -> None:
+        """
+        Moves all frames from another storage of the same frames sequence (e.g. a shard) to this storage
+        """
+        for index in storage.indices():
+            frame = storage.read(index)
+            if frame is not None:
+                self.write(NumberedFrame(index, frame))
+        storage.release()
+
+    def empty_count(self) -> int:
+        """
+        Returns the count of stored, but empty (e.g. not flushed to the disk) frames
+        """
+        return 0
+
+    def release(self) -> None:
+        pass
@@ -0,0 +1,164 @@
+import os
+import threading
+from typing import List, Dict
+
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+from sinner.models.storage.PNGFrameCodec import PNGFrameCodec
+from sinner.models.storage.ProgressJournal import ProgressJournal
+from sinner.typing import Frame
+from sinner.utilities import get_file_name, path_exists, is_file
+
+
+class DirectoryFrameStorage(BaseFrameStorage):
+    """
+    Stores every frame as a separate file, encoded with the codec. Stored frames are marked in the progress journal,
+    which is built from the directory content on the first written frame, so the progress is read without scanning
+    the directory. Directories without the journal are scanned as before. Frames with own names (e.g. images of
+    a directory target) are stored under these names, and their indices are kept in the names list.
+    """
+    journal_name: str = 'frames.journal'
+    names_name: str = 'frames.names'
+
+    codec: BaseFrameCodec
+    frames_files: bool = True
+    journal: ProgressJournal
+
+    _journaled: bool = False
+    _names: Dict[int, str] | None = None
+    _lock: threading.Lock
+
+    def __init__(self, path: str, frames_count: int, codec: BaseFrameCodec | None = None):
+        super().__init__(path, frames_count, codec)
+        self.codec = PNGFrameCodec() if codec is None else codec
+        self.journal = ProgressJournal(os.path.join(path, self.journal_name), frames_count)
+        self._lock = threading.Lock()
+
+    @property
+    def journaled(self) -> bool:
+        if not self._journaled:
+            self._journaled = self.journal.is_valid
+        return self._journaled
+
+    @property
+    def names_path(self) -> str:
+        return os.path.join(self.path, self.names_name)
+
+    @property
+    def names(self) -> Dict[int, str]:
+        """
+        Names of frames, stored under their own names, by frames indices
+        """
+        if self._names is None:
+            self._names = {}
+            if is_file(self.names_path):
+                with open(self.names_path, encoding='utf-8') as names_file:
+                    for line in names_file:
+                        index, _, name = line.rstrip('\n').partition(' ')
+                        self._names[int(index)] = name
+        return self._names
+
+    def name_frame(self, index: int, name: str) -> None:
+        """
+        Appends the frame name to the names list, if it is not there yet
+        """
+        with self._lock:
+            if self.names.get(index) != name:
+                self.names[index] = name
+                with open(self.names_path, 'a', encoding='utf-8') as names_file:
+                    names_file.write(f'{index} {name}\n')
+
+    def reconcile(self) -> None:
+        """
+        Rebuilds the journal from frames files in the directory
+        """
+        with self._lock:
+            self.journal.assign(self.scan_indices())
+            self._journaled = True
+
+    def merge(self, storage: BaseFrameStorage) -> None:
+        """
+        Frames files are moved without decoding, when both storages keep them in the same format
+        """
+        codec: BaseFrameCodec | None = getattr(storage, 'codec', None)
+        if not storage.frames_files or codec is None or codec.extension != self.codec.extension:
+            super().merge(storage)
+            return
+        for file_path in storage.files():
+            os.replace(file_path, os.path.join(self.path, os.path.basename(file_path)))
+        if isinstance(storage, DirectoryFrameStorage):
+            for index, name in storage.names.items():
+                self.name_frame(index, name)
+        storage.release()
+        self.reconcile()
+
+    @property
+    def zfill_length(self) -> int:
+        return len(str(self.frames_count))
+
+    def frame_path(self, frame: NumberedFrame) -> str:
+        filename = frame.name if frame.name else str(frame.index).zfill(self.zfill_length)
+        return str(os.path.join(self.path, filename + self.codec.extension))
+
+    def index_path(self, index: int) -> str:
+        filename = self.names.get(index) or str(index).zfill(self.zfill_length)
+        return str(os.path.join(self.path, filename + self.codec.extension))
+
+    def write(self, frame: NumberedFrame) -> bool:
+        if not self.codec.write(frame.frame, self.frame_path(frame)):
+            return False
+        if frame.name:
+            self.name_frame(frame.index, frame.name)
+        if not self.journaled:
+            self.reconcile()
+        self.journal.mark(frame.index)
+        return True
+
+    def read(self, index: int) -> Frame | None:
+        path = self.index_path(index)
+        return self.codec.read(path) if path_exists(path) else None
+
+    def has(self, index: int) -> bool:
+        if self.journaled and self.journal.has(index):
+            return True
+        if not path_exists(self.index_path(index)):
+            return False
+        if self.journaled:  # the frame was written outside the storage
+            self.journal.mark(index)
+        return True
+
+    def files(self) -> List[str]:
+        frames_files = []
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(self.codec.extension):
+                    frames_files.append(entry.path)
+        return frames_files
+
+    def scan_indices(self) -> List[int]:
+        """
+        Returns indices of frames files, files with unknown names are skipped
+        """
+        names_indices = {name: index for index, name in self.names.items()}
+        indices = []
+        for file_path in self.files():
+            name = get_file_name(file_path)
+            if name in names_indices:
+                indices.append(names_indices[name])
+            elif name.isdigit():
+                indices.append(int(name))
+        return indices
+
+    def indices(self) -> List[int]:
+        return self.journal.indices() if self.journaled else self.scan_indices()
+
+    @property
+    def count(self) -> int:
+        return self.journal.count if self.journaled else len(self.files())
+
+    def empty_count(self) -> int:
+        return sum(1 for file_path in self.files() if is_file(file_path) and os.path.getsize(file_path) == 0)
+
+    def release(self) -> None:
+        self.journal.release()
@@ -0,0 +1,29 @@
+import cv2
+
+from sinner.helpers.FrameHelper import write_to_image
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.typing import Frame
+from sinner.validators.AttributeLoader import Rules
+
+
+class JPEGFrameCodec(BaseFrameCodec):
+    extension: str = '.jpg'
+
+    jpeg_quality: int
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'parameter': 'jpeg-quality',
+                'type': int,
+                'default': 95,
+                'valid': lambda: 0 <= self.jpeg_quality <= 100,
+                'help': 'JPEG quality of temporary frames (0-100)'
+            },
+            {
+                'module_help': 'Lossy JPEG frames, suitable for previews'
+            }
+        ]
+
+    def write(self, frame: Frame, path: str) -> bool:
+        return write_to_image(frame, path, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
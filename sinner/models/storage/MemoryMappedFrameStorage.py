@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Any, Iterator
+
+import numpy
+
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+from sinner.models.storage.ProgressJournal import ProgressJournal
+from sinner.typing import Frame
+
+
+class MemoryMappedFrameStorage(BaseFrameStorage):
+    """
+    Stores raw frames in one fixed-stride memory-mapped file, with the progress journal in a separate file. Frames are
+    read as numpy views without copying, and any frame is addressed in O(1). The container is created on the first
+    written frame, so all frames should have the same shape.
+    """
+    header_name: str = 'frames.json'
+    data_name: str = 'frames.raw'
+    bitmap_name: str = 'frames.bitmap'
+
+    _shape: tuple[int, int, int] | None = None
+    _data: numpy.memmap[Any, numpy.dtype[numpy.uint8]] | None = None
+    _journal: ProgressJournal | None = None
+    _lock: threading.Lock
+    _read_only: bool
+
+    def __init__(self, path: str, frames_count: int, codec: BaseFrameCodec | None = None, read_only: bool = False):
+        super().__init__(path, frames_count, codec)
+        self._lock = threading.Lock()
+        self._read_only = read_only
+        self.load()
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.isfile(os.path.join(path, MemoryMappedFrameStorage.header_name))
+
+    @property
+    def shape(self) -> tuple[int, int, int] | None:
+        """
+        The shape of stored frames (height, width, channels), None if nothing is stored yet
+        """
+        return self._shape
+
+    def load(self) -> None:
+        """
+        Opens the existing container, if it isn't opened yet
+        """
+        if self._data is None and self.exists(self.path):
+            self.open()
+
+    def open(self) -> None:
+        with open(os.path.join(self.path, self.header_name)) as file:
+            header = json.load(file)
+        self.frames_count = int(header['frames_count'])
+        self._shape = (int(header['height']), int(header['width']), int(header['channels']))
+        # copy-on-write for readers: they may change frames without touching the storage
+        self._data = numpy.memmap(os.path.join(self.path, self.data_name), dtype=numpy.uint8, mode='c' if self._read_only else 'r+', shape=(self.frames_count, *self._shape))
+        self._journal = ProgressJournal(os.path.join(self.path, self.bitmap_name), self.frames_count, self._read_only)
+
+    def create_container(self, shape: tuple[int, int, int]) -> None:
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        self._shape = shape
+        # the data file is sparse, so it doesn't take the disk space for not stored frames
+        self._data = numpy.memmap(os.path.join(self.path, self.data_name), dtype=numpy.uint8, mode='w+', shape=(self.frames_count, *shape))
+        self._journal = ProgressJournal(os.path.join(self.path, self.bitmap_name), self.frames_count)
+        self._journal.create()
+        with open(os.path.join(self.path, self.header_name), 'w') as file:  # the header is written last, it marks the container as ready
+            json.dump({'frames_count': self.frames_count, 'height': shape[0], 'width': shape[1], 'channels': shape[2]}, file)
+
+    def write(self, frame: NumberedFrame) -> bool:
+        if self._read_only:
+            raise Exception(f"The storage in {self.path} is opened for reading")
+        if not 0 <= frame.index < self.frames_count:
+            raise Exception(f"Frame index {frame.index} is out of the storage range 0..{self.frames_count - 1}")
+        with self._lock:
+            self.load()
+            if self._data is None:
+                self.create_container(frame.frame.shape)
+        if frame.frame.shape != self._shape:
+            raise Exception(f"Frame shape {frame.frame.shape} differs from the storage frames shape {self._shape}")
+        self._data[frame.index] = frame.frame  # type: ignore[index]
+        self._journal.mark(frame.index)  # type: ignore[union-attr]  # the frame is marked after its data is written
+        return True
+
+    def read(self, index: int) -> Frame | None:
+        if not self.has(index):
+            return None
+        return self._data[index]  # type: ignore[index]
+
+    def frames(self) -> Iterator[Frame]:
+        """
+        Yields all stored frames in the order of their indices
+        """
+        for index in self.indices():
+            yield self._data[index]  # type: ignore[index]
+
+    def has(self, index: int) -> bool:
+        self.load()
+        return self._journal is not None and self._journal.has(index)
+
+    def indices(self) -> List[int]:
+        self.load()
+        return self._journal.indices() if self._journal is not None else []
+
+    @property
+    def count(self) -> int:
+        self.load()
+        return self._journal.count if self._journal is not None else 0
+
+    def release(self) -> None:
+        with self._lock:
+            if self._data is not None and not self._read_only:
+                self._data.flush()
+            if self._journal is not None:
+                self._journal.release()
+            self._data = None
+            self._journal = None
@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+import numpy
+
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.typing import Frame
+from sinner.validators.AttributeLoader import Rules
+
+
+class NPYFrameCodec(BaseFrameCodec):
+    extension: str = '.npy'
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'module_help': 'Raw numpy frames: no encoding cost, but the largest files'
+            }
+        ]
+
+    def write(self, frame: Frame, path: str) -> bool:
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as file:  # a file object prevents numpy from adding the extension
+            numpy.save(file, frame)
+        return True
+
+    def read(self, path: str) -> Frame:
+        return numpy.load(path)
@@ -0,0 +1,29 @@
+import cv2
+
+from sinner.helpers.FrameHelper import write_to_image
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.typing import Frame
+from sinner.validators.AttributeLoader import Rules
+
+
+class PNGFrameCodec(BaseFrameCodec):
+    extension: str = '.png'
+
+    png_compression: int
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'parameter': 'png-compression',
+                'type': int,
+                'default': 3,
+                'valid': lambda: 0 <= self.png_compression <= 9,
+                'help': 'PNG compression level of temporary frames (0-9), lower levels are faster, but produce larger files'
+            },
+            {
+                'module_help': 'Lossless PNG frames'
+            }
+        ]
+
+    def write(self, frame: Frame, path: str) -> bool:
+        return write_to_image(frame, path, [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression])
@@ -0,0 +1,116 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Any
+
+import numpy
+
+
+class ProgressJournal:
+    """
+    The persistent bitmap of stored frames: one bit per frame index, kept in a memory-mapped file. Marking a frame
+    costs one memory write, and the progress of any state is read as frames_count/8 bytes, without scanning the
+    frames storage. The bit is set after the frame is stored, so a marked frame is always complete.
+    """
+    _filename: str
+    _frames_count: int
+    _read_only: bool
+    _bitmap: numpy.memmap[Any, numpy.dtype[numpy.uint8]] | None = None
+    _lock: threading.Lock
+
+    def __init__(self, filename: str, frames_count: int, read_only: bool = False):
+        self._filename = filename
+        self._frames_count = frames_count
+        self._read_only = read_only
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(filename: str) -> bool:
+        return os.path.isfile(filename)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def size(self) -> int:
+        """
+        The bitmap size in bytes
+        """
+        return (self._frames_count + 7) // 8
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        Checks if the journal file exists and fits the frames count
+        """
+        return self.exists(self._filename) and os.path.getsize(self._filename) == self.size
+
+    @property
+    def bitmap(self) -> numpy.memmap[Any, numpy.dtype[numpy.uint8]] | None:
+        """
+        The opened bitmap, None if the journal file doesn't exist
+        """
+        if self._bitmap is None and self.size > 0 and self.exists(self._filename):
+            self._bitmap = numpy.memmap(self._filename, dtype=numpy.uint8, mode='r' if self._read_only else 'r+', shape=(self.size,))
+        return self._bitmap
+
+    def create(self) -> None:
+        """
+        Creates the empty journal, replacing the existing one
+        """
+        if self.size == 0:
+            return
+        Path(os.path.dirname(self._filename)).mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._bitmap = numpy.memmap(self._filename, dtype=numpy.uint8, mode='w+', shape=(self.size,))
+
+    def assign(self, indices: List[int]) -> None:
+        """
+        Replaces the journal content with the given frames indices, creating the journal if it is not valid
+        """
+        if self.size == 0:
+            return
+        presence = numpy.zeros(self.size * 8, dtype=numpy.uint8)
+        presence[[index for index in indices if 0 <= index < self._frames_count]] = 1
+        if not self.is_valid:
+            self.release()
+            self.create()
+        with self._lock:
+            self.bitmap[:] = numpy.packbits(presence, bitorder='little')  # type: ignore[index]  # in place, the file may be mapped by other processes
+
+    def mark(self, index: int) -> None:
+        if self._read_only:
+            raise Exception(f"The journal {self._filename} is opened for reading")
+        with self._lock:
+            if self.bitmap is None:
+                raise Exception(f"The journal {self._filename} is not created")
+            self.bitmap[index >> 3] |= 1 << (index & 7)
+
+    def has(self, index: int) -> bool:
+        bitmap = self.bitmap
+        if bitmap is None or not 0 <= index < self._frames_count:
+            return False
+        return bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+    def presence(self) -> numpy.ndarray[Any, numpy.dtype[numpy.uint8]]:
+        """
+        Returns the array of 0/1 values for all frames indices
+        """
+        bitmap = self.bitmap
+        if bitmap is None:
+            return numpy.zeros(self._frames_count, dtype=numpy.uint8)
+        return numpy.unpackbits(numpy.asarray(bitmap), bitorder='little')[:self._frames_count]
+
+    def indices(self) -> List[int]:
+        return numpy.flatnonzero(self.presence()).tolist()
+
+    @property
+    def count(self) -> int:
+        return int(self.presence().sum())
+
+    def release(self) -> None:
+        with self._lock:
+            if self._bitmap is not None and not self._read_only:
+                self._bitmap.flush()
+            self._bitmap = None
@@ -0,0 +1,20 @@
+import cv2
+
+from sinner.helpers.FrameHelper import write_to_image
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.typing import Frame
+from sinner.validators.AttributeLoader import Rules
+
+
+class WebPFrameCodec(BaseFrameCodec):
+    extension: str = '.webp'
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'module_help': 'Lossless WebP frames: smaller than PNG, but slower to encode'
+            }
+        ]
+
+    def write(self, frame: Frame, path: str) -> bool:
+        return write_to_image(frame, path, [cv2.IMWRITE_WEBP_QUALITY, 101])  # the quality above 100 means the lossless mode
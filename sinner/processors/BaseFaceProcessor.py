@@ -0,0 +1,101 @@
+import os
+from abc import ABC
+from argparse import Namespace
+from typing import List
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.FaceIndex import FaceIndex
+from sinner.FaceTracker import FaceTracker
+from sinner.handlers.frame.StreamHandler import StreamHandler
+from sinner.models.status.Mood import Mood
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.utilities import path_exists, suggest_temp_dir
+from sinner.validators.AttributeLoader import Rules
+
+
+class BaseFaceProcessor(BaseFrameProcessor, ABC):
+    """
+    The base of processors of target faces: it builds the source of target faces (the analyser, the tracker and the
+    faces index) from common parameters. Only the first processor of the chain keeps the faces index
+    """
+    less_output: bool = True
+    redetect_interval: int = 1
+    tracking_error: float = 1.0
+    face_index: bool = False
+    target_path: str | None = None
+    temp_dir: str
+    frame_processor: List[str]
+
+    _face_analyser: FaceAnalyser | None = None
+    _target_faces: FaceAnalyser | FaceTracker | FaceIndex | None = None
+
+    def rules(self) -> Rules:
+        return [
+            {
+                'parameter': 'redetect-interval',
+                'type': int,
+                'default': 1,
+                'help': 'Run the full face detection on every N-th frame, and track faces on frames between (1 to detect faces on every frame)'
+            },
+            {
+                'parameter': 'tracking-error',
+                'default': 1.0,
+                'help': 'The maximum tracking error of face keypoints in pixels, faces are detected again, if it is exceeded'
+            },
+            {
+                'parameter': 'face-index',
+                'default': False,
+                'help': 'Keep faces of analysed target frames in the index on the disk, and take them from the index on the next processing of the same target'
+            },
+            {
+                'parameter': {'target', 'target-path'},
+                'attribute': 'target_path'
+            },
+            {
+                'parameter': 'temp-dir',
+                'default': lambda: suggest_temp_dir(),
+                'help': 'Select the directory for temporary files'
+            },
+            {
+                'parameter': {'frame-processor', 'processor', 'processors'},  # key defined in BatchProcessingCore, but class can be called separately in tests
+                'attribute': 'frame_processor',
+                'default': [],
+            }
+        ]
+
+    @property
+    def face_analyser(self) -> FaceAnalyser:
+        if self._face_analyser is None:
+            self._face_analyser = FaceAnalyser(self.execution_providers, self.less_output)
+        return self._face_analyser
+
+    @property
+    def target_faces(self) -> FaceAnalyser | FaceTracker | FaceIndex:
+        """
+        The source of target faces: the analyser, or the tracker, if faces are detected not on every frame, optionally
+        behind the faces index of the target
+        """
+        if self._target_faces is None:
+            self._target_faces = self.face_analyser if self.redetect_interval < 2 else FaceTracker(self.face_analyser, self.redetect_interval, self.tracking_error)
+            if self.face_index:
+                if self.target_path is None or not path_exists(self.target_path) or StreamHandler.is_stream(self.target_path):
+                    self.update_status("The faces index is possible only for a target file or directory", mood=Mood.NEUTRAL)
+                elif self.frame_processor[:1] not in ([], [self.__class__.__name__]):  # frames of next processors depend on previous ones (e.g. on the source face), and can't be found again
+                    self.update_status("The faces index is used only by the first frame processor, which gets original target frames", mood=Mood.NEUTRAL)
+                else:
+                    self._target_faces = FaceIndex(os.path.join(self.temp_dir, 'faces', FaceIndex.target_hash(self.target_path)), self._target_faces)
+                    self.update_status(f"Using the faces index {self._target_faces.path} of {len(self._target_faces)} frames")
+        return self._target_faces
+
+    def save_index(self) -> None:
+        if isinstance(self._target_faces, FaceIndex):
+            self._target_faces.save()
+
+    def load(self, parameters: Namespace, validate: bool = True) -> bool:
+        self.save_index()
+        self._target_faces = None  # faces of another target are not tracked
+        return super().load(parameters, validate)
+
+    def release_resources(self) -> None:
+        self.save_index()
+        super().release_resources()
@@ -0,0 +1,46 @@
+from argparse import Namespace
+from typing import List, Callable
+
+from sinner.models.State import State
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.typing import Frame
+
+
+class ProcessorChain(BaseFrameProcessor):
+    """
+    Runs every frame through the whole processors set in memory, so frames are extracted and saved once for all
+    processors instead of once for each of them
+    """
+    emoji: str = '⛓️'
+
+    processors: List[BaseFrameProcessor]
+
+    def __init__(self, parameters: Namespace, processors: List[BaseFrameProcessor]) -> None:
+        self.processors = processors
+        super().__init__(parameters)
+
+    @property
+    def name(self) -> str:
+        return '+'.join(processor.__class__.__name__ for processor in self.processors)
+
+    def process_frame(self, frame: Frame) -> Frame:
+        for processor in self.processors:
+            frame = processor.process_frame(frame)
+        return frame
+
+    def process_frames(self, frames: List[Frame]) -> List[Frame]:
+        for processor in self.processors:
+            frames = processor.process_frames(frames)
+        return frames
+
+    def release_resources(self) -> None:
+        for processor in self.processors:
+            processor.release_resources()
+
+    def configure_state(self, state: State) -> None:
+        for processor in self.processors:
+            processor.configure_state(state)
+
+    def configure_output_filename(self, callback: Callable[[str], None]) -> None:
+        for processor in self.processors:
+            processor.configure_output_filename(callback)
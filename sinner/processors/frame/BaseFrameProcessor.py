@@ -47,6 +47,13 @@ class BaseFrameProcessor(ABC, AttributeLoader, StatusMixin):
     def process_frame(self, frame: Frame) -> Frame:
         pass
 
+    def process_frames(self, frames: List[Frame]) -> List[Frame]:
+        """
+        Processes the batch of frames, returns processed frames in the same order. Processors, which models can take
+        batches, should override this, the default implementation processes frames one by one
+        """
+        return [self.process_frame(frame) for frame in frames]
+
     def release_resources(self) -> None:
         pass
 
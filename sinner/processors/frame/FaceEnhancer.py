@@ -2,19 +2,19 @@ import contextlib
 import io
 import threading
 from argparse import Namespace
+from typing import List
 
 import gfpgan
 import torch
 from gfpgan import GFPGANer  # type: ignore[attr-defined]
 
-from sinner.FaceAnalyser import FaceAnalyser
 from sinner.validators.AttributeLoader import Rules
-from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.processors.BaseFaceProcessor import BaseFaceProcessor
 from sinner.typing import Frame
 from sinner.utilities import conditional_download, get_app_dir, is_float
 
 
-class FaceEnhancer(BaseFrameProcessor):
+class FaceEnhancer(BaseFaceProcessor):
     emoji: str = '👍'
 
     thread_semaphore = threading.Semaphore()
@@ -23,7 +23,6 @@ class FaceEnhancer(BaseFrameProcessor):
     upscale: float
     less_output: bool = True
 
-    _face_analyser: FaceAnalyser | None = None
     _face_enhancer: GFPGANer | None = None
 
     def rules(self) -> Rules:
@@ -45,12 +44,6 @@ class FaceEnhancer(BaseFrameProcessor):
             }
         ]
 
-    @property
-    def face_analyser(self) -> FaceAnalyser:
-        if self._face_analyser is None:
-            self._face_analyser = FaceAnalyser(self.execution_providers, self.less_output)
-        return self._face_analyser
-
     @property
     def face_enhancer(self) -> GFPGANer:
         if self._face_enhancer is None:
@@ -74,10 +67,14 @@ class FaceEnhancer(BaseFrameProcessor):
         return temp_frame
 
     def process_frame(self, frame: Frame) -> Frame:
-        if self.face_analyser.get_one_face(frame):
+        if self.target_faces.get_one_face(frame):
             frame = self.enhance_face(frame)
         return frame
 
+    def process_frames(self, frames: List[Frame]) -> List[Frame]:
+        return [self.enhance_face(frame) if face else frame for frame, face in zip(frames, self.target_faces.get_one_face_batch(frames))]
+
     def release_resources(self) -> None:
+        super().release_resources()
         if 'CUDAExecutionProvider' in self.execution_providers:
             torch.cuda.empty_cache()
@@ -6,29 +6,31 @@ from argparse import Namespace
 from typing import List, Dict, Any, Callable, Literal
 
 import insightface
+import numpy
 import torch
 from insightface.app.common import Face
 
-from sinner.FaceAnalyser import FaceAnalyser
 from sinner.models.status.Mood import Mood
 from sinner.helpers.FrameHelper import read_from_image
 from sinner.validators.AttributeLoader import Rules
-from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.processors.BaseFaceProcessor import BaseFaceProcessor
 from sinner.typing import Frame, FaceSwapperType
 from sinner.utilities import conditional_download, get_app_dir, is_image, normalize_path
 
 
-class FaceSwapper(BaseFrameProcessor):
+class FaceSwapper(BaseFaceProcessor):
     emoji: str = '🔁'
 
     source_path: str
     many_faces: bool = False
     less_output: bool = True
     target_gender: Literal['M', 'F', 'B', 'I'] = 'B'
+    reference_faces: List[str]
+    reference_threshold: float = 0.4
 
     _source_face: Face | None = None
-    _face_analyser: FaceAnalyser | None = None
     _face_swapper: FaceSwapperType | None = None
+    _reference_embeddings: numpy.ndarray[Any, Any] | None = None  # normed embeddings of reference faces, one per row
 
     def rules(self) -> Rules:
         return [
@@ -58,14 +60,32 @@ class FaceSwapper(BaseFrameProcessor):
                 'choices': ['M', 'F', 'B', 'I'],
                 'help': 'Select the gender of faces to swap: [M]ale, [F]emale, [B]oth, or as_[I]nput (based on source face)'
             },
+            {
+                'parameter': {'reference-faces', 'reference'},
+                'attribute': 'reference_faces',
+                'default': [],
+                'valid': lambda: all(is_image(path) for path in self.reference_faces),
+                'help': 'Images of people to swap, only faces of these identities are swapped (the largest face of every image is used)'
+            },
+            {
+                'parameter': 'reference-threshold',
+                'default': 0.4,
+                'help': 'The minimal cosine similarity of a target face to a reference face to swap it'
+            },
             {
                 'module_help': 'This module swaps faces on images'
             }
         ]
 
     def load(self, parameters: Namespace, validate: bool = True) -> bool:
-        self._source_face = None
-        return super().load(parameters, validate)
+        source_path = getattr(self, 'source_path', None)  # is not set before the first loading
+        reference_faces = getattr(self, 'reference_faces', None)
+        result = super().load(parameters, validate)
+        if self.source_path != source_path:  # the recognized face is kept while the source is the same
+            self._source_face = None
+        if self.reference_faces != reference_faces:
+            self._reference_embeddings = None
+        return result
 
     @property
     def source_face(self) -> Face | None:
@@ -87,10 +107,18 @@ class FaceSwapper(BaseFrameProcessor):
         return self._source_face
 
     @property
-    def face_analyser(self) -> FaceAnalyser:
-        if self._face_analyser is None:
-            self._face_analyser = FaceAnalyser(self.execution_providers, self.less_output)
-        return self._face_analyser
+    def reference_embeddings(self) -> numpy.ndarray[Any, Any]:
+        if self._reference_embeddings is None:
+            embeddings = []
+            for reference_path in self.reference_faces:
+                faces = self.face_analyser.get_many_faces(read_from_image(reference_path))
+                if faces:
+                    embeddings.append(max(faces, key=lambda x: (x.bbox[2] - x.bbox[0]) * (x.bbox[3] - x.bbox[1])).normed_embedding)
+                else:
+                    self.update_status(f"There is no face found on {reference_path}", mood=Mood.BAD)
+            self._reference_embeddings = numpy.array(embeddings, dtype=numpy.float32).reshape((-1, 512))
+            self.update_status(f'Recognized {len(embeddings)} reference faces')
+        return self._reference_embeddings
 
     @property
     def face_swapper(self) -> FaceSwapperType:
@@ -114,17 +142,49 @@ class FaceSwapper(BaseFrameProcessor):
 
     def process_frame(self, frame: Frame) -> Frame:
         if self.source_face is not None:
-            target_gender = self._get_target_gender()
+            if self.reference_faces:
+                frame = self.swap_faces(frame, self.match_faces([self.target_faces.get_many_faces(frame) or []])[0])
+            else:
+                frame = self.swap_faces(frame, self.target_faces.get_many_faces(frame) if self.many_faces else [self.target_faces.get_one_face(frame)])
+        return frame
+
+    def process_frames(self, frames: List[Frame]) -> List[Frame]:
+        if self.source_face is None:
+            return frames
+        if self.reference_faces:
+            faces: List[List[Face]] | List[List[Face | None]] = self.match_faces(self.target_faces.get_many_faces_batch(frames))
+        elif self.many_faces:
+            faces = self.target_faces.get_many_faces_batch(frames)
+        else:
+            faces = [[face] for face in self.target_faces.get_one_face_batch(frames)]
+        return [self.swap_faces(frame, frame_faces) for frame, frame_faces in zip(frames, faces)]
+
+    def match_faces(self, frames_faces: List[List[Face]]) -> List[List[Face]]:
+        """
+        Selects faces of reference identities on every frame: similarities of all faces to all references are computed
+        with one matrix product. Every matching face is selected with many-faces, otherwise only the best matching one
+        """
+        faces = [face for frame_faces in frames_faces for face in frame_faces]
+        if not faces or self.reference_embeddings.shape[0] == 0:
+            return [[] for _ in frames_faces]
+        embeddings = numpy.array([face.normed_embedding if face.embedding is not None else numpy.zeros(512) for face in faces], dtype=numpy.float32)
+        similarities = (embeddings @ self.reference_embeddings.T).max(axis=1)
+        matched: List[List[Face]] = []
+        start = 0
+        for frame_faces in frames_faces:
+            scores = similarities[start:start + len(frame_faces)]
+            start += len(frame_faces)
             if self.many_faces:
-                many_faces = self.face_analyser.get_many_faces(frame)
-                if many_faces:
-                    for target_face in many_faces:
-                        if self._should_swap_face(target_face, target_gender):
-                            frame = self.face_swapper.get(frame, target_face, self.source_face)
+                matched.append([face for face, score in zip(frame_faces, scores) if score >= self.reference_threshold])
             else:
-                target_face = self.face_analyser.get_one_face(frame)
-                if target_face and self._should_swap_face(target_face, target_gender):
-                    frame = self.face_swapper.get(frame, target_face, self.source_face)
+                matched.append([frame_faces[int(numpy.argmax(scores))]] if len(scores) > 0 and scores.max() >= self.reference_threshold else [])
+        return matched
+
+    def swap_faces(self, frame: Frame, faces: List[Face] | List[Face | None] | None) -> Frame:
+        target_gender = self._get_target_gender()
+        for target_face in faces or []:
+            if target_face and self._should_swap_face(target_face, target_gender):
+                frame = self.face_swapper.get(frame, target_face, self.source_face)
         return frame
 
     def _get_target_gender(self) -> str:
@@ -142,6 +202,7 @@ class FaceSwapper(BaseFrameProcessor):
         return False
 
     def release_resources(self) -> None:
+        super().release_resources()
         if 'CUDAExecutionProvider' in self.execution_providers:
             torch.cuda.empty_cache()
 
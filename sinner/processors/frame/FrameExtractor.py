@@ -1,4 +1,8 @@
+import bisect
 import os
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
 
 from tqdm import tqdm
 
@@ -9,12 +13,36 @@ from sinner.validators.AttributeLoader import Rules
 from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
 
 
+def extract_segment(handler_name: str, target_path: str, parameters: Namespace, state_path: str, temp_dir: str, frames_count: int, frames: List[int]) -> int:
+    """
+    Decodes the segment frames sequentially in a separate process and saves them to the state path
+    """
+    handler = BaseFrameHandler.create(handler_name, target_path, parameters)
+    state = State(parameters=parameters, target_path=target_path, temp_dir=temp_dir, frames_count=frames_count, processor_name=FrameExtractor.__name__)
+    state.path = state_path
+    try:
+        for frame_index in frames:
+            state.save_temp_frame(handler.extract_frame(frame_index))
+    finally:
+        handler.release_resources()
+        state.storage.release()
+    return len(frames)
+
+
 class FrameExtractor(BaseFrameProcessor):
     emoji: str = '🏃'
     self_processing: bool = True
 
+    extract_segments: int
+
     def rules(self) -> Rules:
         return [
+            {
+                'parameter': 'extract-segments',
+                'type': int,
+                'default': 1,
+                'help': 'Count of keyframe-aligned segments of the target, which are extracted in parallel processes'
+            },
             {
                 'module_help': 'This module extracts frames from video file as a set of png images'
             }
@@ -26,8 +54,49 @@ class FrameExtractor(BaseFrameProcessor):
     def process_frame(self, frame: Frame) -> Frame:
         return frame
 
+    @staticmethod
+    def split_segments(frames: List[int], count: int, keyframes: List[int] | None = None) -> List[List[int]]:
+        """
+        Splits sorted frames indices to up to count segments of equal size. If keyframes are known, segments borders
+        are moved to the nearest following keyframes, so every segment decoding starts from a keyframe
+        """
+        borders = {0, len(frames)}
+        for segment in range(1, count):
+            border_frame = frames[segment * len(frames) // count]
+            if keyframes and bisect.bisect_left(keyframes, border_frame) < len(keyframes):
+                border_frame = keyframes[bisect.bisect_left(keyframes, border_frame)]
+            borders.add(bisect.bisect_left(frames, border_frame))
+        sorted_borders = sorted(borders)
+        return [frames[start:stop] for start, stop in zip(sorted_borders, sorted_borders[1:]) if stop > start]
+
+    def process_segments(self, handler: BaseFrameHandler, state: State) -> None:
+        state.storage.reconcile()  # the progress data is prepared before workers share it
+        frames = state.check_integrity()
+        if not frames:
+            return
+        if not state.storage.frames_files:  # the container is created by the first written frame, before workers open it
+            state.save_temp_frame(handler.extract_frame(frames.pop(0)))
+            state.storage.release()
+        keyframes = handler.video_index.keyframes.tolist() if handler.video_index is not None else None
+        segments = self.split_segments(frames, self.extract_segments, keyframes)
+        self.update_status(f"Extracting {len(frames)} frames in {len(segments)} parallel segments")
+        with ProcessPoolExecutor(max_workers=len(segments)) as executor, tqdm(
+                total=len(frames),
+                desc="Extracting segments", unit='frame',
+                dynamic_ncols=True,
+                bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]',
+        ) as progress:
+            futures = [executor.submit(extract_segment, handler.__class__.__name__, str(state.target_path), self.parameters, state.path, state.temp_dir, state.frames_count, segment) for segment in segments]
+            for future in as_completed(futures):
+                progress.update(future.result())
+        # frames, which are lost here (e.g. bits of neighbour segments in the container bitmap), are re-extracted by the integrity check
+
     def process(self, handler: BaseFrameHandler, state: State) -> None:
-        handler.get_frames_paths(path=state.path, frames_range=(state.processed_frames_count, None))
+        if self.extract_segments > 1 and state.frames_count > 1:
+            self.process_segments(handler, state)
+        elif state.storage.frames_files:  # the handler extracts frames files directly, other storages are filled frame by frame
+            handler.get_frames_paths(path=state.path, frames_range=(state.processed_frames_count, None))
+            state.storage.reconcile()  # frames files are written by the handler
         _, lost_frames = state.final_check()
         if lost_frames:
             with tqdm(
@@ -1,9 +1,11 @@
 import glob
+import hashlib
 import importlib.util
 import inspect
 import mimetypes
 import os
 import platform
+import re
 import shutil
 import sys
 import urllib
@@ -194,6 +196,15 @@ def get_file_name(file_path: str) -> str:
     return os.path.splitext(os.path.basename(file_path))[0]
 
 
+def get_file_identity(file_path: str) -> str:
+    """
+    Returns a hash, which identifies the file content version by its path, size and modification time
+    """
+    stat = os.stat(file_path)
+    identity = f'{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}'
+    return hashlib.sha1(identity.encode()).hexdigest()
+
+
 # unused
 def delete_subdirectories(root_dir: str, subdirectories: List[str]) -> None:
     for subdirectory in list(set(subdirectories)):
@@ -290,5 +301,21 @@ def seconds_to_hmsms(seconds: float) -> str:
     return time_format[:-3]  # Remove the last three digits to get milliseconds
 
 
+def parse_position(position: str, fps: float) -> int:
+    """
+    Converts the media position to the frame index
+    :param position: a frame number, a time in seconds with the "s" suffix (e.g. 12.5s), or a time in the [HH:]MM:SS[.ms] form
+    :param fps: the media frame rate
+    """
+    if re.fullmatch(r'\d+', position):
+        return int(position)
+    if (match := re.fullmatch(r'(\d+(?:\.\d+)?)s', position)) is not None:
+        return round(float(match.group(1)) * fps)
+    if (match := re.fullmatch(r'(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)', position)) is not None:
+        hours, minutes, seconds = match.groups()
+        return round((int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds)) * fps)
+    raise ValueError(f"{position} is not a frame number or a time")
+
+
 def halt() -> None:
     os._exit(0)
@@ -4,10 +4,12 @@ from colorama import Style, Fore
 
 from sinner.Benchmark import Benchmark
 from sinner.BatchProcessingCore import BatchProcessingCore
+from sinner.BatchQueue import BatchQueue
 from sinner.Sinner import Sinner
 from sinner.gui.GUIForm import GUIForm
 from sinner.models.processing.LocalProcessingModel import LocalProcessingModel
 from sinner.webcam.WebCam import WebCam
+from sinner.handlers.frame.StreamHandler import StreamHandler
 from sinner.handlers.frame.VideoHandler import VideoHandler
 from sinner.processors.frame.FaceEnhancer import FaceEnhancer
 from sinner.processors.frame.FaceSwapper import FaceSwapper
@@ -19,6 +21,7 @@ from sinner.validators.ValueValidator import ValueValidator
 DocumentedClasses: List[Type[AttributeLoader]] = [
     Sinner,
     BatchProcessingCore,
+    BatchQueue,
     # State,
     GUIForm,
     LocalProcessingModel,
@@ -32,6 +35,7 @@ DocumentedClasses: List[Type[AttributeLoader]] = [
     # CV2VideoHandler,
     # FFmpegVideoHandler,
     VideoHandler,
+    StreamHandler,
     # DirectoryHandler,
     # ImageHandler
 ]
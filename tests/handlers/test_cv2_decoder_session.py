@@ -0,0 +1,40 @@
+from numpy import ndarray
+
+from sinner.handlers.frame.CV2DecoderSession import CV2DecoderSession
+from tests.constants import target_mp4, FRAME_SHAPE, TARGET_FC
+
+
+def get_test_object() -> CV2DecoderSession:
+    return CV2DecoderSession(target_mp4, max_skip=2)
+
+
+def test_sequential_read() -> None:
+    session = get_test_object()
+    for position in range(TARGET_FC):
+        frame = session.read(position)
+        assert isinstance(frame, ndarray)
+        assert frame.shape == FRAME_SHAPE
+    assert session.statistics == {'opens': 1, 'hits': TARGET_FC, 'skips': 0, 'seeks': 0}
+    session.release()
+
+
+def test_jumps() -> None:
+    session = get_test_object()
+    session.read(0)
+    session.read(2)  # short forward jump, grabbed
+    session.read(8)  # long forward jump, seek
+    session.read(1)  # backward jump, seek
+    assert session.statistics == {'opens': 1, 'hits': 1, 'skips': 1, 'seeks': 2}
+    assert session.read(TARGET_FC + 10) is None
+    session.release()
+
+
+def test_same_frames() -> None:
+    session = get_test_object()
+    skipped_frame = session.read(5)
+    session.read(0)
+    sequential_frame = None
+    for position in range(1, 6):
+        sequential_frame = session.read(position)
+    assert (skipped_frame == sequential_frame).all()
+    session.release()
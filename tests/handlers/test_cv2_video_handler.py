@@ -145,3 +145,13 @@ def tests_iterator() -> None:
         assert isinstance(frame_index, int)
         frame_counter += 1
     assert frame_counter == 2
+
+
+def test_extract_frames_sequentially() -> None:
+    test_object = get_test_object()
+    for frame_index in range(TARGET_FC):
+        assert test_object.extract_frame(frame_index).frame.shape == FRAME_SHAPE
+    statistics = test_object.decoder_statistics
+    assert statistics['opens'] == 1
+    assert statistics['seeks'] == 0  # every frame is decoded once, in order
+    test_object.release_resources()
@@ -3,11 +3,15 @@ import shutil
 from argparse import Namespace
 from typing import Iterator
 
+import pytest
 from numpy import ndarray
-from sympy.testing import pytest
 
 from sinner.Parameters import Parameters
 from sinner.handlers.frame.DirectoryHandler import DirectoryHandler
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from tests.constants import TARGET_FC, FRAME_SHAPE, tmp_dir, state_frames_dir, target_mp4, result_mp4, images_dir
 
 parameters: Namespace = Parameters().parameters
@@ -112,6 +116,34 @@ def test_result() -> None:
     assert get_test_object().result(from_dir=state_frames_dir, filename=result_mp4) is True
 
 
+@pytest.mark.parametrize('codec_name', ['JPEGFrameCodec', 'NPYFrameCodec', 'PNGFrameCodec', 'WebPFrameCodec'])
+def test_result_codec(codec_name: str) -> None:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    codec = BaseFrameCodec.create(codec_name, Namespace())
+    frames_dir = os.path.join(tmp_dir, 'frames')
+    frame = get_test_object().extract_frame(0).frame
+    assert codec.write(frame, os.path.join(frames_dir, f'juel{codec.extension}')) is True
+    result_dir = os.path.join(tmp_dir, 'result')
+    assert get_test_object().result(from_dir=frames_dir, filename=result_dir) is True
+    assert os.listdir(result_dir) == ['juel.png']  # frames are converted to images
+    with open(os.path.join(result_dir, 'juel.png'), 'rb') as file:
+        assert file.read(4) == b'\x89PNG'
+    assert read_from_image(os.path.join(result_dir, 'juel.png')).shape == FRAME_SHAPE
+
+
+def test_result_container() -> None:
+    container_dir = os.path.join(tmp_dir, 'container')
+    storage = MemoryMappedFrameStorage(container_dir, 3)
+    frame = get_test_object().extract_frame(0).frame
+    storage.write(NumberedFrame(0, frame))
+    storage.write(NumberedFrame(2, frame))
+    storage.release()
+    result_dir = os.path.join(tmp_dir, 'result')
+    assert get_test_object().result(from_dir=container_dir, filename=result_dir) is True
+    assert sorted(os.listdir(result_dir)) == ['0.png', '2.png']  # frames are decoded from the container
+    assert (read_from_image(os.path.join(result_dir, '2.png')) == frame).all()
+
+
 def tests_iterator() -> None:
     test_object = get_test_object()
     assert isinstance(test_object, Iterator)
@@ -133,3 +165,14 @@ def test_respect_filenames() -> None:
     test_object: DirectoryHandler = DirectoryHandler(parameters=parameters, target_path=images_dir)
     assert isinstance(test_object, Iterator)
     assert 3 == len(test_object.get_frames_paths(path=tmp_dir))
+
+
+def test_read_ahead() -> None:
+    test_object = DirectoryHandler(parameters=Parameters('--read-ahead=3').parameters, target_path=state_frames_dir)
+    assert test_object.read_ahead == 3
+    for frame_index in range(TARGET_FC):
+        numbered_frame = test_object.extract_frame(frame_index)
+        assert numbered_frame.index == frame_index
+        assert numbered_frame.name == str(frame_index).zfill(2)
+        assert (numbered_frame.frame == get_test_object().extract_frame(frame_index).frame).all()
+    test_object.release_resources()
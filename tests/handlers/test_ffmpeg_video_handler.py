@@ -1,5 +1,6 @@
 import os
 import shutil
+import subprocess
 from argparse import Namespace
 from typing import Iterator
 
@@ -7,6 +8,9 @@ import pytest
 from numpy import ndarray
 
 from sinner.handlers.frame.FFmpegVideoHandler import FFmpegVideoHandler
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
 from sinner.utilities import resolve_relative_path
 from tests.constants import TARGET_FPS, TARGET_FC, FRAME_SHAPE, tmp_dir, target_mp4, result_mp4, state_frames_dir, TARGET_RESOLUTION, broken_mp4, BROKEN_FC
 
@@ -118,6 +122,16 @@ def test_result() -> None:
     assert target.fps == TARGET_FPS
 
 
+def test_piped_result_audio() -> None:
+    storage = MemoryMappedFrameStorage(os.path.join(tmp_dir, 'frames'), TARGET_FC)
+    for index in range(TARGET_FC):
+        storage.write(NumberedFrame(index, read_from_image(os.path.join(state_frames_dir, f'{str(index).zfill(2)}.png'))))
+    storage.release()
+    assert get_test_object().result(from_dir=os.path.join(tmp_dir, 'frames'), filename=result_mp4, audio_target=target_mp4, audio_range=(0.0, 0.2)) is True
+    streams = subprocess.check_output(['ffprobe', '-v', 'error', '-show_entries', 'stream=codec_type', '-of', 'csv=p=0', result_mp4]).decode().split()
+    assert streams == ['video', 'audio']
+
+
 def tests_iterator() -> None:
     cv2 = get_test_object()
     assert isinstance(cv2, Iterator)
@@ -133,3 +147,15 @@ def tests_iterator() -> None:
         assert isinstance(frame_index, int)
         frame_counter += 1
     assert frame_counter == 2
+
+
+def test_extract_frame_streaming() -> None:
+    test_object = get_test_object()
+    streamed_frames = [test_object.extract_frame(frame_index).frame for frame_index in range(TARGET_FC)]
+    assert test_object.stream_reader.statistics == {'starts': 1, 'hits': TARGET_FC - 1, 'skips': 0}
+    assert (test_object.extract_frame(3).frame == streamed_frames[3]).all()  # backward seek
+    assert (test_object.extract_frame(7).frame == streamed_frames[7]).all()  # forward skip
+    assert test_object.stream_reader.statistics['starts'] == 2
+    test_object.ffmpeg_streaming = False
+    assert (test_object.extract_frame(5).frame == streamed_frames[5]).all()
+    test_object.release_resources()
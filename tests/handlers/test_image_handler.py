@@ -7,6 +7,8 @@ import pytest
 from numpy import ndarray
 
 from sinner.handlers.frame.ImageHandler import ImageHandler
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
 from sinner.utilities import is_image
 from tests.constants import IMAGE_SHAPE, tmp_dir, target_mp4, state_frames_dir, target_png, result_png
 
@@ -67,6 +69,19 @@ def test_result() -> None:
     assert is_image(result_png)
 
 
+@pytest.mark.parametrize('codec_name', ['JPEGFrameCodec', 'NPYFrameCodec', 'PNGFrameCodec', 'WebPFrameCodec'])
+def test_result_codec(codec_name: str) -> None:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    codec = BaseFrameCodec.create(codec_name, Namespace())
+    frames_dir = os.path.join(tmp_dir, 'frames')
+    assert codec.write(read_from_image(target_png), os.path.join(frames_dir, f'0{codec.extension}')) is True
+    result_file = os.path.join(tmp_dir, 'result.png')
+    assert get_test_object().result(from_dir=frames_dir, filename=result_file) is True
+    with open(result_file, 'rb') as file:
+        assert file.read(4) == b'\x89PNG'  # the frame is converted to the format of the result
+    assert read_from_image(result_file).shape == IMAGE_SHAPE
+
+
 def tests_iterator() -> None:
     test_object = get_test_object()
     assert isinstance(test_object, Iterator)
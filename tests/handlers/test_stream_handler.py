@@ -0,0 +1,72 @@
+import os
+import shutil
+import threading
+from argparse import Namespace
+
+import pytest
+
+from sinner.handlers.frame.EOutOfRange import EOutOfRange
+from sinner.handlers.frame.StreamHandler import StreamHandler
+from sinner.handlers.frame.VideoHandler import VideoHandler
+from tests.constants import tmp_dir, target_mp4, target_png, TARGET_FC
+
+fifo_path = os.path.join(tmp_dir, 'stream.fifo')
+
+
+def setup_function():
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    os.mkfifo(fifo_path)
+
+
+def feed(data: bytes) -> threading.Thread:
+    def write() -> None:
+        with open(fifo_path, 'wb') as fifo:
+            fifo.write(data)
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    return writer
+
+
+def test_is_stream() -> None:
+    assert StreamHandler.is_stream('-') is True
+    assert StreamHandler.is_stream(fifo_path) is True
+    assert StreamHandler.is_stream(target_png) is False
+    assert StreamHandler.is_stream('not_existed_file') is False
+    assert StreamHandler.is_stream(None) is False
+
+
+def test_raw_stream() -> None:
+    frames = VideoHandler(target_mp4, Namespace())
+    height, width = frames.extract_frame(0).frame.shape[:2]
+    data = b''.join(frames.extract_frame(index).frame.tobytes() for index in range(3))
+    handler = StreamHandler(fifo_path, Namespace(stream_format='rawvideo', stream_resolution=f'{width}x{height}'))
+    writer = feed(data)
+    assert handler.resolution == (width, height)
+    assert list(handler) == [0, 1, 2]
+    assert handler.fc == 3
+    writer.join()
+    handler.release_resources()
+
+
+def test_encoded_stream() -> None:
+    with open(target_mp4, 'rb') as target:
+        writer = feed(target.read())
+    handler = StreamHandler(fifo_path, Namespace())
+    frames = []
+    for index in handler:
+        frames.append(handler.extract_frame(index))
+    writer.join()
+    assert len(frames) == TARGET_FC
+    assert [frame.index for frame in frames] == list(range(TARGET_FC))
+    assert frames[0].frame.shape == (VideoHandler(target_mp4, Namespace()).resolution[1], VideoHandler(target_mp4, Namespace()).resolution[0], 3)
+    with pytest.raises(EOutOfRange):  # the stream can't be rewound
+        handler.extract_frame(0)
+    handler.release_resources()
+
+
+def test_raw_stream_without_resolution() -> None:
+    with pytest.raises(Exception):
+        StreamHandler(fifo_path, Namespace(stream_format='rawvideo'))
@@ -136,3 +136,10 @@ def test_resize_proportional_image() -> None:
     # new proportions bounds are not equal (width is bigger)
     resized_image = FrameHelper.resize_proportionally(test_image, (1, 1))
     assert resized_image.shape == (1, 1, 3)
+
+
+def test_contact_sheet() -> None:
+    frame = FrameHelper.read_from_image(target_png)
+    sheet = FrameHelper.contact_sheet([frame] * 5, tile_size=(100, 100))
+    assert sheet.shape == (200, 300, 3)
+    assert FrameHelper.contact_sheet([frame] * 5, tile_size=(100, 100), columns=5).shape == (100, 500, 3)
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import pytest
+from argparse import Namespace
+
+from sinner.Parameters import Parameters
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.State import State
+from sinner.models.storage.BaseFrameCodec import BaseFrameCodec
+from tests.constants import tmp_dir, target_png, target_mp4, source_jpg
+
+frame = read_from_image(target_png)
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_list() -> None:
+    assert sorted(BaseFrameCodec.list()) == ['JPEGFrameCodec', 'NPYFrameCodec', 'PNGFrameCodec', 'WebPFrameCodec']
+
+
+@pytest.mark.parametrize('codec_name', ['NPYFrameCodec', 'PNGFrameCodec', 'WebPFrameCodec'])
+def test_lossless(codec_name: str) -> None:
+    codec = BaseFrameCodec.create(codec_name, Namespace())
+    path = os.path.join(tmp_dir, f'frame{codec.extension}')
+    assert codec.write(frame, path) is True
+    assert (codec.read(path) == frame).all()
+    assert (read_from_image(path) == frame).all()
+    assert BaseFrameCodec.is_frame_file(path) is True
+
+
+def test_jpeg_quality() -> None:
+    low = BaseFrameCodec.create('JPEGFrameCodec', Parameters('--jpeg-quality=10').parameters).benchmark(frame, os.path.join(tmp_dir, 'low.jpg'), repeats=1)
+    high = BaseFrameCodec.create('JPEGFrameCodec', Parameters('--jpeg-quality=100').parameters).benchmark(frame, os.path.join(tmp_dir, 'high.jpg'), repeats=1)
+    assert low['size'] < high['size']
+
+
+def test_state_codec() -> None:
+    parameters = Parameters(f'--frame-processor=DummyProcessor --source-path="{source_jpg}" --target-path="{target_mp4}" --frame-codec=NPYFrameCodec').parameters
+    state = State(parameters=parameters, target_path=target_mp4, temp_dir=tmp_dir, frames_count=2, processor_name='DummyProcessor')
+    state.save_temp_frame(NumberedFrame(0, frame))
+    assert state.processed_frames_indices == [0]
+    assert state.get_frame_processed_name(NumberedFrame(0, frame)).endswith('0.npy')
@@ -0,0 +1,133 @@
+import os
+import shutil
+
+from sinner.Parameters import Parameters
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.State import State
+from sinner.models.storage.BaseFrameStorage import BaseFrameStorage
+from sinner.models.storage.DirectoryFrameStorage import DirectoryFrameStorage
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
+from sinner.models.storage.ProgressJournal import ProgressJournal
+from tests.constants import tmp_dir, target_png, target_mp4, source_jpg
+
+frame = read_from_image(target_png)
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_list() -> None:
+    assert sorted(BaseFrameStorage.list()) == ['DirectoryFrameStorage', 'MemoryMappedFrameStorage']
+
+
+def test_directory_storage() -> None:
+    storage = BaseFrameStorage.create('DirectoryFrameStorage', tmp_dir, 20)
+    assert storage.frames_files is True
+    os.makedirs(tmp_dir)
+    assert storage.write(NumberedFrame(3, frame)) is True
+    assert os.path.exists(os.path.join(tmp_dir, '03.png'))
+    assert storage.has(3) is True
+    assert storage.has(4) is False
+    assert storage.indices() == [3]
+    assert (storage.read(3) == frame).all()
+    assert storage.read(4) is None
+
+
+def test_memory_mapped_storage() -> None:
+    storage = MemoryMappedFrameStorage(tmp_dir, 20)
+    assert MemoryMappedFrameStorage.exists(tmp_dir) is False
+    assert storage.count == 0
+    assert storage.write(NumberedFrame(9, frame)) is True
+    assert storage.write(NumberedFrame(2, frame)) is True
+    assert MemoryMappedFrameStorage.exists(tmp_dir) is True
+    assert storage.indices() == [2, 9]
+    assert storage.count == 2
+    assert storage.has(3) is False
+    assert storage.read(3) is None
+    assert (storage.read(9) == frame).all()
+    storage.release()
+
+    reader = MemoryMappedFrameStorage(tmp_dir, 0, read_only=True)
+    assert reader.frames_count == 20
+    assert reader.shape == frame.shape
+    assert reader.indices() == [2, 9]
+    assert len(list(reader.frames())) == 2
+    reader.release()
+
+
+def test_state_storage() -> None:
+    parameters = Parameters(f'--frame-processor=DummyProcessor --source-path="{source_jpg}" --target-path="{target_mp4}" --frame-storage=MemoryMappedFrameStorage').parameters
+    state = State(parameters=parameters, target_path=target_mp4, temp_dir=tmp_dir, frames_count=3, processor_name='DummyProcessor')
+    assert state.storage.frames_files is False
+    state.save_temp_frame(NumberedFrame(0, frame))
+    state.save_temp_frame(NumberedFrame(2, frame))
+    assert state.processed_frames_count == 2
+    assert state.is_started is True
+    assert state.final_check() == (False, [1])
+    state.save_temp_frame(NumberedFrame(1, frame))
+    assert state.is_finished is True
+    assert state.final_check() == (True, [])
+
+
+def test_progress_journal() -> None:
+    journal = ProgressJournal(os.path.join(tmp_dir, 'frames.journal'), 20)
+    assert journal.is_valid is False
+    assert journal.count == 0
+    journal.create()
+    journal.mark(0)
+    journal.mark(19)
+    assert journal.indices() == [0, 19]
+    journal.assign([3, 4, 25])
+    assert journal.indices() == [3, 4]
+    journal.release()
+    assert ProgressJournal(os.path.join(tmp_dir, 'frames.journal'), 20, read_only=True).count == 2
+    assert ProgressJournal(os.path.join(tmp_dir, 'frames.journal'), 30).is_valid is False
+
+
+def test_directory_storage_journal() -> None:
+    storage = DirectoryFrameStorage(tmp_dir, 10)
+    os.makedirs(tmp_dir)
+    shutil.copy(target_png, os.path.join(tmp_dir, '05.png'))  # written before the journal
+    assert storage.journaled is False
+    assert storage.indices() == [5]
+    storage.write(NumberedFrame(1, frame))
+    assert storage.journaled is True
+    assert storage.indices() == [1, 5]
+    os.remove(os.path.join(tmp_dir, '05.png'))
+    assert storage.count == 2  # the journal is not reconciled yet
+    storage.reconcile()
+    assert storage.indices() == [1]
+    shutil.copy(target_png, os.path.join(tmp_dir, '07.png'))
+    assert storage.has(7) is True  # missing frames are checked in the directory
+    assert storage.indices() == [1, 7]
+
+
+def test_directory_storage_names() -> None:
+    storage = DirectoryFrameStorage(tmp_dir, 10)
+    os.makedirs(tmp_dir)
+    shutil.copy(target_png, os.path.join(tmp_dir, 'not_a_frame.png'))  # unknown names are skipped
+    assert storage.write(NumberedFrame(2, frame, 'juel')) is True
+    assert os.path.exists(os.path.join(tmp_dir, 'juel.png'))
+    assert storage.indices() == [2]
+    storage.reconcile()
+    assert storage.indices() == [2]
+    assert (storage.read(2) == frame).all()
+    assert DirectoryFrameStorage(tmp_dir, 10).scan_indices() == [2]
+
+
+def test_merge() -> None:
+    for storage_name in ['DirectoryFrameStorage', 'MemoryMappedFrameStorage']:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        storage = BaseFrameStorage.create(storage_name, os.path.join(tmp_dir, 'merged'), 10)
+        shard = BaseFrameStorage.create(storage_name, os.path.join(tmp_dir, 'shard'), 10)
+        os.makedirs(storage.path)
+        os.makedirs(shard.path)
+        storage.write(NumberedFrame(0, frame))
+        shard.write(NumberedFrame(4, frame))
+        shard.write(NumberedFrame(5, frame))
+        storage.merge(shard)
+        assert storage.indices() == [0, 4, 5]
+        assert (storage.read(5) == frame).all()
+        storage.release()
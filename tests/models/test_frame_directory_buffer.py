@@ -0,0 +1,40 @@
+import os
+import shutil
+
+from sinner.helpers.FrameHelper import read_from_image, scale
+from sinner.models.FrameDirectoryBuffer import FrameDirectoryBuffer
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
+from tests.constants import tmp_dir, target_png, source_jpg, target_mp4
+
+frame = read_from_image(target_png)
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_directory_buffer() -> None:
+    buffer = FrameDirectoryBuffer(tmp_dir).load(source_jpg, target_mp4, 10)
+    buffer.add_frame(NumberedFrame(10, frame))  # frames are numbered from 1
+    assert os.path.exists(os.path.join(buffer.path, '10.png'))
+    assert buffer.has_index(10) is True
+    assert (buffer.get_frame(10).frame == frame).all()  # type: ignore[union-attr]
+    assert buffer.get_frame(5) is None
+    assert FrameDirectoryBuffer(tmp_dir).load(source_jpg, target_mp4, 10).get_indices() == [10]
+
+
+def test_memory_mapped_buffer() -> None:
+    buffer = FrameDirectoryBuffer(tmp_dir, storage_name='MemoryMappedFrameStorage').load(source_jpg, target_mp4, 10)
+    buffer.add_frame(NumberedFrame(2, frame))
+    buffer.add_frame(NumberedFrame(10, frame))
+    assert MemoryMappedFrameStorage.exists(buffer.path)
+    assert (buffer.get_frame(10).frame == frame).all()  # type: ignore[union-attr]
+    previous = buffer.get_frame(5)
+    assert previous is not None and previous.index == 2 and buffer.miss == 3
+    scaled = scale(frame, 0.5)
+    buffer.add_frame(NumberedFrame(3, scaled))  # the preview quality is changed, previous frames are dropped
+    assert buffer.get_indices() == [3]
+    assert buffer.get_frame(10, False) is None
+    assert (buffer.get_frame(3).frame == scaled).all()  # type: ignore[union-attr]
+    buffer.flush()
@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from sinner.helpers.FrameHelper import EmptyFrame
+from sinner.models.FramePipeline import FramePipeline
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.typing import Frame
+
+
+def extract(index: int) -> NumberedFrame:
+    return NumberedFrame(index, EmptyFrame)
+
+
+def slow_process(frame: Frame) -> Frame:
+    time.sleep(0.01)
+    return frame
+
+
+def test_unordered() -> None:
+    saved: List[int] = []
+    lock = threading.Lock()
+
+    def save(frame: NumberedFrame) -> None:
+        with lock:
+            saved.append(frame.index)
+
+    FramePipeline(extract, slow_process, save, workers=4).run(range(50))
+    assert sorted(saved) == list(range(50))
+
+
+def test_ordered() -> None:
+    saved: List[int] = []
+    FramePipeline(extract, slow_process, lambda frame: saved.append(frame.index), workers=4, ordered=True).run([5, 3, 8, 1, 9, 0])
+    assert saved == [5, 3, 8, 1, 9, 0]
+
+
+def test_bounded_queues() -> None:
+    occupancy: List[int] = []
+    pipeline = FramePipeline(extract, slow_process, lambda frame: occupancy.append(sum(pipeline.occupancy.values())), workers=2, decode_depth=3, write_depth=2)
+    pipeline.run(range(30))
+    assert len(occupancy) == 30
+    assert max(occupancy) <= 5
+
+
+def test_error() -> None:
+    def failing_process(frame: Frame) -> Frame:
+        raise ValueError('Processing error')
+
+    with pytest.raises(ValueError):
+        FramePipeline(extract, failing_process, lambda frame: None, workers=2).run(range(100))
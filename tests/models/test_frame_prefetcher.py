@@ -0,0 +1,36 @@
+import threading
+from typing import List
+
+from sinner.helpers.FrameHelper import EmptyFrame
+from sinner.models.FramePrefetcher import FramePrefetcher
+from sinner.models.NumberedFrame import NumberedFrame
+
+requested: List[int] = []
+lock = threading.Lock()
+
+
+def extract(index: int) -> NumberedFrame:
+    with lock:
+        requested.append(index)
+    return NumberedFrame(index, EmptyFrame)
+
+
+def test_read_ahead() -> None:
+    requested.clear()
+    prefetcher = FramePrefetcher(extract, depth=3, frames_count=10)
+    assert prefetcher.get(0).index == 0
+    assert prefetcher.pending == 3
+    assert prefetcher.get(1).index == 1
+    prefetcher.close()
+    assert {0, 1} <= set(requested) <= {0, 1, 2, 3, 4}
+    assert requested.count(1) == 1  # the read ahead frame is not read again
+
+
+def test_frames_count_limit() -> None:
+    prefetcher = FramePrefetcher(extract, depth=3, frames_count=10)
+    assert prefetcher.get(8).index == 8
+    assert prefetcher.pending == 1
+    assert prefetcher.get(2).index == 2  # a seek drops frames read for the previous position
+    assert prefetcher.pending == 3
+    prefetcher.close()
+    assert prefetcher.pending == 0
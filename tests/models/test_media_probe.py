@@ -0,0 +1,45 @@
+import os
+import shutil
+import time
+
+from sinner.models.MediaProbe import MediaProbe
+from sinner.utilities import get_file_identity
+from tests.constants import target_mp4, broken_mp4, target_png, tmp_dir, TARGET_FC, TARGET_FPS, TARGET_RESOLUTION, BROKEN_FC
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    MediaProbe._cache.clear()
+
+
+def test_run() -> None:
+    metadata = MediaProbe.run(target_mp4)
+    assert metadata.fps == TARGET_FPS
+    assert metadata.resolution == TARGET_RESOLUTION
+    assert metadata.frames_count == TARGET_FC
+    assert metadata.exact_frames_count is True
+
+    estimated = MediaProbe.run(broken_mp4, count_frames=False)
+    assert estimated.exact_frames_count is False
+    assert estimated.frames_count > 0
+
+    assert MediaProbe.run(target_png).frames_count == 1
+
+
+def test_probe_cached() -> None:
+    metadata = MediaProbe.probe(target_mp4, tmp_dir)
+    assert os.path.exists(MediaProbe.cache_path(target_mp4, tmp_dir)) is True
+    assert MediaProbe.probe(target_mp4, tmp_dir) is metadata  # the memory cache
+    MediaProbe._cache.clear()
+    assert MediaProbe.probe(target_mp4, tmp_dir) == metadata  # the disk cache
+
+
+def test_probe_fast() -> None:
+    metadata = MediaProbe.probe(broken_mp4, tmp_dir, exact=False)
+    for _ in range(100):
+        if metadata.exact_frames_count:
+            break
+        time.sleep(0.05)
+    assert metadata.exact_frames_count is True
+    assert metadata.frames_count == BROKEN_FC
+    assert MediaProbe._cache[get_file_identity(broken_mp4)] is metadata
@@ -0,0 +1,50 @@
+import sys
+import time
+
+from sinner.helpers.FrameHelper import EmptyFrame
+from sinner.models.FramePipeline import FramePipeline
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.typing import Frame
+
+
+def test_shared() -> None:
+    governor = MemoryGovernor.get()
+    assert governor is MemoryGovernor.get()
+    assert governor.rss > 0
+    assert governor.rss_max >= governor.rss
+    assert 'MB' in governor.usage()
+
+
+def test_budget() -> None:
+    governor = MemoryGovernor(0)
+    assert governor.budget(1024) == sys.maxsize
+    governor.limit = governor.rss  # the limit is already exceeded
+    assert governor.budget(1024) == 0
+    governor.limit = governor.rss * 2
+    assert governor.budget(1024) > 0
+    governor.stop()
+    assert governor._thread.is_alive() is False
+
+
+def test_pipeline_throttling() -> None:
+    governor = MemoryGovernor(0)
+    governor.limit = 1  # no budget: frames are processed one by one
+    processing = []
+    concurrency = []
+    saved = []
+
+    def process(frame: Frame) -> Frame:
+        processing.append(frame)
+        concurrency.append(len(processing))
+        time.sleep(0.01)
+        processing.pop()
+        return frame
+
+    pipeline = FramePipeline(lambda index: NumberedFrame(index, EmptyFrame), process, lambda frame: saved.append(frame.index), workers=4, governor=governor)
+    pipeline.run(range(10))
+    assert sorted(saved) == list(range(10))
+    assert max(concurrency) == 1
+    assert governor.throttles > 0
+    assert FramePipeline.__name__ in governor.buffers
+    governor.stop()
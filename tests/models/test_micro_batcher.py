@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy
+import pytest
+
+from sinner.models.MicroBatcher import MicroBatcher
+from sinner.typing import Frame
+
+
+def frame(value: int) -> Frame:
+    return numpy.full((2, 2, 3), value, dtype=numpy.uint8)
+
+
+class BatchRecorder:
+    batches: List[int]
+
+    def __init__(self) -> None:
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def process_frames(self, frames: List[Frame]) -> List[Frame]:
+        with self.lock:
+            self.batches.append(len(frames))
+        time.sleep(0.01)
+        return [item + 1 for item in frames]
+
+
+def test_batches() -> None:
+    recorder = BatchRecorder()
+    batcher = MicroBatcher(recorder.process_frames, batch_size=4, latency=1)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(batcher.process_frame, [frame(value) for value in range(16)]))
+    assert [int(result[0, 0, 0]) for result in results] == list(range(1, 17))  # every thread gets its own frame
+    assert sum(recorder.batches) == 16
+    assert max(recorder.batches) == 4
+    assert len(recorder.batches) < 16
+
+
+def test_latency() -> None:
+    recorder = BatchRecorder()
+    batcher = MicroBatcher(recorder.process_frames, batch_size=8, latency=0.05)
+    start = time.monotonic()
+    assert int(batcher.process_frame(frame(1))[0, 0, 0]) == 2  # the lone frame is processed after the deadline
+    assert 0.05 <= time.monotonic() - start < 1
+    assert recorder.batches == [1]
+
+
+def test_single_frame_batches() -> None:
+    recorder = BatchRecorder()
+    batcher = MicroBatcher(recorder.process_frames, batch_size=1, latency=10)
+    batcher.process_frame(frame(1))
+    assert recorder.batches == [1]
+
+
+def test_error() -> None:
+    def broken(frames: List[Frame]) -> List[Frame]:
+        raise ValueError('broken')
+
+    batcher = MicroBatcher(broken, batch_size=2, latency=0.01)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(batcher.process_frame, frame(value)) for value in range(2)]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
@@ -0,0 +1,20 @@
+from typing import List
+
+from sinner.helpers.FrameHelper import EmptyFrame
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.ReorderBuffer import ReorderBuffer
+
+
+def test_reorder() -> None:
+    consumed: List[int] = []
+    buffer = ReorderBuffer(lambda frame: consumed.append(frame.index), start=3)
+    buffer.push(NumberedFrame(5, EmptyFrame))
+    buffer.push(NumberedFrame(4, EmptyFrame))
+    assert consumed == []
+    assert buffer.pending == 2
+    buffer.push(NumberedFrame(3, EmptyFrame))
+    assert consumed == [3, 4, 5]
+    assert buffer.pending == 0
+    assert buffer.next_index == 6
+    buffer.push(NumberedFrame(4, EmptyFrame))  # already consumed frames are ignored
+    assert consumed == [3, 4, 5]
@@ -0,0 +1,60 @@
+import os
+import shutil
+import time
+from argparse import Namespace
+
+import numpy
+
+from sinner.handlers.frame.FFmpegStreamWriter import FFmpegStreamWriter
+from sinner.handlers.frame.VideoHandler import VideoHandler
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.SegmentEncoder import SegmentEncoder
+from sinner.models.storage.MemoryMappedFrameStorage import MemoryMappedFrameStorage
+from tests.constants import tmp_dir
+
+frame = numpy.zeros((64, 64, 3), dtype=numpy.uint8)
+segments_dir = os.path.join(tmp_dir, 'segments')
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def writer(filename: str) -> FFmpegStreamWriter:
+    return FFmpegStreamWriter(filename, 10, '-c:v libx264 -pix_fmt yuv420p')
+
+
+def test_segment_encoder() -> None:
+    storage = MemoryMappedFrameStorage(os.path.join(tmp_dir, 'frames'), 7)
+    storage.write(NumberedFrame(0, frame))  # stored before the encoder is started
+    encoder = SegmentEncoder(storage, segments_dir, 3, writer)
+    assert encoder.segments_count == 3
+    assert encoder.segment_bounds(2) == (6, 7)
+    for index in [2, 1, 1]:
+        storage.write(NumberedFrame(index, frame))
+        encoder.frame_stored(index)
+    for _ in range(100):  # the first segment is encoded in the background
+        if encoder.encoded:
+            break
+        time.sleep(0.1)
+    assert encoder.encoded == [os.path.join(segments_dir, '0.mp4')]
+    for index in range(3, 7):
+        storage.write(NumberedFrame(index, frame))
+        encoder.frame_stored(index)
+    segments = encoder.finish()
+    assert segments == encoder.encoded
+    assert [VideoHandler(segment, Namespace()).fc for segment in segments] == [3, 3, 1]
+    storage.release()
+
+
+def test_incomplete_segment() -> None:
+    storage = MemoryMappedFrameStorage(os.path.join(tmp_dir, 'frames'), 4)
+    storage.write(NumberedFrame(0, frame))
+    encoder = SegmentEncoder(storage, segments_dir, 2, writer)
+    try:
+        encoder.finish()
+        assert False, 'The missing frame should fail the encoding'
+    except Exception as exception:
+        assert 'is not stored' in str(exception)
+    assert encoder.encoded == []
+    storage.release()
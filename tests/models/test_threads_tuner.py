@@ -0,0 +1,51 @@
+import time
+
+from sinner.helpers.FrameHelper import EmptyFrame
+from sinner.models.FramePipeline import FramePipeline
+from sinner.models.MemoryGovernor import MemoryGovernor
+from sinner.models.NumberedFrame import NumberedFrame
+from sinner.models.ThreadsTuner import ThreadsTuner
+from sinner.typing import Frame
+
+
+def test_hill_climbing() -> None:
+    def speed(threads: int) -> float:  # the best speed is reached with 4 threads
+        return 10 * threads if threads <= 4 else 40 - 5 * (threads - 4)
+
+    tuner = ThreadsTuner(1, maximum=8)
+    chosen = []
+    for _ in range(20):
+        tuner.adjust(speed(tuner.threads))
+        chosen.append(tuner.threads)
+    assert max(chosen) <= 6
+    assert all(3 <= threads <= 5 for threads in chosen[-6:])  # oscillates around the best value
+
+
+def test_limits() -> None:
+    tuner = ThreadsTuner(10, maximum=4)
+    assert tuner.threads == 4
+    tuner.adjust(10)
+    tuner.adjust(20)
+    assert 1 <= tuner.threads <= 4
+
+
+def test_memory_budget() -> None:
+    governor = MemoryGovernor(0)
+    governor.limit = 1  # no memory for more frames in flight
+    tuner = ThreadsTuner(2, maximum=8, governor=governor)
+    for fps in [10, 20, 30, 40]:
+        tuner.adjust(fps)
+        assert tuner.threads <= 2
+    governor.stop()
+
+
+def test_pipeline() -> None:
+    def process(frame: Frame) -> Frame:
+        time.sleep(0.005)
+        return frame
+
+    saved = []
+    tuner = ThreadsTuner(1, maximum=4, window=0.05)
+    FramePipeline(lambda index: NumberedFrame(index, EmptyFrame), process, lambda frame: saved.append(frame.index), tuner=tuner).run(range(100))
+    assert sorted(saved) == list(range(100))
+    assert tuner.fps is not None
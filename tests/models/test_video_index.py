@@ -0,0 +1,57 @@
+import os
+import shutil
+
+from sinner.Parameters import Parameters
+from sinner.handlers.frame.CV2DecoderSession import CV2DecoderSession
+from sinner.handlers.frame.CV2VideoHandler import CV2VideoHandler
+from sinner.handlers.frame.FFmpegVideoHandler import FFmpegVideoHandler
+from sinner.models.VideoIndex import VideoIndex
+from tests.constants import target_mp4, broken_mp4, TARGET_FC, BROKEN_FC, tmp_dir
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_build() -> None:
+    index = VideoIndex.build(target_mp4)
+    assert index.frames_count == TARGET_FC
+    assert index.keyframes.tolist() == [0]
+    assert index.pts[0] == 0
+    assert index.pts_time(5) == 0.5
+    assert index.keyframe_before(7) == 0
+    assert index.same_gop(1, 9) is True
+
+    index = VideoIndex.build(broken_mp4)
+    assert index.frames_count == BROKEN_FC
+    assert index.keyframe_before(7) == 7
+    assert index.same_gop(1, 2) is False
+
+
+def test_load_cached() -> None:
+    cache_path = VideoIndex.cache_path(target_mp4, tmp_dir)
+    assert os.path.exists(cache_path) is False
+    index = VideoIndex.load(target_mp4, tmp_dir)
+    assert os.path.exists(cache_path) is True
+    cached_index = VideoIndex.load(target_mp4, tmp_dir)
+    assert cached_index.pts.tolist() == index.pts.tolist()
+    assert cached_index.keyframes.tolist() == index.keyframes.tolist()
+
+
+def test_indexed_seeks() -> None:
+    session = CV2DecoderSession(target_mp4, max_skip=2, index=VideoIndex.build(target_mp4))
+    session.read(0)
+    session.read(8)  # long forward jump inside the GOP, grabbed
+    session.read(1)  # backward jump, seek to the keyframe
+    assert session.statistics == {'opens': 1, 'hits': 1, 'skips': 1, 'seeks': 1}
+    session.release()
+
+
+def test_handlers_use_index() -> None:
+    for handler_class in [CV2VideoHandler, FFmpegVideoHandler]:
+        handler = handler_class(target_path=broken_mp4, parameters=Parameters(f'--video-index --temp-dir="{tmp_dir}"').parameters)
+        assert handler.video_index is not None
+        assert handler.fc == BROKEN_FC
+        assert handler.extract_frame(50).index == 50
+        handler.release_resources()
+    assert os.path.exists(VideoIndex.cache_path(broken_mp4, tmp_dir)) is True
@@ -0,0 +1,33 @@
+import os
+import shutil
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.FaceIndex import FaceIndex
+from sinner.Parameters import Parameters
+from sinner.processors.BaseFaceProcessor import BaseFaceProcessor
+from sinner.typing import Frame
+from tests.constants import target_mp4, tmp_dir
+
+
+class FirstFaceProcessor(BaseFaceProcessor):
+    def process_frame(self, frame: Frame) -> Frame:
+        return frame
+
+
+class SecondFaceProcessor(FirstFaceProcessor):
+    pass
+
+
+def setup_function():
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+
+
+def test_face_index_of_first_processor() -> None:
+    parameters = Parameters(f'--frame-processor FirstFaceProcessor SecondFaceProcessor --target-path="{target_mp4}" --face-index --temp-dir="{tmp_dir}"').parameters
+    assert isinstance(FirstFaceProcessor(parameters).target_faces, FaceIndex)
+    assert isinstance(SecondFaceProcessor(parameters).target_faces, FaceAnalyser)  # frames of the second processor are already processed
+    parameters = Parameters(f'--target-path="{target_mp4}" --face-index --temp-dir="{tmp_dir}"').parameters
+    index = SecondFaceProcessor(parameters).target_faces
+    assert isinstance(index, FaceIndex)
+    assert index.path == os.path.join(tmp_dir, 'faces', FaceIndex.target_hash(target_mp4))
@@ -1,4 +1,5 @@
 import multiprocessing
+import os
 
 import numpy as np
 import pytest
@@ -7,10 +8,10 @@ from insightface.app.common import Face
 
 from sinner.Parameters import Parameters
 from sinner.FaceAnalyser import FaceAnalyser
-from sinner.helpers.FrameHelper import read_from_image
+from sinner.helpers.FrameHelper import read_from_image, write_to_image
 from sinner.processors.frame.FaceSwapper import FaceSwapper
 from sinner.typing import Frame, FaceSwapperType
-from tests.constants import source_jpg, target_png, IMAGE_SHAPE, tmp_dir, no_face_jpg, male_face_jpg, female_face_jpg, multiple_faces_jpg
+from tests.constants import source_jpg, target_png, IMAGE_SHAPE, tmp_dir, no_face_jpg, male_face_jpg, female_face_jpg, multiple_faces_jpg, target_faces
 
 
 def get_test_object(additional_params: str = "") -> FaceSwapper:
@@ -98,3 +99,23 @@ def test_many_faces_processing():
     target_frame = read_from_image(multiple_faces_jpg)
     processed_frame = test_object.process_frame(target_frame)
     assert not np.array_equal(target_frame, processed_frame)
+
+
+def test_reference_faces():
+    target_frame = read_from_image(target_faces)
+    faces = FaceAnalyser(execution_providers=['CPUExecutionProvider']).get_many_faces(target_frame)
+    male_face = next(face for face in faces if face.sex == 'M')
+    x1, y1, x2, y2 = [int(value) for value in male_face.bbox]
+    reference_path = os.path.join(tmp_dir, 'reference.png')
+    os.makedirs(tmp_dir, exist_ok=True)
+    write_to_image(target_frame[max(y1 - 50, 0):y2 + 50, max(x1 - 50, 0):x2 + 50], reference_path)
+
+    test_object = get_test_object(f'--many-faces --target-gender=B --reference-faces "{reference_path}"')
+    matched = test_object.match_faces([faces])[0]
+    assert len(matched) == 1
+    assert matched[0].sex == 'M'
+    assert not np.array_equal(target_frame, test_object.process_frame(target_frame))
+
+    test_object = get_test_object(f'--many-faces --reference-faces "{male_face_jpg}"')  # another person
+    assert test_object.match_faces([faces]) == [[]]
+    assert np.array_equal(target_frame, test_object.process_frame(target_frame))  # frames without references are not changed
@@ -34,3 +34,36 @@ def test_extract() -> None:
     batch_processor.process(test_extractor, handler, test_state)
     assert os.path.exists(tmp_dir) is True
     assert len(glob.glob(os.path.join(glob.escape(test_state.path), '*.png'))) == TARGET_FC
+
+
+def test_split_segments() -> None:
+    frames = list(range(20))
+    assert FrameExtractor.split_segments(frames, 1) == [frames]
+    assert FrameExtractor.split_segments(frames, 4) == [frames[0:5], frames[5:10], frames[10:15], frames[15:20]]
+    assert FrameExtractor.split_segments(frames, 4, keyframes=[0, 8, 16]) == [frames[0:8], frames[8:16], frames[16:20]]
+    assert FrameExtractor.split_segments([1, 2, 3, 12, 13], 2, keyframes=[0, 10]) == [[1, 2, 3], [12, 13]]
+
+
+def test_extract_segments() -> None:
+    setup()
+    default_dir = os.path.join(tmp_dir, 'default')
+    segments_dir = os.path.join(tmp_dir, 'segments')
+    default_parameters = Parameters(f'--target-path="{target_mp4}" --output-path="{tmp_dir}" --temp-dir="{default_dir}"').parameters
+    batch_processor = BatchProcessingCore(parameters=default_parameters)
+    handler = batch_processor.suggest_handler(batch_processor.target_path, batch_processor.parameters)
+    default_extractor = FrameExtractor(parameters=default_parameters)
+    default_state = State(parameters=default_parameters, frames_count=TARGET_FC, temp_dir=default_dir, processor_name=default_extractor.__class__.__name__, target_path=target_mp4)
+    default_extractor.configure_state(default_state)
+    default_extractor.process(handler, default_state)
+
+    segments_parameters = Parameters(f'--target-path="{target_mp4}" --output-path="{tmp_dir}" --extract-segments=3 --video-index --temp-dir="{segments_dir}"').parameters
+    batch_processor = BatchProcessingCore(parameters=segments_parameters)
+    handler = batch_processor.suggest_handler(batch_processor.target_path, batch_processor.parameters)
+    test_extractor = FrameExtractor(parameters=segments_parameters)
+    assert test_extractor.extract_segments == 3
+    test_state = State(parameters=segments_parameters, frames_count=TARGET_FC, temp_dir=segments_dir, processor_name=test_extractor.__class__.__name__, target_path=target_mp4)
+    test_extractor.configure_state(test_state)
+    test_extractor.process(handler, test_state)
+    assert test_state.is_finished is True
+    for frame_index in range(TARGET_FC):  # segments give the same frames, as the default extraction
+        assert (test_state.storage.read(frame_index) == default_state.storage.read(frame_index)).all()
@@ -0,0 +1,19 @@
+from argparse import Namespace
+
+from sinner.Parameters import Parameters
+from sinner.helpers.FrameHelper import read_from_image
+from sinner.processors.ProcessorChain import ProcessorChain
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from tests.constants import target_png
+
+parameters: Namespace = Parameters('--scale=0.5').parameters
+
+
+def test_process_frame() -> None:
+    frame = read_from_image(target_png)
+    chain = ProcessorChain(parameters, [BaseFrameProcessor.create('FrameResizer', parameters), BaseFrameProcessor.create('FrameResizer', parameters)])
+    assert chain.name == 'FrameResizer+FrameResizer'
+    processed = chain.process_frame(frame)
+    assert processed.shape[0] == frame.shape[0] // 4
+    assert processed.shape[1] == frame.shape[1] // 4
+    chain.release_resources()
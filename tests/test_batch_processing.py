@@ -1,13 +1,17 @@
 # testing different run configurations
 import glob
+from argparse import Namespace
 import multiprocessing
 import os.path
 import shutil
+import threading
 
 import pytest
 
 from sinner.Parameters import Parameters
+from sinner.helpers.FrameHelper import read_from_image
 from sinner.BatchProcessingCore import BatchProcessingCore
+from sinner.handlers.frame.VideoHandler import VideoHandler
 from sinner.models.State import State
 from sinner.processors.frame.DummyProcessor import DummyProcessor
 from sinner.utilities import limit_resources, suggest_max_memory, get_file_name, get_app_dir, resolve_relative_path
@@ -141,6 +145,141 @@ def test_dummy_mp4_extract_keep_frames() -> None:
     assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', '*.png'))) == TARGET_FC
 
 
+def test_dummy_images() -> None:
+    result_dir = os.path.join(tmp_dir, 'result')
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{images_dir}" --output-path="{result_dir}" --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    original_images_names = [get_file_name(filepath) for filepath in glob.glob(os.path.join(images_dir, '*.jpg'))]
+    assert sorted(f'{name}.png' for name in original_images_names) == sorted(os.listdir(result_dir))  # service files of the storage are not copied
+
+
+def test_dummy_images_memory_mapped_storage() -> None:
+    result_dir = os.path.join(tmp_dir, 'result')
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{images_dir}" --output-path="{result_dir}" --frame-storage=MemoryMappedFrameStorage --temp-dir="{tmp_dir}"')
+    with pytest.raises(LoadingException):
+        BatchProcessingCore(parameters=params.parameters).run()  # images of the directory can't be stored in one container
+
+
+def test_dummy_image() -> None:
+    result_file = os.path.join(tmp_dir, 'result.png')
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{target_png}" --output-path="{result_file}" --frame-codec=JPEGFrameCodec --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert read_from_image(result_file).shape == read_from_image(target_png).shape
+
+
+def test_dummy_image_memory_mapped_storage() -> None:
+    result_file = os.path.join(tmp_dir, 'result.png')
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{target_png}" --output-path="{result_file}" --frame-storage=MemoryMappedFrameStorage --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert (read_from_image(result_file) == read_from_image(target_png)).all()
+
+
+def test_dummy_mp4_stream_output() -> None:
+    assert os.path.exists(result_mp4) is False
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --stream-output --stream-checkpoint=4 --keep-frames --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert os.path.exists(result_mp4) is True
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+    parts_dir = os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', 'parts')
+    assert sorted(os.listdir(parts_dir)) == ['00.mp4', '04.mp4', '08.mp4']
+    assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', '*.png'))) == 0
+
+
+def test_dummy_mp4_memory_mapped_storage() -> None:
+    assert os.path.exists(result_mp4) is False
+    params = Parameters(f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --frame-storage=MemoryMappedFrameStorage --keep-frames --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert os.path.exists(result_mp4) is True
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+    assert os.path.exists(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', 'frames.raw'))
+    assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', '*.png'))) == 0
+
+
+def test_dummy_mp4_fused_chain() -> None:
+    assert os.path.exists(result_mp4) is False
+    params = Parameters(f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --fused-chain --keep-frames --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert os.path.exists(result_mp4) is True
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+    assert os.path.exists(os.path.join(tmp_dir, 'FrameResizer')) is False  # no intermediate stage frames
+    assert len(glob.glob(os.path.join(tmp_dir, 'FrameResizer+DummyProcessor', 'target.mp4', '*.png'))) == TARGET_FC
+
+
+def test_dummy_mp4_segmented_output() -> None:
+    assert os.path.exists(result_mp4) is False
+    params = Parameters(f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --segmented-output --segment-length=3 --keep-frames --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert os.path.exists(result_mp4) is True
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+    assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', 'segments', '*.mp4'))) == 4
+    assert len(glob.glob(os.path.join(tmp_dir, 'FrameResizer', 'target.mp4', 'segments', '*.mp4'))) == 0  # only the last pass is encoded
+
+
+def test_dummy_mp4_time_range() -> None:
+    assert os.path.exists(result_mp4) is False
+    params = Parameters(f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --start=2 --end=0.5s --keep-frames --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert VideoHandler(result_mp4, Namespace()).fc == 3
+    assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', 'selection', '2-5-1', '*.png'))) == 3
+    assert len(glob.glob(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4', '*.png'))) == 0  # the state of the whole target is not touched
+
+
+def test_dummy_mp4_stride() -> None:
+    result_jpg = os.path.splitext(result_mp4)[0] + '.jpg'
+    params = Parameters(f'--frame-processor DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --stride=3 --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert os.path.exists(result_mp4) is False
+    assert read_from_image(result_jpg).shape == (360, 640, 3)  # 4 frames of 10 in 2x2 tiles
+    assert os.path.exists(os.path.join(tmp_dir, 'DummyProcessor', 'target.mp4')) is False  # empty selection directories are removed too
+
+
+def run_shard(arguments: str) -> None:
+    BatchProcessingCore(parameters=Parameters(arguments).parameters).run()
+
+
+def test_frames_slice() -> None:
+    def frames_slice(arguments: str) -> tuple[int, int]:
+        return BatchProcessingCore(parameters=Parameters(f'--target-path="{target_mp4}" {arguments}').parameters).frames_slice(TARGET_FC)
+
+    assert frames_slice('--frames-range=2:8') == (2, 8)
+    assert frames_slice('--frames-range=5:') == (5, TARGET_FC)
+    assert frames_slice('--frames-range=:100') == (0, TARGET_FC)
+    assert frames_slice('--shard=1/3') == (0, 3)
+    assert frames_slice('--shard=3/3') == (6, TARGET_FC)
+    assert frames_slice('--frames-range=2:8 --shard=2/2') == (5, 8)
+    with pytest.raises(LoadingException):
+        frames_slice('--shard=4/3')
+
+
+def test_dummy_mp4_shards() -> None:
+    assert os.path.exists(result_mp4) is False
+    arguments = f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --temp-dir="{tmp_dir}"'
+    shards = [multiprocessing.Process(target=run_shard, args=(f'{arguments} --shard={number}/3',)) for number in range(1, 4)]
+    for shard in shards:
+        shard.start()
+    for shard in shards:
+        shard.join()
+        assert shard.exitcode == 0
+    state_path = os.path.join(tmp_dir, 'FrameResizer+DummyProcessor', 'target.mp4')
+    assert len(glob.glob(os.path.join(state_path, 'shards', '*'))) == 3
+    assert os.path.exists(result_mp4) is False
+    run_shard(f'{arguments} --finalize')
+    assert os.path.exists(result_mp4) is True
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+    assert os.path.exists(state_path) is False
+
+
+def test_dummy_mp4_incomplete_shards() -> None:
+    arguments = f'--frame-processor DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --frame-storage=MemoryMappedFrameStorage --temp-dir="{tmp_dir}"'
+    run_shard(f'{arguments} --frames-range=0:5')
+    with pytest.raises(Exception):
+        run_shard(f'{arguments} --finalize')
+    assert os.path.exists(result_mp4) is False
+    run_shard(f'{arguments} --frames-range=5:')
+    run_shard(f'{arguments} --finalize')
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+
+
 def test_set_execution_provider(capsys) -> None:
     assert os.path.exists(result_png) is False
     params = Parameters(f'--target-path="{target_png}" --source-path="{source_jpg}" --temp-dir="{tmp_dir}" --output-path="{result_png}" --execution-provider=cpu')
@@ -170,3 +309,37 @@ def test_reprocess_lost_frames() -> None:
     assert len(glob.glob(os.path.join(case_temp_dir, '*.png'))) == 8
     batch_processor.process(current_processor, handler, state)
     assert len(glob.glob(os.path.join(case_temp_dir, '*.png'))) == 10
+
+
+def test_dummy_mp4_stream() -> None:
+    os.makedirs(tmp_dir, exist_ok=True)
+    fifo_path = os.path.join(tmp_dir, 'stream.fifo')
+    os.mkfifo(fifo_path)
+
+    def feed() -> None:
+        with open(target_mp4, 'rb') as target, open(fifo_path, 'wb') as fifo:
+            shutil.copyfileobj(target, fifo)
+
+    frames_dir = os.path.join(tmp_dir, 'stream_frames')
+    os.makedirs(frames_dir)
+    for _ in range(2):  # the second run continues the image sequence
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        params = Parameters(f'--frame-processor=DummyProcessor --target-path="{fifo_path}" --output-path="{frames_dir}" --execution-threads=2')
+        BatchProcessingCore(parameters=params.parameters).run()
+        writer.join()
+    assert len(glob.glob(os.path.join(frames_dir, '*.png'))) == TARGET_FC * 2
+    assert os.path.exists(os.path.join(frames_dir, str(TARGET_FC * 2 - 1).zfill(8) + '.png'))
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    params = Parameters(f'--frame-processor=DummyProcessor --target-path="{fifo_path}" --output-path="{result_mp4}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    writer.join()
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
+
+
+def test_dummy_mp4_batches() -> None:
+    params = Parameters(f'--frame-processor FrameResizer DummyProcessor --target-path="{target_mp4}" --output-path="{result_mp4}" --execution-threads=4 --batch-size=4 --batch-latency=0.05 --temp-dir="{tmp_dir}"')
+    BatchProcessingCore(parameters=params.parameters).run()
+    assert VideoHandler(result_mp4, Namespace()).fc == TARGET_FC
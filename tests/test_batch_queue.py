@@ -0,0 +1,109 @@
+import os
+import shutil
+import threading
+import time
+from argparse import Namespace
+from typing import List
+
+from sinner.BatchQueue import BatchQueue
+from sinner.Parameters import Parameters
+from sinner.models.BatchJob import BatchJob
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.typing import Frame
+from tests.constants import target_png, target_mp4, tmp_dir, data_targets_dir
+
+queue_output_dir = os.path.join(tmp_dir, 'queue')
+
+
+def setup_function():
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+
+
+def test_requested() -> None:
+    assert BatchQueue.requested(Parameters(f'--target="{target_png}"').parameters) is False
+    assert BatchQueue.requested(Parameters(f'--targets "{target_png}" "{target_mp4}"').parameters) is True
+
+
+def test_expand() -> None:
+    assert BatchQueue.expand([target_png, target_png, 'no_such_file']) == [target_png]
+    assert target_mp4 in BatchQueue.expand([os.path.join(data_targets_dir, '*.mp4')])
+    assert target_png not in BatchQueue.expand([os.path.join(data_targets_dir, '*.mp4')])
+
+
+def test_queue_order() -> None:
+    batch_queue = BatchQueue(Parameters(f'--targets "{target_png}" "{target_mp4}" --queue-order=size').parameters)
+    batch_queue.enqueue(BatchQueue.expand(batch_queue.targets))
+    first = min([target_png, target_mp4], key=os.path.getsize)
+    assert batch_queue.pending == 2
+    assert batch_queue._queue.get()[2] == BatchJob(first)
+
+
+def test_sources() -> None:
+    batch_queue = BatchQueue(Parameters(f'--targets "{target_png}" --sources "{target_png}" "{target_mp4}"').parameters)
+    batch_queue.enqueue(BatchQueue.expand(batch_queue.targets))
+    assert batch_queue.pending == 2
+    batch_queue.enqueue([target_png])  # already queued targets are ignored
+    assert batch_queue.pending == 2
+
+
+def test_shared_processors(monkeypatch) -> None:
+    created: List[str] = []
+    create = BaseFrameProcessor.create
+    monkeypatch.setattr(BaseFrameProcessor, 'create', lambda processor_name, parameters: created.append(processor_name) or create(processor_name, parameters))
+    params = Parameters(f'--frame-processor=DummyProcessor --targets "{target_png}" "{target_mp4}" --output="{queue_output_dir}" --execution-threads=2')
+    batch_queue = BatchQueue(params.parameters)
+    batch_queue.run()
+    assert len(batch_queue.processed) == 2
+    assert batch_queue.failed == []
+    assert created == ['DummyProcessor']  # the processor is created once for all jobs
+    assert list(batch_queue.processors_pool.keys()) == ['DummyProcessor']
+    assert os.path.exists(os.path.join(queue_output_dir, 'result-target.png'))
+    assert os.path.exists(os.path.join(queue_output_dir, 'result-target.mp4'))
+
+
+def test_broken_job() -> None:
+    params = Parameters(f'--frame-processor=DummyProcessor --targets "{target_png}" --output="{queue_output_dir}"')
+    batch_queue = BatchQueue(params.parameters)
+    batch_queue.enqueue(['no_such_file'])
+    batch_queue.run()
+    assert batch_queue.failed == [BatchJob('no_such_file')]
+    assert batch_queue.processed == [BatchJob(target_png)]
+
+
+def test_failed_processing(monkeypatch) -> None:
+    errors = [Exception('Processing error')]
+
+    def process_frame(frame: Frame) -> Frame:
+        if errors:
+            raise errors.pop()
+        return frame
+
+    def create(processor_name: str, parameters: Namespace) -> BaseFrameProcessor:
+        processor = create_processor(processor_name, parameters)
+        monkeypatch.setattr(processor, 'process_frame', process_frame)
+        return processor
+
+    create_processor = BaseFrameProcessor.create
+    monkeypatch.setattr(BaseFrameProcessor, 'create', create)
+    params = Parameters(f'--frame-processor=DummyProcessor --targets "{target_mp4}" "{target_png}" --output="{queue_output_dir}" --execution-threads=1')
+    batch_queue = BatchQueue(params.parameters)
+    batch_queue.run()
+    assert batch_queue.failed == [BatchJob(target_mp4)]  # the pipeline error doesn't stop the queue
+    assert batch_queue.processed == [BatchJob(target_png)]
+    assert os.path.exists(os.path.join(queue_output_dir, 'result-target.png'))
+
+
+def test_watch() -> None:
+    watch_dir = os.path.join(tmp_dir, 'watch')
+    os.makedirs(watch_dir)
+    params = Parameters(f'--frame-processor=DummyProcessor --watch="{watch_dir}" --watch-interval=0.1 --watch-timeout=1 --output="{queue_output_dir}"')
+    batch_queue = BatchQueue(params.parameters)
+    runner = threading.Thread(target=batch_queue.run)
+    runner.start()
+    time.sleep(0.2)
+    shutil.copy(target_png, watch_dir)
+    runner.join(timeout=30)
+    assert runner.is_alive() is False
+    assert batch_queue.processed == [BatchJob(os.path.join(watch_dir, 'target.png'))]
+    assert os.path.exists(os.path.join(queue_output_dir, 'result-target.png'))
@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy
+
 from insightface.app.common import Face
 
 from sinner.FaceAnalyser import FaceAnalyser
@@ -36,3 +38,28 @@ def test_many_faces():
     assert faces[0].sex == 'F'
     assert faces[1].age == 47
     assert faces[1].sex == 'M'
+
+
+def test_letterbox():
+    image, scale = FaceAnalyser.letterbox(numpy.full((320, 640, 3), 255, dtype=numpy.uint8), (640, 640))
+    assert image.shape == (640, 640, 3)
+    assert scale == 1.0
+    assert image[319, 639, 0] == 255 and image[320, 0, 0] == 0  # the frame is padded at the bottom
+    image, scale = FaceAnalyser.letterbox(numpy.zeros((1280, 640, 3), dtype=numpy.uint8), (640, 640))
+    assert image.shape == (640, 640, 3)
+    assert scale == 0.5
+
+
+def test_many_faces_batch():
+    analyser = FaceAnalyser(execution_providers=['CPUExecutionProvider'], batch_size=2)
+    frames = [read_from_image(target_faces), read_from_image(source_jpg), read_from_image(target_faces)]
+    batched = analyser.get_many_faces_batch(frames)
+    assert [len(faces) for faces in batched] == [2, 1, 2]
+    for frame, faces in zip(frames, batched):
+        for face, single_face in zip(sorted(faces, key=lambda x: x.bbox[0]), sorted(analyser.get_many_faces(frame), key=lambda x: x.bbox[0])):
+            assert numpy.allclose(face.bbox, single_face.bbox, atol=1)
+            assert face.sex == single_face.sex
+            assert numpy.dot(face.normed_embedding, single_face.normed_embedding) > 0.99
+    one_faces = analyser.get_one_face_batch(frames)
+    assert one_faces[0].age == 47
+    assert one_faces[1].age == 31
@@ -0,0 +1,101 @@
+import os
+import shutil
+from typing import List
+
+import numpy
+from insightface.app.common import Face
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.FaceIndex import FaceIndex
+from sinner.typing import Frame
+from tests.constants import tmp_dir, target_mp4, target_png, state_frames_dir
+
+index_path = os.path.join(tmp_dir, 'faces', 'index')
+
+
+class CountingAnalyser(FaceAnalyser):
+    """
+    Finds one face on frames with a non-zero first pixel, and counts analysed frames
+    """
+    calls: int = 0
+
+    def get_many_faces(self, frame: Frame) -> List[Face]:
+        self.calls += 1
+        if frame[0, 0, 0] == 0:
+            return []
+        value = float(frame[0, 0, 0])
+        return [Face(bbox=numpy.array([value, 0, value + 10, 10], dtype=numpy.float32), kps=numpy.full((5, 2), value, dtype=numpy.float32), det_score=0.9, gender=1, age=int(value), embedding=numpy.full(512, value, dtype=numpy.float32))]
+
+    def get_many_faces_batch(self, frames: List[Frame]) -> List[List[Face]]:
+        return [self.get_many_faces(frame) for frame in frames]
+
+
+def frame(value: int) -> Frame:
+    return numpy.full((8, 8, 3), value, dtype=numpy.uint8)
+
+
+def setup_function():
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+
+
+def test_target_hash() -> None:
+    assert FaceIndex.target_hash(target_mp4) == FaceIndex.target_hash(target_mp4)
+    assert FaceIndex.target_hash(target_mp4) != FaceIndex.target_hash(target_png)
+    assert FaceIndex.target_hash(state_frames_dir) == FaceIndex.target_hash(state_frames_dir)
+
+
+def test_fingerprint() -> None:
+    assert FaceIndex.fingerprint(frame(1)) == FaceIndex.fingerprint(frame(1))
+    assert FaceIndex.fingerprint(frame(1)) != FaceIndex.fingerprint(frame(2))
+    assert FaceIndex.fingerprint(frame(1)) != FaceIndex.fingerprint(numpy.full((4, 16, 3), 1, dtype=numpy.uint8))
+
+
+def test_index() -> None:
+    analyser = CountingAnalyser(execution_providers=['CPUExecutionProvider'])
+    index = FaceIndex(index_path, analyser)
+    assert len(index) == 0
+    assert index.get_one_face(frame(5)).age == 5
+    assert index.get_many_faces(frame(0)) == []
+    assert index.get_one_face(frame(5)).age == 5
+    assert analyser.calls == 2
+    index.save()
+    assert os.path.exists(index_path)
+
+    analyser = CountingAnalyser(execution_providers=['CPUExecutionProvider'])
+    index = FaceIndex(index_path, analyser)
+    assert len(index) == 2
+    face = index.get_one_face(frame(5))
+    assert analyser.calls == 0  # faces are taken from the index
+    assert face.sex == 'M'
+    assert numpy.allclose(face.bbox, [5, 0, 15, 10])
+    assert numpy.allclose(face.kps, numpy.full((5, 2), 5))
+    assert numpy.allclose(face.normed_embedding, numpy.full(512, 1 / numpy.sqrt(512)), atol=1e-3)
+    assert index.get_many_faces(frame(0)) == []
+    assert index.hits == 2
+
+
+def test_batch() -> None:
+    analyser = CountingAnalyser(execution_providers=['CPUExecutionProvider'])
+    index = FaceIndex(index_path, analyser)
+    index.get_many_faces(frame(3))
+    faces = index.get_many_faces_batch([frame(3), frame(4), frame(0)])
+    assert [len(frame_faces) for frame_faces in faces] == [1, 1, 0]
+    assert analyser.calls == 3
+    assert index.hits == 1 and index.misses == 3
+    index.save()
+    index.get_many_faces(frame(6))
+    index.save()  # new frames are appended
+    assert len(FaceIndex(index_path, analyser)) == 4
+
+
+def test_concurrent_writers() -> None:
+    analyser = CountingAnalyser(execution_providers=['CPUExecutionProvider'])
+    first = FaceIndex(index_path, analyser)
+    second = FaceIndex(index_path, analyser)
+    first.get_many_faces(frame(1))
+    second.get_many_faces(frame(2))
+    second.save()
+    first.save()  # the later writer keeps additions of the earlier one
+    assert len(FaceIndex(index_path, analyser)) == 2
+    assert len(os.listdir(index_path)) == 2
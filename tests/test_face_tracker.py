@@ -0,0 +1,80 @@
+from typing import List
+
+import cv2
+import numpy
+from insightface.app.common import Face
+
+from sinner.FaceAnalyser import FaceAnalyser
+from sinner.FaceTracker import FaceTracker
+from sinner.typing import Frame
+
+KPS = numpy.array([[100, 100], [140, 100], [120, 120], [105, 140], [135, 140]], dtype=numpy.float32)
+
+
+class FixedAnalyser(FaceAnalyser):
+    """
+    Detects the same face on every frame, and counts detections
+    """
+    calls: int = 0
+
+    def get_many_faces(self, frame: Frame) -> List[Face]:
+        self.calls += 1
+        return [Face(bbox=numpy.array([90, 90, 150, 150], dtype=numpy.float32), kps=KPS.copy(), det_score=0.9, gender=1, age=30)]
+
+    def get_many_faces_batch(self, frames: List[Frame]) -> List[List[Face]]:
+        return [self.get_many_faces(frame) for frame in frames]
+
+
+def textured_frame() -> Frame:
+    noise = numpy.random.default_rng(1).integers(0, 255, (360, 640), dtype=numpy.uint8)
+    return cv2.cvtColor(cv2.GaussianBlur(noise, (7, 7), 0), cv2.COLOR_GRAY2BGR)
+
+
+def shifted(frame: Frame, dx: int, dy: int) -> Frame:
+    return numpy.roll(frame, (dy, dx), axis=(0, 1))
+
+
+def test_tracking() -> None:
+    analyser = FixedAnalyser(execution_providers=['CPUExecutionProvider'])
+    tracker = FaceTracker(analyser, interval=5)
+    frame = textured_frame()
+    for step in range(5):
+        face = tracker.get_one_face(shifted(frame, step * 2, step))
+        assert face is not None
+        assert numpy.allclose(face.kps, KPS + [step * 2, step], atol=0.5)  # tracked keypoints follow the motion
+        assert numpy.allclose(face.bbox, [90 + step * 2, 90 + step, 150 + step * 2, 150 + step], atol=0.5)
+        assert face.sex == 'M' and face.age == 30  # analysis results are kept
+    assert analyser.calls == 1
+    assert tracker.tracks == 4
+    tracker.get_one_face(shifted(frame, 10, 5))  # the interval is over
+    assert analyser.calls == 2
+
+
+def test_scene_change() -> None:
+    analyser = FixedAnalyser(execution_providers=['CPUExecutionProvider'])
+    tracker = FaceTracker(analyser, interval=10)
+    frame = textured_frame()
+    tracker.get_many_faces(frame)
+    tracker.get_many_faces(shifted(frame, 1, 1))
+    assert analyser.calls == 1
+    tracker.get_many_faces(255 - frame)
+    assert analyser.calls == 2
+
+
+def test_batch() -> None:
+    analyser = FixedAnalyser(execution_providers=['CPUExecutionProvider'])
+    tracker = FaceTracker(analyser, interval=3)
+    frame = textured_frame()
+    faces = tracker.get_many_faces_batch([shifted(frame, step, 0) for step in range(6)])
+    assert [len(frame_faces) for frame_faces in faces] == [1] * 6
+    assert analyser.calls == 2
+    assert numpy.allclose(faces[5][0].kps, KPS + [2, 0], atol=0.5)  # tracked from the detection on the frame 3
+
+
+def test_interval_one() -> None:
+    analyser = FixedAnalyser(execution_providers=['CPUExecutionProvider'])
+    tracker = FaceTracker(analyser, interval=1)
+    frame = textured_frame()
+    for _ in range(3):
+        tracker.get_many_faces(frame)
+    assert analyser.calls == 3
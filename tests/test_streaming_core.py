@@ -0,0 +1,66 @@
+import os
+import shutil
+import threading
+from typing import Iterator
+
+import numpy
+import pytest
+
+from sinner.StreamingCore import StreamingCore
+from sinner.processors.frame.BaseFrameProcessor import BaseFrameProcessor
+from sinner.typing import Frame
+from tests.constants import target_mp4, target_png, tmp_dir, TARGET_FC, FRAME_SHAPE
+
+
+def setup_function():
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def numbered_frames(count: int) -> Iterator[Frame]:
+    for index in range(count):
+        yield numpy.full((4, 4, 3), index, dtype=numpy.uint8)
+
+
+def test_process_ordered() -> None:
+    with StreamingCore(['DummyProcessor'], workers=4, depth=2) as core:
+        processed = list(core.process(numbered_frames(50)))
+    assert [int(frame[0, 0, 0]) for frame in processed] == list(range(50))
+    assert os.path.exists(tmp_dir) is False  # nothing is written to the disk
+
+
+def test_process_array() -> None:
+    core = StreamingCore(['DummyProcessor', 'DummyProcessor'])
+    assert len(list(core.process(numpy.zeros((5, 4, 4, 3), dtype=numpy.uint8)))) == 5
+    assert len(list(core.process(numpy.zeros((4, 4, 3), dtype=numpy.uint8)))) == 1  # a single frame
+    assert core.process_frame(numpy.zeros((4, 4, 3), dtype=numpy.uint8)).shape == (4, 4, 3)
+
+
+def test_reuse_processor() -> None:
+    processor = BaseFrameProcessor.create('DummyProcessor', StreamingCore(['DummyProcessor']).parameters)
+    assert StreamingCore([processor]).processor is processor
+
+
+def test_early_close() -> None:
+    core = StreamingCore(['DummyProcessor'], workers=2, depth=1)
+    generator = core.process(numbered_frames(1000))
+    assert int(next(generator)[0, 0, 0]) == 0
+    generator.close()
+    assert [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')] == []
+
+
+def test_error() -> None:
+    def broken_frames() -> Iterator[Frame]:
+        yield from numbered_frames(3)
+        raise Exception('Broken input')
+
+    with pytest.raises(Exception, match='Broken input'):
+        list(StreamingCore(['DummyProcessor']).process(broken_frames()))
+
+
+def test_process_target() -> None:
+    core = StreamingCore(['DummyProcessor'], workers=2)
+    processed = list(core.process_target(target_mp4))
+    assert len(processed) == TARGET_FC
+    assert processed[0].shape == FRAME_SHAPE
+    assert len(list(core.process_target(target_mp4, range(0, TARGET_FC, 5)))) == 2
+    assert len(list(core.process_target(target_png))) == 1
@@ -1,6 +1,8 @@
 import statistics
 
-from sinner.utilities import get_all_base_names, format_sequences, get_directory_file_list, is_image
+import pytest
+
+from sinner.utilities import get_all_base_names, format_sequences, get_directory_file_list, is_image, parse_position
 from tests.constants import state_frames_dir
 
 
@@ -51,3 +53,12 @@ def test_get_directory_file_list() -> None:
     assert len(file_list) == 11
     file_list = get_directory_file_list(state_frames_dir, is_image)
     assert len(file_list) == 10
+
+
+def test_parse_position() -> None:
+    assert parse_position('15', 25) == 15
+    assert parse_position('2.5s', 10) == 25
+    assert parse_position('01:30', 10) == 900
+    assert parse_position('1:00:00.5', 2) == 7201
+    with pytest.raises(ValueError):
+        parse_position('1m', 10)